@@ -0,0 +1,90 @@
+"""Alert engine cost with many rules over a large fleet.
+
+Builds the dashboard's rules plus random threshold rules on the same
+columns, times one full evaluation (the engine build), incremental updates
+of changed rows and the reads a page makes, and compares the full pass with
+evaluating every rule as its own pandas mask:
+
+    python benchmarks/bench_alerts.py [n_vehicles] [n_rules]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_alerts import CRITICAL, INFO, RULES, WARNING, AlertEngine, Rule  # noqa: E402
+from fleet_data import STATUSES, default_driver_count  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+TARGET = 1.0    # seconds for a full pass
+RANGES = {'Idle Time (min)': (20, 600), 'FE (km/L)': (3.0, 5.5), 'Next Service (days)': (-10, 60),
+          'KM Since Service': (1000, 15000), 'Daily CO2 (kg)': (15, 30)}
+
+
+def random_rules(k, seed=0):
+    rng = np.random.default_rng(seed)
+    rules = list(RULES)
+    columns = list(RANGES)
+    for i in range(k - len(rules)):
+        column = columns[rng.integers(len(columns))]
+        lo, hi = RANGES[column]
+        rules.append(Rule(f"r{i}", column, rng.choice(['>', '>=', '<', '<=']), rng.uniform(lo, hi),
+                          int(rng.choice([INFO, WARNING, CRITICAL])), column))
+    return rules
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main(n, k):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    rules = random_rules(k)
+    df = fleet.vehicles(sorted({r.column for r in rules}))
+    print(f"{n:,} vehicles, {len(rules)} rules\n")
+
+    t = time.perf_counter()
+    engine = AlertEngine(fleet, rules)
+    full = time.perf_counter() - t
+    print(f"{'full pass (build)':<26} {full * 1000:>9.1f}ms  {'ok' if full < TARGET else 'ABOVE TARGET'}")
+
+    ops = {'>': '__gt__', '>=': '__ge__', '<': '__lt__', '<=': '__le__', '==': '__eq__'}
+    naive = [r for r in rules if r.op in ops]
+
+    def masks():
+        for r in naive:
+            getattr(df[r.column], ops[r.op])(r.value).sum()
+    print(f"{'one pandas mask per rule':<26} {best_of(masks, 1) * 1000:>9.1f}ms")
+
+    rng = np.random.default_rng(1)
+    for rows in (1, 100, 10_000):
+        def update():
+            positions = np.unique(rng.integers(0, n, rows))
+            fleet.update('vehicles', positions, {
+                'Idle Time (min)': rng.integers(0, 600, len(positions)),
+                'Status': np.array(STATUSES)[rng.integers(0, len(STATUSES), len(positions))],
+            })
+        print(f"{f'update {rows:,} rows':<26} {best_of(update) * 1000:>9.2f}ms   (fleet.update, KPI views excluded)")
+
+    for label, fn in [('counts()', engine.counts), ('top(3)', lambda: engine.top(3)),
+                      ('top_per_rule(3)', lambda: engine.top_per_rule(3)),
+                      ('rows(WARNING)', lambda: engine.rows(WARNING))]:
+        print(f"{label:<26} {best_of(fn) * 1000:>9.2f}ms")
+
+    rebuilt = AlertEngine(fleet, rules)
+    same = (rebuilt.rule == engine.rule).all() and np.allclose(rebuilt.score, engine.score)
+    print(f"\nincremental state matches a rebuild: {same}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 500_000, args[1] if len(args) > 1 else 300)
@@ -0,0 +1,77 @@
+"""Fleet cube drill-downs against pandas groupbys over the vehicle rows.
+
+Builds the cube, then times the explorer's queries (fleet total, by state,
+by district within a state, by model within a district) from the cube and
+from a filtered pandas groupby, checks the means agree, and times an
+incremental update:
+
+    python benchmarks/bench_cube.py [n_vehicles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_cube import DIMS, MEASURES, FleetCube  # noqa: E402
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+MEASURE = 'Daily CO2 (kg)'
+REPEAT = 5
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main(n):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    t = time.perf_counter()
+    cube = FleetCube(fleet)
+    build = time.perf_counter() - t
+    df = fleet.vehicles(list(DIMS) + MEASURES)
+    state = df['State'].value_counts().index[0]
+    district = int(df.loc[df['State'] == state, 'District'].mode()[0])
+    queries = [
+        ('fleet total', None, {}),
+        ('by state', 'State', {}),
+        (f'{state} by district', 'District', {'State': state}),
+        (f'{state}-{district:02d} by model', 'Model', {'State': state, 'District': district}),
+    ]
+    print(f"{n:,} vehicles, cube of {cube.n_cells:,} cells, {cube.memory_bytes() / 2**20:.1f} MiB, "
+          f"built in {build:.2f}s, best of {REPEAT}\n")
+    print(f"{'query':<24} {'cube':>9} {'pandas':>9} {'means match':>12}")
+    for label, by, filters in queries:
+        def pandas():
+            rows = df
+            for dim, value in filters.items():
+                rows = rows[rows[dim] == value]
+            if by is None:
+                return rows[MEASURE].mean()
+            return rows.groupby(by, observed=True)[MEASURE].mean()
+        fast, rolled = best_of(lambda: cube.rollup(by, MEASURE, filters))
+        slow, expected = best_of(pandas)
+        # pandas averages the float32 column in float32; the cube sums in float64
+        same = np.allclose(rolled['mean'].to_numpy(), np.atleast_1d(np.asarray(expected)), rtol=1e-6)
+        print(f"{label:<24} {fast * 1000:>7.2f}ms {slow * 1000:>7.1f}ms {str(same):>12}")
+
+    rng = np.random.default_rng(0)
+    for size in (1, 100, 10_000):
+        positions = rng.choice(n, min(size, n), replace=False)
+        changes = {MEASURE: fleet.series('vehicles', MEASURE).to_numpy()[positions] * 1.1}
+        t = time.perf_counter()
+        fleet.update('vehicles', positions, changes)
+        print(f"update of {len(positions):>6,} rows (fleet + cube): {(time.perf_counter() - t) * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,57 @@
+"""Drill-down chart cost against history length.
+
+Replays 1 week to 5 years of trips for a small fleet into the drill-down
+pyramids, then times what the Vehicle Analysis drill-down does for one
+truck: read the zoom window, build the band figure and serialize it. The
+read and the payload should stay flat as history grows:
+
+    python benchmarks/bench_drilldown.py [n_vehicles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_figures import range_band  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+from fleet_telemetry import replay  # noqa: E402
+from fleet_timeseries import WINDOWS, DrillDownSeries, window_days  # noqa: E402
+
+HISTORIES = [7, 90, 365, 5 * 365]
+REPEAT = 20
+
+
+def main(n):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    today = np.datetime64('today', 'D')
+    print(f"{n:,} vehicles; per drill-down: window read + figure build + JSON, best of {REPEAT}\n")
+    print(f"{'history':>8} {'trips/truck':>12} {'ingest':>8} {'memory':>9}   "
+          + "  ".join(f"{w:>18}" for w in WINDOWS))
+    for days in HISTORIES:
+        series = DrillDownSeries(fleet.n_vehicles, fleet.n_drivers)
+        t = time.perf_counter()
+        for batch in replay(fleet, today - days, days):
+            series.add(batch)
+        ingest = time.perf_counter() - t
+        samples = series.vehicle_fe.window(0)['count'].sum()
+        cells = []
+        for label in WINDOWS:
+            best, size, points = float('inf'), 0, 0
+            for _ in range(REPEAT):
+                t = time.perf_counter()
+                window = series.vehicle_fe.window(0, *window_days(label))
+                size = len(range_band(window).to_json())
+                best = min(best, time.perf_counter() - t)
+                points = len(window)
+            cells.append(f"{best * 1000:5.1f}ms {points:>3}p {size / 1024:4.1f}KB")
+        print(f"{days:>7}d {samples:>12,.0f} {ingest:>7.2f}s "
+              f"{series.memory_bytes() / 2**20:>7.1f}MB   " + "  ".join(cells))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
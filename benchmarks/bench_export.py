@@ -0,0 +1,98 @@
+"""Streaming exports: time, file size and memory per format.
+
+Exports every vehicle, in Vehicle ID order, with the All Vehicles columns
+through the background Exporter, as the table's Export button does. Each
+export runs in a fresh process whose private memory is sampled while the
+worker writes: the peak growth stays around one chunk of rows whatever the
+fleet size, next to what building the whole frame first
+(``DataFrame.to_csv`` on all rows) needs:
+
+    python benchmarks/bench_export.py [n_vehicles] [formats...]
+    python benchmarks/bench_export.py 1000000 CSV Parquet
+"""
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_export import FORMATS, Exporter  # noqa: E402
+from fleet_memory import process_memory  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+COLUMNS = ['Vehicle ID', 'Model', 'Status', 'Driver', 'FE (km/L)', 'Odometer (km)', 'Daily Distance (km)']
+
+
+def peak_private(fn):
+    """fn's result and the peak growth of private memory while it ran"""
+    gc.collect()
+    start = process_memory()['anon']
+    peak = [start]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], process_memory()['anon'])
+            time.sleep(0.02)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        result = fn()
+    finally:
+        done.set()
+        sampler.join()
+    return result, peak[0] - start
+
+
+def one(n, fmt):
+    """Run one export in this process; prints seconds, file bytes, peak bytes"""
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    order = np.argsort(fleet.series('vehicles', 'Vehicle ID').to_numpy(), kind='stable')
+    # Read every column once so the mapped file pages are in before measuring
+    fleet.rows('vehicles', order, COLUMNS)
+    with tempfile.TemporaryDirectory() as directory:
+        if fmt == 'whole':
+            path = os.path.join(directory, 'whole.csv')
+            t = time.perf_counter()
+            _, grew = peak_private(lambda: fleet.rows('vehicles', order, COLUMNS).to_csv(path, index=False))
+            print(time.perf_counter() - t, os.path.getsize(path), grew)
+            return
+        exporter = Exporter(fleet, directory)
+
+        def run():
+            job = exporter.submit('vehicles', order, COLUMNS, fmt, 'all_vehicles')
+            while job.state in ('queued', 'running'):
+                time.sleep(0.05)
+            return job
+        job, grew = peak_private(run)
+        if job.state != 'done':
+            raise RuntimeError(job.error)
+        print(job.seconds, job.size, grew)
+
+
+def main(n, formats):
+    print(f"{n:,} vehicles, {len(COLUMNS)} columns, one process per export\n")
+    print(f"{'format':<20} {'seconds':>8} {'rows/s':>10} {'file':>10} {'peak private':>13}")
+    for fmt in formats + ['whole']:
+        out = subprocess.run([sys.executable, __file__, str(n), '--one', fmt],
+                             capture_output=True, text=True, check=True).stdout.split()
+        seconds, size, grew = float(out[0]), int(out[1]), int(out[2])
+        label = fmt if fmt != 'whole' else 'CSV, whole frame'
+        print(f"{label:<20} {seconds:>8.1f} {n / seconds:>10,.0f} {size / 2**20:>7.1f}MiB "
+              f"{grew / 2**20:>10.1f}MiB")
+
+
+if __name__ == '__main__':
+    if '--one' in sys.argv:
+        one(int(sys.argv[1]), sys.argv[sys.argv.index('--one') + 1])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000, sys.argv[2:] or list(FORMATS))
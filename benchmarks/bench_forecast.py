@@ -0,0 +1,46 @@
+"""Fleet-wide forecast fit time.
+
+Fits both models to a synthetic (n_vehicles, 12 weeks) FE matrix with a few
+missing weeks, in one process and sharded over a process pool, and checks
+the trend they recover:
+
+    python benchmarks/bench_forecast.py [n_vehicles] [workers ...]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_forecast import HISTORY, METHODS, fit  # noqa: E402
+
+
+def main(n, pools):
+    rng = np.random.default_rng(0)
+    slope = rng.normal(0, 0.02, n)
+    weeks = np.arange(HISTORY)
+    fe = rng.uniform(3.2, 5.2, n)[:, None] + slope[:, None] * weeks + rng.normal(0, 0.05, (n, HISTORY))
+    mask = rng.random((n, HISTORY)) > 0.05
+    print(f"{n:,} vehicles x {HISTORY} weeks, {(~mask).mean():.0%} of weeks missing\n")
+    print(f"{'method':<8} {'workers':>7} {'seconds':>9} {'slope error':>12}")
+    for method in METHODS:
+        for workers in [1] + pools:
+            pool = ProcessPoolExecutor(workers, mp_context=get_context('spawn')) if workers > 1 else None
+            if pool is not None:
+                list(pool.map(abs, range(workers)))     # start the workers before timing
+            t = time.perf_counter()
+            _, fitted, _ = fit(fe, mask, method, pool)
+            seconds = time.perf_counter() - t
+            if pool is not None:
+                pool.shutdown()
+            error = np.abs(fitted - slope).mean()
+            print(f"{method:<8} {workers:>7} {seconds:>8.2f}s {error:>12.4f}")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 1_000_000, args[1:] or [2, 4])
@@ -0,0 +1,54 @@
+"""Cold-start time and peak memory of the fleet generator.
+
+Each size runs in a fresh interpreter so import cost and peak RSS are not
+shared between runs:
+
+    python benchmarks/bench_generate.py
+    python benchmarks/bench_generate.py 1000 250000
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = [1_000, 100_000, 1_000_000]
+
+
+def run_child(n):
+    """Import, generate both tables, and report timings as one JSON line"""
+    t0 = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    from fleet_data import default_driver_count, make_drivers, make_vehicles
+    t1 = time.perf_counter()
+    vehicles = make_vehicles(n)
+    drivers = make_drivers(default_driver_count(n))
+    t2 = time.perf_counter()
+    print(json.dumps({
+        'rows': n,
+        'import_s': round(t1 - t0, 3),
+        'generate_s': round(t2 - t1, 3),
+        'cold_start_s': round(t2 - t0, 3),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'frame_mb': round((vehicles.memory_usage(deep=True).sum()
+                           + drivers.memory_usage(deep=True).sum()) / 2**20, 1),
+    }))
+
+
+def main(sizes):
+    print(f"{'rows':>10} {'cold start':>11} {'generate':>9} {'peak RSS':>10} {'frames':>9}")
+    for n in sizes:
+        out = subprocess.run([sys.executable, __file__, '--child', str(n)],
+                             check=True, capture_output=True, text=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"{r['rows']:>10,} {r['cold_start_s']:>10.2f}s {r['generate_s']:>8.2f}s "
+              f"{r['peak_rss_mb']:>8.0f}MB {r['frame_mb']:>7.0f}MB")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        run_child(int(sys.argv[2]))
+    else:
+        main([int(a) for a in sys.argv[1:]] or SIZES)
@@ -0,0 +1,104 @@
+"""Telemetry ingestion throughput, per source.
+
+Generates synthetic trip/fuel events for a fleet and times Rollups.ingest
+fed from memory, from a CSV file and from a local TCP socket. The last run
+ingests on a background thread while the main thread keeps reading trend
+series, the way a page would, and reports those reads' latency:
+
+    python benchmarks/bench_ingest.py                 # 10k vehicles, 14 days
+    python benchmarks/bench_ingest.py 100000 7
+"""
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+from fleet_telemetry import (FIELDS, Rollups, TelemetryFeed, read_csv, read_socket,  # noqa: E402
+                             replay, write_csv)
+
+TARGET = 50_000     # events/s on one core
+
+
+def timed_ingest(fleet, batches):
+    rollups = Rollups(fleet.n_vehicles, fleet.n_drivers)
+    t = time.perf_counter()
+    events = 0
+    for batch in batches:
+        rollups.ingest(batch)
+        events += len(batch)
+    return events, time.perf_counter() - t
+
+
+def serve_csv(batches):
+    """A one-shot TCP server streaming the batches as header-less CSV lines"""
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def send():
+        conn, _ = server.accept()
+        with conn:
+            for batch in batches:
+                rows = np.column_stack([batch[name].astype(np.float64) for name in FIELDS])
+                lines = '\n'.join(','.join(f"{x:.6g}" if i > 3 else str(int(x)) for i, x in enumerate(r))
+                                  for r in rows)
+                conn.sendall((lines + '\n').encode())
+        server.close()
+
+    threading.Thread(target=send, daemon=True).start()
+    return server.getsockname()
+
+
+def report(label, events, seconds):
+    rate = events / seconds
+    print(f"{label:<28} {events:>11,} events {seconds:>7.2f}s {rate:>12,.0f}/s  "
+          f"{'ok' if rate >= TARGET else 'BELOW TARGET'}")
+
+
+def main(n, days):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    start = np.datetime64('today', 'D') - days
+    batches = list(replay(fleet, start, days))
+    print(f"{n:,} vehicles, {days} days, target {TARGET:,} events/s\n")
+
+    report("memory (replay generator)", *timed_ingest(fleet, batches))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'events.csv')
+        write_csv(batches, path)
+        report("CSV file (parse + ingest)", *timed_ingest(fleet, read_csv(path)))
+
+    small = batches[:max(1, len(batches) // 10)]
+    host, port = serve_csv(small)
+    report("TCP socket (parse + ingest)", *timed_ingest(fleet, read_socket(host, port)))
+
+    # Background ingestion while the "page" reads trend series
+    rollups = Rollups(fleet.n_vehicles, fleet.n_drivers)
+    feed = TelemetryFeed(rollups, iter(batches))
+    t = time.perf_counter()
+    feed.start()
+    reads = []
+    while feed.running:
+        r = time.perf_counter()
+        rollups.series('day', periods=7)
+        rollups.series('week', 'vehicle', 0, periods=7)
+        reads.append(time.perf_counter() - r)
+        time.sleep(0.005)
+    seconds = time.perf_counter() - t
+    report("background thread", rollups.events, seconds)
+    if reads:
+        reads = np.array(reads) * 1000
+        print(f"{'':<28} concurrent reads: {len(reads)}, p50 {np.percentile(reads, 50):.2f}ms, "
+              f"p99 {np.percentile(reads, 99):.2f}ms")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 10_000, args[1] if len(args) > 1 else 14)
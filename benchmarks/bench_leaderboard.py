@@ -0,0 +1,70 @@
+"""Live leaderboards against re-ranking after every update.
+
+Builds the FE leaderboard, then applies batches of changed vehicles of
+growing size through the fleet and times them next to what the leaderboard
+replaces, a full argsort of the column (SortIndex after a version change).
+Batches go through ``fleet.update``, so about a millisecond of each is the
+fleet's own write and listener frames. The leaderboard's top 20, bottom 20,
+a page slice and the rank of one vehicle are checked against the sort:
+
+    python benchmarks/bench_leaderboard.py [n_vehicles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_leaderboard import Leaderboard  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+COLUMN = 'FE (km/L)'
+BATCHES = [1, 10, 100, 1000, 10000]
+REPEAT = 5
+
+
+def main(n):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    t = time.perf_counter()
+    board = Leaderboard(fleet, 'vehicles', COLUMN)
+    print(f"{n:,} vehicles; leaderboard built in {(time.perf_counter() - t) * 1000:.0f}ms, "
+          f"{len(board._keys):,} blocks\n")
+    print(f"{'batch':>6} {'update':>10} {'per row':>9} {'argsort':>9} {'top 20':>8} {'rank':>8}  match")
+    rng = np.random.default_rng(0)
+    for size in BATCHES:
+        if size > n:
+            break
+        update = 0.0
+        for _ in range(REPEAT):
+            positions = rng.choice(n, size, replace=False)
+            values = np.round(rng.uniform(2.0, 6.5, size), 1).astype(np.float32)
+            t = time.perf_counter()
+            fleet.update('vehicles', positions, {COLUMN: values})
+            update += time.perf_counter() - t
+        update /= REPEAT
+
+        fe = fleet.series('vehicles', COLUMN).to_numpy()
+        t = time.perf_counter()
+        expected = np.lexsort((np.arange(n), -fe.astype(np.float64)))
+        argsort = time.perf_counter() - t
+        t = time.perf_counter()
+        top = board.top(20)
+        top_s = time.perf_counter() - t
+        probe = int(expected[n // 2])
+        t = time.perf_counter()
+        rank = board.rank(probe)
+        rank_s = time.perf_counter() - t
+        page = n // 3
+        same = (np.array_equal(top, expected[:20]) and np.array_equal(board.bottom(20), expected[::-1][:20])
+                and np.array_equal(board.slice(page, page + 50), expected[page:page + 50])
+                and rank == n // 2 + 1)
+        print(f"{size:>6} {update * 1000:>8.2f}ms {update / size * 1e6:>7.1f}us {argsort * 1000:>7.1f}ms "
+              f"{top_s * 1e6:>6.1f}us {rank_s * 1e6:>6.1f}us  {same}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,70 @@
+"""Maintenance due index against masks and sorts on the frame.
+
+Times the schedule queries the Maintenance pages make, answered by the
+DueIndex and by a pandas range mask plus sort_values, then logs batches of
+services and times the queries again while the updates sit in the side set:
+
+    python benchmarks/bench_maintenance.py [n_vehicles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_maintenance import DUE, KM, DueIndex, log_service  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+
+def best_of(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def main(n):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    t = time.perf_counter()
+    index = DueIndex(fleet)
+    print(f"{n:,} vehicles; index built in {(time.perf_counter() - t) * 1000:.0f}ms\n")
+
+    def pandas_due(lo, hi):
+        df = fleet.vehicles([DUE, KM])
+        return df[df[DUE].between(lo, hi)].sort_values([DUE, KM], ascending=[True, False]).index
+
+    queries = [
+        ("due in next 30 days", lambda: index.due_between(0, 30), lambda: pandas_due(0, 30)),
+        ("overdue", index.overdue, lambda: pandas_due(-10**9, -1)),
+        ("count due in 7 days", lambda: index.count(0, 7),
+         lambda: fleet.series('vehicles', DUE).between(0, 7).sum()),
+        ("next 100 services", lambda: index.next(100), lambda: pandas_due(0, 10**9)[:100]),
+        ("workload per day, 60 days", lambda: index.workload(0, 60),
+         lambda: fleet.series('vehicles', DUE).value_counts().reindex(range(61), fill_value=0)),
+    ]
+
+    def report(title):
+        print(f"{title}\n{'query':<28} {'index':>10} {'pandas':>10}")
+        for label, fast, slow in queries:
+            print(f"{label:<28} {best_of(fast):>8.2f}ms {best_of(slow, 2):>8.1f}ms")
+        print()
+
+    report("fresh index")
+    rng = np.random.default_rng(0)
+    for batch in (1, 1000, n // 20):
+        t = best_of(lambda: log_service(fleet, rng.integers(0, n, batch)), 3)
+        print(f"log {batch:,} services: {t:.2f}ms per batch")
+    print()
+    report(f"with {len(index.moved):,} rows in the side set")
+    same = np.array_equal(index.due_between(0, 30), pandas_due(0, 30).to_numpy())
+    print(f"index agrees with pandas after updates: {same}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
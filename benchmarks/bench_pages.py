@@ -0,0 +1,158 @@
+"""Headless per-page benchmark of the dashboard.
+
+Drives fleet_dashboard.py with Streamlit's AppTest, one fresh interpreter
+per fleet size, and visits every sidebar page twice (first visit, then a
+warm rerun). For each page it records script-run wall time, peak RSS, and
+the dataframes and figures the page sends, in total and per tab:
+
+    python benchmarks/bench_pages.py                        # 150, 10k, 100k, 1M
+    python benchmarks/bench_pages.py 150 10000 --out base.json
+    python benchmarks/bench_pages.py --compare base.json new.json
+
+--compare prints the change in time and payload per page and exits 1 when
+any page got more than --threshold (default 25%) slower or heavier.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'fleet_dashboard.py')
+SIZES = [150, 10_000, 100_000, 1_000_000]
+MIN_SECONDS = 0.05      # smaller slowdowns are timing noise, whatever the ratio
+
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, 'children', {}).values():
+        yield from walk(child)
+
+
+def payload(node):
+    """Count and bytes of the dataframes and figures under node"""
+    out = {'dataframes': 0, 'dataframe_rows': 0, 'dataframe_bytes': 0,
+           'figures': 0, 'figure_bytes': 0}
+    for el in walk(node):
+        kind = getattr(el, 'type', None)
+        if kind == 'plotly_chart':
+            out['figures'] += 1
+            out['figure_bytes'] += len(el.proto.spec.encode())
+        elif kind == 'dataframe':
+            out['dataframes'] += 1
+            out['dataframe_rows'] += len(el.value)
+            out['dataframe_bytes'] += len(el.proto.arrow_data.data)
+    return out
+
+
+def run_child(n):
+    """Visit every page at one fleet size; print the results as one JSON line"""
+    os.environ['FLEET_VEHICLES'] = str(n)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=900)
+    t = time.perf_counter()
+    at.run()
+    result = {'vehicles': n, 'startup_s': round(time.perf_counter() - t, 3),
+              'startup_rss_mb': peak_rss_mb(), 'pages': []}
+    for label in at.sidebar.radio[0].options:
+        t = time.perf_counter()
+        at.sidebar.radio[0].set_value(label).run()
+        first = time.perf_counter() - t
+        t = time.perf_counter()
+        at.run()
+        warm = time.perf_counter() - t
+        page = {
+            'page': label,
+            'first_visit_s': round(first, 3),
+            'rerun_s': round(warm, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'errors': [e.value for e in at.exception],
+            **payload(at.main),
+            'tabs': [{'tab': tab.label, **payload(tab)} for tab in at.tabs],
+        }
+        result['pages'].append(page)
+    print(json.dumps(result))
+
+
+def run(sizes):
+    runs = []
+    for n in sizes:
+        print(f"== {n:,} vehicles ==", file=sys.stderr)
+        out = subprocess.run([sys.executable, __file__, '--child', str(n)],
+                             check=True, capture_output=True, text=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"startup {r['startup_s']:.2f}s, {r['startup_rss_mb']:.0f}MB", file=sys.stderr)
+        for p in r['pages']:
+            flag = '  ERROR' if p['errors'] else ''
+            print(f"  {p['page']:<24} {p['first_visit_s']:>7.2f}s {p['rerun_s']:>7.2f}s "
+                  f"{p['peak_rss_mb']:>7.0f}MB {p['figure_bytes'] / 1024:>8.1f}KB fig "
+                  f"{p['dataframe_bytes'] / 1024:>8.1f}KB df{flag}", file=sys.stderr)
+        runs.append(r)
+    return {'python': platform.python_version(), 'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'runs': runs}
+
+
+def compare(base, new, threshold):
+    """Per-page ratios new/base; True when something regressed past threshold"""
+    regressed = False
+    base_runs = {r['vehicles']: r for r in base['runs']}
+    for r in new['runs']:
+        old = base_runs.get(r['vehicles'])
+        if old is None:
+            continue
+        old_pages = {p['page']: p for p in old['pages']}
+        print(f"== {r['vehicles']:,} vehicles ==")
+        for p in r['pages']:
+            o = old_pages.get(p['page'])
+            if o is None:
+                continue
+            notes = []
+            for key in ('first_visit_s', 'rerun_s', 'figure_bytes', 'dataframe_bytes'):
+                a, b = o[key], p[key]
+                if key.endswith('_s') and b - a < MIN_SECONDS:
+                    continue
+                if a == 0:
+                    if b:
+                        regressed = True
+                        notes.append(f"{key} 0 -> {b}")
+                elif (b - a) / a > threshold:
+                    regressed = True
+                    notes.append(f"{key} {a} -> {b} ({(b - a) / a:+.0%})")
+            if p['errors'] and not o['errors']:
+                regressed = True
+                notes.append("new errors")
+            print(f"  {p['page']:<24} {'; '.join(notes) or 'ok'}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sizes', nargs='*', type=int, default=SIZES)
+    parser.add_argument('--out', default='bench_pages.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'))
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f, open(args.compare[1]) as g:
+            sys.exit(1 if compare(json.load(f), json.load(g), args.threshold) else 0)
+    results = run(args.sizes)
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f"wrote {args.out}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        run_child(int(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,65 @@
+"""Fleet queries against the pandas they replace.
+
+Times the dashboard's rankings (top 20 FE, top 15 CO2, top 20 drivers) and
+an OR filter through FleetQuery, cold and from its result cache, next to
+pandas nlargest and boolean masks, and checks the results agree:
+
+    python benchmarks/bench_query.py [n_vehicles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_query import FleetQuery  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+REPEAT = 5
+FILTER = [('Idle Time (min)', '>', 150), ('FE (km/L)', '<', 3.5), ('Status', '==', 'Maintenance')]
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main(n):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    vehicles = fleet.vehicles(['FE (km/L)', 'Daily CO2 (kg)', 'Idle Time (min)', 'Status'])
+    drivers = fleet.drivers(['Efficiency (km/L)'])
+    cases = [
+        ('top 20 FE', ('top', 'vehicles', 'FE (km/L)', 20, ('FE (km/L)',), False),
+         lambda: vehicles.nlargest(20, 'FE (km/L)')['FE (km/L)'], lambda r: r['FE (km/L)']),
+        ('top 15 CO2', ('top', 'vehicles', 'Daily CO2 (kg)', 15, ('Daily CO2 (kg)',), False),
+         lambda: vehicles.nlargest(15, 'Daily CO2 (kg)')['Daily CO2 (kg)'], lambda r: r['Daily CO2 (kg)']),
+        ('top 20 drivers', ('top', 'drivers', 'Efficiency (km/L)', 20, ('Efficiency (km/L)',), False),
+         lambda: drivers.nlargest(20, 'Efficiency (km/L)')['Efficiency (km/L)'],
+         lambda r: r['Efficiency (km/L)']),
+        ('needs attention OR', ('where', 'vehicles', tuple(FILTER), True),
+         lambda: np.flatnonzero(((vehicles['Idle Time (min)'] > 150) | (vehicles['FE (km/L)'] < 3.5)
+                                 | (vehicles['Status'] == 'Maintenance')).to_numpy()), lambda r: r),
+    ]
+    print(f"{n:,} vehicles, best of {REPEAT}\n")
+    print(f"{'query':<20} {'pandas':>9} {'query':>9} {'cached':>9}  match")
+    for label, (name, *params), pandas, values in cases:
+        slow, expected = best_of(pandas)
+        query = FleetQuery(fleet, cache_size=0)
+        fast, result = best_of(lambda: query.run(name, *params))
+        query.cache_size = 16
+        query.run(name, *params)
+        hit, _ = best_of(lambda: query.run(name, *params))
+        same = np.array_equal(np.asarray(values(result)), np.asarray(expected))
+        print(f"{label:<20} {slow * 1000:>7.1f}ms {fast * 1000:>7.1f}ms {hit * 1e6:>7.1f}us  {same}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
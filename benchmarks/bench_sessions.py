@@ -0,0 +1,69 @@
+"""Memory per concurrent session.
+
+Opens sessions one after another in one process with Streamlit's AppTest and
+keeps them all alive; each visits every page. Process RSS after the first
+session is the shared cost (fleet, indexes, caches); the growth per further
+session is what one more fleet manager costs, next to what the session
+ledger counts and what a per-session copy of the tables (the old
+``st.cache_data`` behaviour) would have cost:
+
+    python benchmarks/bench_sessions.py [sessions]
+    FLEET_VEHICLES=1000000 python benchmarks/bench_sessions.py 20
+"""
+import gc
+import os
+import pickle
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'fleet_dashboard.py')
+os.environ.setdefault('FLEET_METRICS', '1')
+sys.path.insert(0, ROOT)
+
+import fleet_app  # noqa: E402
+from fleet_memory import process_memory  # noqa: E402
+from fleet_pages import PAGES  # noqa: E402
+
+
+def mib(x):
+    return f"{x / 2**20:,.1f} MiB"
+
+
+def open_session():
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.run()
+    for page in PAGES:
+        at.sidebar.radio[0].set_value(page.label).run()
+        if at.exception:
+            raise RuntimeError(f"{page.label}: {at.exception[0].message}")
+    return at
+
+
+def main(n):
+    t = time.perf_counter()
+    sessions = [open_session()]
+    gc.collect()
+    shared = process_memory()
+    print(f"{fleet_app.FLEET_VEHICLES:,} vehicles; first session {time.perf_counter() - t:.1f}s, "
+          f"process {mib(shared['rss'])} ({mib(shared['anon'])} private, {mib(shared['file'])} mapped)\n")
+    print(f"{'sessions':>8} {'rss':>12} {'per session':>12}")
+    for i in range(2, n + 1):
+        sessions.append(open_session())
+        if i in (2, 5) or i % 10 == 0 or i == n:
+            gc.collect()
+            rss = process_memory()['rss']
+            print(f"{i:>8} {mib(rss):>12} {mib((rss - shared['rss']) / (i - 1)):>12}")
+
+    ledger = fleet_app.open_session_ledger().report()
+    fleet = fleet_app.fleet()
+    copy = len(pickle.dumps(fleet.vehicles())) + len(pickle.dumps(fleet.drivers()))
+    # AppTest gives every session the same id, so the ledger holds one entry here
+    print(f"\nledger: {ledger['session bytes max'] / 1024:,.1f} KiB of session state and page-data copies "
+          f"per session")
+    print(f"per-session copy of both tables (st.cache_data): {mib(copy)}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
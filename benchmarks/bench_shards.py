@@ -0,0 +1,69 @@
+"""State-sharded aggregation against a single-threaded pandas groupby.
+
+Runs the dashboard's fleet aggregates (CO2 and cost totals, mean FE, an FE
+histogram, all per state) through ShardedFleet with 1, 2, 4 ... workers and
+through one pandas groupby, and checks the totals agree:
+
+    python benchmarks/bench_shards.py [n_vehicles] [workers ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_shards import COLUMNS, ShardedFleet  # noqa: E402
+from fleet_state import Fleet  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+EDGES = np.linspace(3.2, 5.2, 26)
+SPECS = {
+    'co2': ('sum', 'Daily CO2 (kg)'), 'maint': ('sum', 'Maintenance Cost (₹)'),
+    'km': ('sum', 'Odometer (km)'), 'fe': ('mean', 'FE (km/L)'),
+    'idle_max': ('max', 'Idle Time (min)'), 'fe_hist': ('hist', 'FE (km/L)', EDGES),
+}
+REPEAT = 5
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEAT):
+        t = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, result
+
+
+def main(n, pools):
+    fleet = Fleet(open_store(n, default_driver_count(n), 42))
+    df = fleet.vehicles(['State'] + COLUMNS)
+
+    def pandas():
+        g = df.groupby('State', observed=True)
+        by_state = g.agg(co2=('Daily CO2 (kg)', 'sum'), maint=('Maintenance Cost (₹)', 'sum'),
+                         km=('Odometer (km)', 'sum'), fe=('FE (km/L)', 'mean'),
+                         idle_max=('Idle Time (min)', 'max'))
+        hist = g['FE (km/L)'].apply(lambda s: np.histogram(s, EDGES)[0])
+        return by_state, hist
+
+    base, (by_state, _) = best_of(pandas)
+    print(f"{n:,} vehicles, {len(SPECS)} aggregates by state, best of {REPEAT}, {os.cpu_count()} CPUs\n")
+    print(f"{'pandas groupby':<22} {base * 1000:>8.1f}ms")
+    for workers in [1] + pools:
+        t = time.perf_counter()
+        sharded = ShardedFleet(fleet, workers=workers)
+        sharded.aggregate(SPECS)            # starts the pool
+        setup = time.perf_counter() - t
+        seconds, (totals, _) = best_of(lambda: sharded.aggregate(SPECS))
+        same = np.isclose(totals['co2'], by_state['co2'].sum(), rtol=1e-6)
+        print(f"{f'sharded, {workers} worker(s)':<22} {seconds * 1000:>8.1f}ms  "
+              f"x{base / seconds:4.1f}  (setup {setup:.2f}s, totals match: {same})")
+        sharded.close()
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 1_000_000, args[1:] or [2, 4])
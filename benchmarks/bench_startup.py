@@ -0,0 +1,76 @@
+"""Dashboard start-up and first-visit cost of each page.
+
+Runs the app headless with Streamlit's AppTest in a fresh interpreter:
+first render (shell plus landing page), a no-op rerun, then each page in
+sidebar order, listing the modules a page pulled in on its first visit:
+
+    python benchmarks/bench_startup.py
+    FLEET_VEHICLES=100000 python benchmarks/bench_startup.py
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'fleet_dashboard.py')
+WATCHED = ('plotly.express', 'plotly.graph_objects', 'fleet_figures', 'fleet_search',
+           'fleet_table', 'fleet_views')
+
+
+def loaded():
+    return {m for m in WATCHED if m in sys.modules} | \
+        {m for m in sys.modules if m.startswith('fleet_pages.')}
+
+
+def run_child():
+    """Render the app, rerun it, visit every page; one JSON line of timings"""
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+    from fleet_pages import PAGES
+
+    at = AppTest.from_file(APP, default_timeout=600)
+    t0 = time.perf_counter()
+    at.run()
+    t1 = time.perf_counter()
+    at.run()
+    t2 = time.perf_counter()
+    result = {
+        'first_render_s': round(t1 - t0, 3),
+        'rerun_s': round(t2 - t1, 3),
+        'startup_modules': sorted(loaded()),
+        'pages': [],
+    }
+    for page in PAGES:
+        before = loaded()
+        t = time.perf_counter()
+        at.sidebar.radio[0].set_value(page.label).run()
+        result['pages'].append({
+            'page': page.label,
+            'first_visit_s': round(time.perf_counter() - t, 3),
+            'error': bool(at.exception),
+            'new_modules': sorted(loaded() - before),
+        })
+    result['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    print(json.dumps(result))
+
+
+def main():
+    out = subprocess.run([sys.executable, __file__, '--child'],
+                         check=True, capture_output=True, text=True).stdout
+    r = json.loads(out.strip().splitlines()[-1])
+    print(f"first render {r['first_render_s']:.2f}s, rerun {r['rerun_s']:.3f}s, "
+          f"peak RSS {r['peak_rss_mb']:.0f}MB")
+    print(f"loaded at start-up: {', '.join(r['startup_modules']) or '-'}\n")
+    for p in r['pages']:
+        status = 'ERROR' if p['error'] else ''
+        print(f"{p['page']:<24} {p['first_visit_s']:>6.2f}s  {', '.join(p['new_modules'])} {status}")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--child']:
+        run_child()
+    else:
+        main()
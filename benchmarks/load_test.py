@@ -0,0 +1,260 @@
+"""Concurrent-session load test of the dashboard server.
+
+Starts ``streamlit run fleet_dashboard.py`` headless on a free port and
+opens browser sessions over the websocket protocol the frontend speaks:
+each rerun sends a BackMsg with the session's widget states and reads
+ForwardMsgs until the script run finishes. Every session follows a click
+path with exponential think time between clicks (sidebar pages, a
+``vehicle_search`` query, the ``veh_detail`` and ``drv_detail`` drill-downs,
+their history windows, the Daily/Weekly/Monthly radio). For each
+concurrency level it reports rerun latency percentiles, reruns per second,
+errors and the server's resident memory:
+
+    python benchmarks/load_test.py                          # 1, 5, 10, 25, 50 sessions
+    python benchmarks/load_test.py 1 10 50 --duration 60 --think 0
+    FLEET_VEHICLES=100000 python benchmarks/load_test.py --out load.json
+
+The server inherits the environment, so fleet size and FLEET_* settings
+apply as for ``streamlit run``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, 'fleet_dashboard.py')
+sys.path.insert(0, ROOT)
+
+from fleet_memory import process_memory  # noqa: E402
+from fleet_pages import PAGES  # noqa: E402
+
+LEVELS = [1, 5, 10, 25, 50]
+WIDGETS = ('radio', 'selectbox', 'text_input')
+SEARCHES = ['MH', 'KA-0*', 'TN-33-*', 'Driver A1', 'TRK-12', 'Driver C']
+FINISHED = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR)
+
+
+class Session:
+    """One browser tab: the widgets of its last run and the values it has set"""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.widgets = {}       # key, or label for unkeyed widgets -> (id, options)
+        self.states = {}        # widget id -> WidgetState
+
+    @classmethod
+    async def open(cls, url):
+        ws = await websockets.connect(url, subprotocols=['streamlit'], max_size=None)
+        return cls(ws)
+
+    def set(self, name, value):
+        """Set a widget from the last run by key or label; False if it isn't there"""
+        widget = self.widgets.get(name)
+        if widget is None:
+            return False
+        state = WidgetState(id=widget[0])
+        state.string_value = value
+        self.states[widget[0]] = state
+        return True
+
+    def options(self, name):
+        widget = self.widgets.get(name)
+        return widget[1] if widget else []
+
+    async def rerun(self):
+        """Run the script with the current widget states: (seconds, errors)"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = ''
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        t = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        widgets, errors = {}, 0
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof('type')
+            if kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                element = fwd.delta.new_element
+                etype = element.WhichOneof('type')
+                if etype in WIDGETS:
+                    w = getattr(element, etype)
+                    key = w.id.rsplit('-', 1)[-1]
+                    widgets[w.label if key == 'None' else key] = (w.id, list(getattr(w, 'options', [])))
+                elif etype == 'exception':
+                    errors += 1
+            elif kind == 'script_finished' and fwd.script_finished in FINISHED:
+                break
+        seconds = time.perf_counter() - t
+        # The frontend only sends the state of widgets still on the page
+        ids = {wid for wid, _ in widgets.values()}
+        self.widgets = widgets
+        self.states = {wid: s for wid, s in self.states.items() if wid in ids}
+        return seconds, errors
+
+    async def close(self):
+        await self.ws.close()
+
+
+def click_path(rng):
+    """One pass of clicks: (widget, value or a function of its options)"""
+    other = [p.label for p in PAGES if p.module not in ('overview', 'vehicles', 'drivers')]
+    return [
+        ('Navigation', '🚛 Vehicle Analysis'),
+        ('vehicle_search', str(rng.choice(SEARCHES))),
+        ('veh_detail', lambda options: rng.choice(options)),
+        ('veh_window', lambda options: rng.choice(options)),
+        ('Navigation', '👤 Driver Performance'),
+        ('drv_detail', lambda options: rng.choice(options)),
+        ('drv_window', lambda options: rng.choice(options)),
+        ('Navigation', '🏠 Fleet Overview'),
+        ('Time Period', lambda options: rng.choice(options)),
+        ('Navigation', str(rng.choice(other))),
+    ]
+
+
+async def user(url, seed, stop, think, record):
+    """A session clicking through the path until stop, recording (step, seconds, errors)"""
+    rng = np.random.default_rng(seed)
+    session = await Session.open(url)
+    try:
+        record('load', *await session.rerun())
+        while time.perf_counter() < stop:
+            for name, value in click_path(rng):
+                if think:
+                    await asyncio.sleep(rng.exponential(think))
+                if time.perf_counter() >= stop:
+                    break
+                if callable(value):
+                    options = session.options(name)
+                    if not options:
+                        continue
+                    value = value(options)
+                if session.set(name, value):
+                    record(name, *await session.rerun())
+    finally:
+        await session.close()
+
+
+async def level(url, n, duration, think, pid):
+    """n concurrent sessions for duration seconds; latencies and server memory"""
+    samples = []
+    peak = {'rss': 0}
+
+    def record(step, seconds, errors):
+        samples.append((step, seconds, errors))
+
+    async def watch():
+        while True:
+            rss = process_memory(pid).get('rss', 0)
+            peak['rss'] = max(peak['rss'], rss)
+            await asyncio.sleep(0.5)
+
+    watcher = asyncio.create_task(watch())
+    start = time.perf_counter()
+    stop = start + duration
+    results = await asyncio.gather(*(user(url, i, stop, think, record) for i in range(n)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    watcher.cancel()
+    failed = [r for r in results if isinstance(r, Exception)]
+    clicks = np.array([s for step, s, _ in samples if step != 'load'])
+    loads = np.array([s for step, s, _ in samples if step == 'load'])
+    p50, p90, p99 = np.percentile(clicks, [50, 90, 99]) if len(clicks) else (np.nan,) * 3
+    return {
+        'sessions': n, 'reruns': len(clicks), 'reruns_per_s': round(len(clicks) / elapsed, 2),
+        'p50_s': round(float(p50), 3), 'p90_s': round(float(p90), 3), 'p99_s': round(float(p99), 3),
+        'max_s': round(float(clicks.max()), 3) if len(clicks) else None,
+        'first_load_p50_s': round(float(np.median(loads)), 3) if len(loads) else None,
+        'errors': sum(e for _, _, e in samples), 'failed_sessions': len(failed),
+        'server_rss_mb': round(peak['rss'] / 2**20, 1),
+        'steps': {step: round(float(np.median([s for st, s, _ in samples if st == step])), 3)
+                  for step in sorted({st for st, _, _ in samples})},
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', APP, '--server.headless', 'true',
+         '--server.port', str(port), '--server.address', '127.0.0.1',
+         '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    health = f"http://127.0.0.1:{port}/_stcore/health"
+    for _ in range(600):
+        try:
+            with urllib.request.urlopen(health, timeout=1) as r:
+                if r.status == 200:
+                    return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError("streamlit exited during start-up")
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("streamlit did not come up")
+
+
+async def warm_up(url):
+    """Visit every page once so the first level doesn't pay for the cold loads"""
+    session = await Session.open(url)
+    t = time.perf_counter()
+    await session.rerun()
+    for page in PAGES:
+        session.set('Navigation', page.label)
+        await session.rerun()
+    await session.close()
+    return time.perf_counter() - t
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('levels', nargs='*', type=int, default=LEVELS, help="concurrent sessions per level")
+    parser.add_argument('--duration', type=float, default=30, help="seconds per level")
+    parser.add_argument('--think', type=float, default=1.0, help="mean seconds between clicks")
+    parser.add_argument('--out', help="write the results as JSON")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = start_server(port)
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    try:
+        print(f"warm-up (every page once): {asyncio.run(warm_up(url)):.1f}s, "
+              f"server {process_memory(server.pid).get('rss', 0) / 2**20:,.0f} MiB\n")
+        print(f"{'sessions':>8} {'reruns':>7} {'rerun/s':>8} {'p50':>7} {'p90':>7} {'p99':>7} "
+              f"{'max':>7} {'errors':>6} {'rss MiB':>8}")
+        results = []
+        for n in args.levels:
+            r = asyncio.run(level(url, n, args.duration, args.think, server.pid))
+            results.append(r)
+            print(f"{n:>8} {r['reruns']:>7} {r['reruns_per_s']:>8.2f} {r['p50_s']:>6.3f}s {r['p90_s']:>6.3f}s "
+                  f"{r['p99_s']:>6.3f}s {r['max_s'] or 0:>6.3f}s {r['errors'] + r['failed_sessions']:>6} "
+                  f"{r['server_rss_mb']:>8,.0f}")
+    finally:
+        server.terminate()
+        server.wait()
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'vehicles': int(os.environ.get('FLEET_VEHICLES', 150)), 'duration_s': args.duration,
+                       'think_s': args.think, 'levels': results}, f, indent=1)
+        print(f"wrote {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Memory per column and per page, compact schema against the old layout.
+
+The old layout is what the dashboard used before the schema existed: object
+strings for text and int64/float64 for every number.
+
+    python benchmarks/memory_report.py [n_vehicles]
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet_data import default_driver_count  # noqa: E402
+from fleet_pages import page_data  # noqa: E402
+from fleet_schema import DRIVER_COLUMNS, VEHICLE_COLUMNS, memory_report, page_memory_report  # noqa: E402
+from fleet_store import open_store  # noqa: E402
+
+
+def legacy_layout(df):
+    """The frame as object strings and 64-bit numbers"""
+    out = df.copy()
+    for col in out.columns:
+        kind = out[col].dtype.kind
+        if kind in 'iu':
+            out[col] = out[col].astype(np.int64)
+        elif kind == 'f':
+            out[col] = out[col].astype(np.float64).round(2)
+        elif kind != 'b':
+            out[col] = out[col].astype(object)
+    return out
+
+
+def mb(x):
+    return f"{x / 2**20:,.2f}"
+
+
+def main(n):
+    store = open_store(n, default_driver_count(n), 42)
+    vehicles, drivers = store.vehicles(VEHICLE_COLUMNS), store.drivers(DRIVER_COLUMNS)
+    reports = {}
+    for label, v, d in [('compact', vehicles, drivers),
+                        ('legacy', legacy_layout(vehicles), legacy_layout(drivers))]:
+        reports[label] = memory_report(v), memory_report(d)
+
+    print(f"Fleet of {n:,} vehicles / {len(drivers):,} drivers\n")
+    for table, i in [('vehicles', 0), ('drivers', 1)]:
+        compact, legacy = reports['compact'][i], reports['legacy'][i]
+        table_df = compact.join(legacy, rsuffix=' legacy')
+        table_df['saved'] = 1 - table_df['bytes'] / table_df['bytes legacy']
+        print(f"== {table} ==")
+        print(table_df[['dtype', 'bytes/row', 'dtype legacy', 'bytes/row legacy', 'saved']]
+              .to_string(float_format=lambda x: f"{x:.2f}"))
+        print(f"total: {mb(compact['bytes'].sum())} MB compact vs "
+              f"{mb(legacy['bytes'].sum())} MB legacy\n")
+
+    print("== per page ==")
+    columns = page_data()
+    pages = page_memory_report(*reports['compact'], columns).join(
+        page_memory_report(*reports['legacy'], columns), rsuffix=' legacy')
+    print(pages[['total bytes', 'total bytes legacy']]
+          .map(lambda x: f"{mb(x)} MB").to_string())
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
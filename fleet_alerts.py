@@ -0,0 +1,267 @@
+"""Declarative vehicle alert rules, evaluated as vectorized predicates.
+
+A ``Rule`` is a column, a comparison, a threshold and a severity. Rules on
+the same column and comparison are compiled into one sorted threshold array:
+a vehicle's value is placed in it with a single ``searchsorted``, and every
+rule below that point fires. So the cost of a pass grows with the number of
+distinct (column, comparison) pairs, not with the number of rules, and
+hundreds of rules over 500k vehicles take one scan per column.
+
+Each row keeps its state in every group (how many thresholds it passed, or
+which label it has) and its highest-ranked alert. ``AlertEngine`` subscribes
+to the fleet, so an update re-places only the changed rows and adjusts the
+per-rule counts by their difference.
+
+Rows are ranked by severity, then by how far past the threshold the value
+is. Equality rules (``Status == 'Maintenance'``) rank at their severity.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+import fleet_metrics as metrics
+
+INFO, WARNING, CRITICAL = 1, 2, 3
+SEVERITIES = {CRITICAL: 'critical', WARNING: 'warning', INFO: 'info'}
+OPS = ['>', '>=', '<', '<=', '==', 'z>', 'z<']
+
+
+class Rule:
+    """Fires on vehicles where `column op value`
+
+    ``op`` is a comparison, ``==`` for a label, or ``z>``/``z<`` for a value
+    more than `value` standard deviations above/below the fleet mean (taken
+    when the engine is built). ``detail`` is a format string for ``value``,
+    the vehicle's value in the column, or a function of it.
+    """
+
+    def __init__(self, name, column, op, value, severity, title, detail="{value}"):
+        if op not in OPS:
+            raise ValueError(f"unknown op {op!r} in rule {name!r}; use one of {OPS}")
+        self.name, self.column, self.op, self.value = name, column, op, value
+        self.severity, self.title, self.detail = severity, title, detail
+
+    def __repr__(self):
+        return f"Rule({self.name!r}: {self.column} {self.op} {self.value!r}, {SEVERITIES[self.severity]})"
+
+
+# Thresholds sit in the tails of what fleet_data generates: idle 20-180 min,
+# next service -10..60 days, 1,000-15,000 km since service, FE 3.2-5.2 km/L
+RULES = [
+    Rule('service_overdue_long', 'Next Service (days)', '<', -7, CRITICAL,
+         "🔧 Service long overdue", lambda days: f"overdue by {-days:.0f} days"),
+    Rule('idle_critical', 'Idle Time (min)', '>', 170, CRITICAL,
+         "⚠️ Critical idle", "idle {value:.0f} min"),
+    Rule('service_overdue', 'Next Service (days)', '<', 0, WARNING,
+         "🔧 Service overdue", lambda days: f"overdue by {-days:.0f} days"),
+    Rule('idle_extended', 'Idle Time (min)', '>', 150, WARNING,
+         "⚠️ Extended idle", "idle {value:.0f} min"),
+    Rule('fe_low', 'FE (km/L)', '<', 3.4, WARNING,
+         "⛽ Low fuel efficiency", "{value:.2f} km/L"),
+    Rule('in_maintenance', 'Status', '==', 'Maintenance', WARNING,
+         "🔧 In maintenance", "status {value}"),
+    Rule('service_km', 'KM Since Service', '>', 14000, WARNING,
+         "🛠️ Service by distance", "{value:,.0f} km since service"),
+    Rule('service_due', 'Next Service (days)', '<=', 7, INFO,
+         "📅 Service due this week", "due in {value:.0f} days"),
+    Rule('co2_outlier', 'Daily CO2 (kg)', 'z>', 1.5, INFO,
+         "🌱 CO2 outlier", "{value:.1f} kg/day"),
+]
+
+
+class _Thresholds:
+    """Rules `column > t` (or >=, <, <=) for several t, as one sorted array
+
+    ``<`` and ``<=`` are ``>`` and ``>=`` on negated values, and ``v >= t``
+    is ``v > t'`` for the float t' just below t, so each column needs at most
+    two groups. A row's state is the number of thresholds its value passes;
+    the first `state` rules in threshold order fire.
+    """
+
+    def __init__(self, column, sign, ids, thresholds, severities):
+        self.column, self.sign = column, sign
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        order = np.argsort(thresholds, kind='stable')
+        self.ids = np.asarray(ids)[order]
+        self.thresholds = thresholds[order]
+        k = len(self.ids)
+        self.fires = np.tri(k + 1, k, -1, dtype=bool)       # fires[state, j]: j < state
+        # Best rule among the first `state`: highest severity, then furthest threshold
+        rank = np.asarray(severities, dtype=np.float64)[order] * (k + 1) + np.arange(k)
+        best = (np.maximum.accumulate(rank) % (k + 1)).astype(np.int64)
+        self.best = np.concatenate([[-1], best])
+        self.best_threshold = np.concatenate([[0], self.thresholds[best]])
+
+    def states(self, values):
+        values = np.asarray(values)
+        if values.dtype.kind in 'iu' and len(values) > 1024:
+            # Integer columns span few distinct values: place each once, then gather
+            lo, hi = int(values.min()), int(values.max())
+            if hi - lo < len(values):
+                domain = self.sign * np.arange(lo, hi + 1, dtype=np.float64)
+                return np.searchsorted(self.thresholds, domain, 'left')[values - lo]
+        return np.searchsorted(self.thresholds, self.sign * values.astype(np.float64), 'left')
+
+    def margins(self, values, states):
+        """How far past its best rule's threshold each row is, relative to the threshold"""
+        t = self.best_threshold[states]
+        return (self.sign * np.asarray(values, dtype=np.float64) - t) / np.maximum(np.abs(t), 1)
+
+
+class _Labels:
+    """Rules `column == label`; a row's state is 1 + the index of its label among the rules'"""
+
+    def __init__(self, column, ids, labels, severities):
+        self.column = column
+        self.labels = pd.Index(labels).unique()
+        slot = self.labels.get_indexer(labels)
+        self.fires = np.zeros((len(self.labels) + 1, len(ids)), dtype=bool)
+        self.fires[slot + 1, np.arange(len(ids))] = True
+        self.best = np.full(len(self.labels) + 1, -1, dtype=np.int64)
+        for j in np.argsort(severities, kind='stable'):
+            self.best[slot[j] + 1] = j
+        self.ids = np.asarray(ids)
+
+    def states(self, values):
+        if isinstance(values.dtype, CategoricalDtype):
+            table = np.append(self.labels.get_indexer(values.cat.categories) + 1, 0)
+            return table[values.cat.codes.to_numpy()]
+        return self.labels.get_indexer(values) + 1
+
+    def margins(self, values, states):
+        return 0
+
+
+class AlertEngine:
+    """Every rule evaluated over the vehicle table, kept current under updates"""
+
+    def __init__(self, fleet, rules=RULES):
+        self.fleet = fleet
+        self.rules = list(rules)
+        self.severities = np.array([r.severity for r in self.rules], dtype=np.int64)
+        self.groups = self._compile()
+        self.columns = sorted({g.column for g in self.groups})
+        self._lock = threading.Lock()
+        with metrics.timer('alerts_build_seconds'):
+            df = fleet.vehicles(self.columns)
+            metrics.count('rows_scanned_total', len(df), op='alerts_build')
+            self.states = [g.states(df[g.column]) for g in self.groups]
+            self.hists = [np.bincount(s, minlength=len(g.fires)) for g, s in zip(self.groups, self.states)]
+            self.rule, self.score = self._rank(df, self.states)
+        fleet.subscribe('vehicles', self.columns, self.apply)
+
+    def _compile(self):
+        by_key = {}
+        for i, rule in enumerate(self.rules):
+            op, value = rule.op, rule.value
+            if op in ('z>', 'z<'):
+                values = self.fleet.series('vehicles', rule.column).to_numpy(dtype=np.float64)
+                mean, std = values.mean(), values.std()
+                op, value = op[1:], mean + value * std if op == 'z>' else mean - value * std
+            if op != '==':
+                # Everything as `sign * v > t`
+                sign = 1 if op[0] == '>' else -1
+                value = sign * float(value)
+                if op.endswith('='):
+                    value = np.nextafter(value, -np.inf)
+                op = sign
+            by_key.setdefault((rule.column, op), []).append((i, value))
+        groups = []
+        for (column, op), members in by_key.items():
+            ids = [i for i, _ in members]
+            values = [v for _, v in members]
+            severities = self.severities[ids]
+            groups.append(_Labels(column, ids, values, severities) if op == '==' else
+                          _Thresholds(column, op, ids, values, severities))
+        for group in groups:
+            # Per state: the global id and severity of the group's best rule
+            group.rule_of_state = np.where(group.best >= 0, group.ids[np.maximum(group.best, 0)], -1)
+            group.severity_of_state = np.where(group.best >= 0, self.severities[group.rule_of_state], 0)
+        return groups
+
+    def _rank(self, df, states):
+        """Top rule per row (-1 for none) and its score: severity plus a margin term below 1"""
+        score = np.zeros(len(df))
+        winner = np.full(len(df), -1, dtype=np.int8)
+        for g, (group, state) in enumerate(zip(self.groups, states)):
+            margin = np.maximum(group.margins(df[group.column], state), 0)
+            s = group.severity_of_state[state] + margin / (1 + margin)
+            s[group.best[state] < 0] = 0
+            better = s > score
+            np.copyto(score, s, where=better)
+            winner[better] = g
+        rule = np.full(len(df), -1, dtype=np.int64)
+        for g, (group, state) in enumerate(zip(self.groups, states)):
+            np.copyto(rule, group.rule_of_state[state], where=winner == g)
+        return rule, score
+
+    def apply(self, positions, before, after):
+        """Fleet listener: re-place the changed rows in every group"""
+        metrics.count('rows_scanned_total', len(positions), op='alerts_update')
+        with self._lock:
+            states = []
+            for i, group in enumerate(self.groups):
+                new = group.states(after[group.column])
+                np.subtract.at(self.hists[i], self.states[i][positions], 1)
+                np.add.at(self.hists[i], new, 1)
+                self.states[i][positions] = new
+                states.append(new)
+            self.rule[positions], self.score[positions] = self._rank(after, states)
+
+    # ---------- reads ----------
+    def counts(self):
+        """Vehicles firing each rule, as a frame ranked by severity then count"""
+        counts = np.zeros(len(self.rules), dtype=np.int64)
+        with self._lock:
+            for group, hist in zip(self.groups, self.hists):
+                counts[group.ids] = hist @ group.fires
+        df = pd.DataFrame({
+            'Rule': [r.name for r in self.rules],
+            'Alert': [r.title for r in self.rules],
+            'Severity': [SEVERITIES[r.severity] for r in self.rules],
+            'Vehicles': counts,
+            '_rank': self.severities,
+        })
+        return df.sort_values(['_rank', 'Vehicles'], ascending=False).drop(columns='_rank')
+
+    def rows(self, min_severity=INFO):
+        """Positions of vehicles whose top alert is at least min_severity"""
+        with self._lock:
+            return np.flatnonzero(self.score >= min_severity)
+
+    def top(self, k=3, min_severity=INFO):
+        """Positions of the k highest-ranked alerts, best first"""
+        with self._lock:
+            score = self.score
+            k = min(k, len(score))
+            top = np.argpartition(-score, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+            top = top[np.argsort(-score[top], kind='stable')]
+            return top[score[top] >= min_severity]
+
+    def top_per_rule(self, k=3, min_severity=INFO):
+        """Positions of the highest-ranked alert of each of the k best rules, best first
+
+        Every vehicle counts under its own top rule, so k cards show k
+        different kinds of alert rather than k of the worst one.
+        """
+        with self._lock:
+            fired = self.score >= min_severity
+            rule, score = self.rule[fired], self.score[fired]
+            best = np.full(len(self.rules), -np.inf)
+            np.maximum.at(best, rule, score)
+            rules = np.argsort(-best, kind='stable')[:k]
+            rules = rules[np.isfinite(best[rules])]
+            positions = np.flatnonzero(fired)
+            return np.array([positions[(rule == r) & (score == best[r])][0] for r in rules], dtype=np.int64)
+
+    def alert(self, position):
+        """(Rule, formatted detail) of one vehicle's top alert, or None"""
+        with self._lock:
+            i = self.rule[position]
+        if i < 0:
+            return None
+        rule = self.rules[i]
+        value = self.fleet.series('vehicles', rule.column).iloc[position]
+        return rule, rule.detail(value) if callable(rule.detail) else rule.detail.format(value=value)
@@ -0,0 +1,394 @@
+"""Process-wide resources shared by the dashboard shell and its pages.
+
+Everything here is created on first use and then held once per process with
+``st.cache_resource``. Modules that only some pages need (search, sorting,
+figures) are imported inside the function that builds them, so the shell
+can render the sidebar without paying for them.
+"""
+import functools
+import os
+
+import streamlit as st
+
+import fleet_metrics as metrics
+from fleet_data import DEFAULT_SEED, default_driver_count
+from fleet_state import Fleet
+from fleet_store import open_store
+
+# Fleet size and seed can be raised for load tests, e.g. FLEET_VEHICLES=1000000
+FLEET_VEHICLES = int(os.environ.get("FLEET_VEHICLES", 150))
+FLEET_DRIVERS = int(os.environ.get("FLEET_DRIVERS", default_driver_count(FLEET_VEHICLES)))
+FLEET_SEED = int(os.environ.get("FLEET_SEED", DEFAULT_SEED))
+SELECT_LIMIT = 1000     # longest option list the drill-down selectboxes get
+# Live telemetry on top of the seeded history: '' (history only), 'replay',
+# a CSV file of events, or tcp://host:port
+FLEET_TELEMETRY = os.environ.get("FLEET_TELEMETRY", "")
+FLEET_TELEMETRY_RATE = int(os.environ.get("FLEET_TELEMETRY_RATE", 1000))     # replay events/s
+# Vehicle status updates for live mode: 'simulate', a JSON-lines file to
+# follow, or 'off'. The feed starts the first time live mode is switched on.
+FLEET_LIVE = os.environ.get("FLEET_LIVE", "simulate")
+FLEET_LIVE_INTERVAL = int(os.environ.get("FLEET_LIVE_INTERVAL", 5))      # seconds between refreshes
+# The simulated feed changes FLEET_LIVE_SHARE of the fleet every FLEET_LIVE_TICK
+# seconds; each change bumps the fleet version, which every cached figure,
+# sort and query result is keyed on
+FLEET_LIVE_TICK = float(os.environ.get("FLEET_LIVE_TICK", 1.0))
+FLEET_LIVE_SHARE = float(os.environ.get("FLEET_LIVE_SHARE", 0.02))
+# Rankings the pages show on every visit, kept live instead of re-ranked
+LEADERBOARDS = [('vehicles', 'FE (km/L)'), ('drivers', 'Efficiency (km/L)'),
+                ('vehicles', 'Daily CO2 (kg)'), ('vehicles', 'Maintenance CPKM (₹)')]
+
+
+@st.cache_resource
+@metrics.cache_miss('fleet')
+def open_fleet(n_vehicles, n_drivers, seed):
+    """Open the fleet store, generating it on the very first run"""
+    return Fleet(open_store(n_vehicles, n_drivers, seed))
+
+
+@st.cache_resource
+@metrics.cache_miss('views')
+def open_views(n_vehicles, n_drivers, seed):
+    """Build the materialized KPI views"""
+    from fleet_views import FleetViews
+    return FleetViews(open_fleet(n_vehicles, n_drivers, seed))
+
+
+@st.cache_resource
+@metrics.cache_miss('search')
+def open_search(n_vehicles, n_drivers, seed):
+    """Build the vehicle ID / driver name search index"""
+    from fleet_search import FleetSearch
+    return FleetSearch(open_fleet(n_vehicles, n_drivers, seed))
+
+
+@st.cache_resource
+@metrics.cache_miss('sort_index')
+def open_sort_index(n_vehicles, n_drivers, seed, table):
+    """Per-column sort orders for one table"""
+    from fleet_table import SortIndex
+    return SortIndex(open_fleet(n_vehicles, n_drivers, seed), table)
+
+
+@st.cache_resource
+def open_figure_cache():
+    """LRU of built figures"""
+    from fleet_figures import FigureCache
+    return FigureCache()
+
+
+@st.cache_resource
+@metrics.cache_miss('telemetry')
+def open_telemetry(n_vehicles, n_drivers, seed, source):
+    """Trip/fuel rollups and drill-down series, fed with seeded history and
+    then the live source in a background thread"""
+    from fleet_telemetry import history_days, open_pipeline
+    from fleet_timeseries import DrillDownSeries
+    fleet = open_fleet(n_vehicles, n_drivers, seed)
+    days = int(os.environ.get("FLEET_TELEMETRY_DAYS", history_days(fleet.n_vehicles)))
+    drilldown = DrillDownSeries(fleet.n_vehicles, fleet.n_drivers)
+    rollups = open_pipeline(fleet, days, source, seed, FLEET_TELEMETRY_RATE, subscribers=[drilldown.add])
+    return rollups, drilldown
+
+
+@st.cache_resource
+@metrics.cache_miss('alerts')
+def open_alerts(n_vehicles, n_drivers, seed):
+    """The alert rules engine, evaluated once and then kept current"""
+    from fleet_alerts import AlertEngine
+    return AlertEngine(open_fleet(n_vehicles, n_drivers, seed))
+
+
+@st.cache_resource
+@metrics.cache_miss('due_index')
+def open_due_index(n_vehicles, n_drivers, seed):
+    """Service due calendar, kept current as services are logged"""
+    from fleet_maintenance import DueIndex
+    return DueIndex(open_fleet(n_vehicles, n_drivers, seed))
+
+
+@st.cache_resource
+@metrics.cache_miss('forecast')
+def open_forecast(n_vehicles, n_drivers, seed, source):
+    """Fleet FE forecasts and failure risk over the telemetry rollups"""
+    from fleet_forecast import FleetForecast, default_workers
+    rollups, _ = open_telemetry(n_vehicles, n_drivers, seed, source)
+    return FleetForecast(open_fleet(n_vehicles, n_drivers, seed), rollups, workers=default_workers())
+
+
+@st.cache_resource
+@metrics.cache_miss('shards')
+def open_shards(n_vehicles, n_drivers, seed):
+    """Vehicle columns sharded by state for pooled aggregation"""
+    from fleet_shards import ShardedFleet, default_workers
+    return ShardedFleet(open_fleet(n_vehicles, n_drivers, seed), workers=default_workers())
+
+
+@st.cache_resource
+@metrics.cache_miss('cube')
+def open_cube(n_vehicles, n_drivers, seed):
+    """State/district/model/status cube, kept current under updates"""
+    from fleet_cube import FleetCube
+    return FleetCube(open_fleet(n_vehicles, n_drivers, seed))
+
+
+@st.cache_resource
+@metrics.cache_miss('query')
+def open_query(n_vehicles, n_drivers, seed):
+    """Cached rankings, filters, searches and vehicle/driver joins"""
+    from fleet_query import FleetQuery
+    query = FleetQuery(open_fleet(n_vehicles, n_drivers, seed))
+    index = open_search(n_vehicles, n_drivers, seed)
+    query.prepare('vehicle_search', index.search)
+    query.prepare('driver_search', index.drivers)
+    for table, column in LEADERBOARDS:
+        query.rank_with(table, column, functools.partial(open_leaderboard, n_vehicles, n_drivers, seed, table, column))
+    return query
+
+
+@st.cache_resource
+@metrics.cache_miss('leaderboard')
+def open_leaderboard(n_vehicles, n_drivers, seed, table, column):
+    """Rows of one table ranked on column, highest first, kept current under updates"""
+    from fleet_leaderboard import Leaderboard
+    return Leaderboard(open_fleet(n_vehicles, n_drivers, seed), table, column)
+
+
+@st.cache_resource
+@metrics.cache_miss('live')
+def open_live(n_vehicles, n_drivers, seed, source):
+    """Background thread applying vehicle status updates to the fleet"""
+    from fleet_live import LiveFeed, open_source
+    fleet = open_fleet(n_vehicles, n_drivers, seed)
+    # Build the KPI views and alerts first so they subscribe before the first update
+    open_views(n_vehicles, n_drivers, seed)
+    open_alerts(n_vehicles, n_drivers, seed)
+    return LiveFeed(fleet, open_source(source, fleet, seed, FLEET_LIVE_TICK, FLEET_LIVE_SHARE)).start()
+
+
+@st.cache_resource
+def open_session_ledger():
+    """Memory figures of every session, shared by the process"""
+    from fleet_memory import SessionLedger
+    return SessionLedger()
+
+
+@st.cache_resource
+@metrics.cache_miss('exporter')
+def open_exporter(n_vehicles, n_drivers, seed):
+    """Background worker for table exports, and the files it has made"""
+    from fleet_export import Exporter
+    fleet = open_fleet(n_vehicles, n_drivers, seed)
+    return Exporter(fleet, os.path.join(fleet.store.path, 'exports'))
+
+
+@st.cache_resource
+def metrics_server(port):
+    """The /metrics endpoint, started once per process"""
+    return metrics.serve(port)
+
+
+# Shorthands for the configured fleet
+def fleet():
+    return metrics.cached('fleet', open_fleet, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def kpis():
+    return metrics.cached('views', open_views, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def search():
+    return metrics.cached('search', open_search, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def telemetry():
+    return metrics.cached('telemetry', open_telemetry, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED,
+                          FLEET_TELEMETRY)[0]
+
+
+def drilldown():
+    return metrics.cached('telemetry', open_telemetry, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED,
+                          FLEET_TELEMETRY)[1]
+
+
+def alerts():
+    return metrics.cached('alerts', open_alerts, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def due_index():
+    return metrics.cached('due_index', open_due_index, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def forecast():
+    return metrics.cached('forecast', open_forecast, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED,
+                          FLEET_TELEMETRY).current()
+
+
+def shards():
+    return metrics.cached('shards', open_shards, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def cube():
+    return metrics.cached('cube', open_cube, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def query():
+    return metrics.cached('query', open_query, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def live_feed():
+    return metrics.cached('live', open_live, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED, FLEET_LIVE)
+
+
+def leaderboard(table, column):
+    return metrics.cached('leaderboard', open_leaderboard, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED, table, column)
+
+
+def exporter():
+    return metrics.cached('exporter', open_exporter, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED)
+
+
+def sort_index(table):
+    return metrics.cached('sort_index', open_sort_index, FLEET_VEHICLES, FLEET_DRIVERS, FLEET_SEED, table)
+
+
+class PageContext:
+    """What a page's render() gets: its declared columns and shared resources"""
+
+    def __init__(self, page, module):
+        self.page = page
+        self.fleet = fleet()
+        self.n_vehicles = self.fleet.n_vehicles
+        self.n_drivers = self.fleet.n_drivers
+        # Map in only the columns the page declares
+        with metrics.timer('page_data_seconds', page=page):
+            self.vehicles = self.fleet.vehicles(module.VEHICLES)
+            self.drivers = self.fleet.drivers(module.DRIVERS)
+
+    def figure(self, name, build, *params):
+        """The figure for this page and params at the current data version, built at most once"""
+        key = (self.page, name, params, self.fleet.version)
+        if not metrics.enabled:
+            return open_figure_cache().get(key, build)
+        built = []
+
+        def measured_build():
+            with metrics.timer('figure_build_seconds', page=self.page, figure=name):
+                fig = build()
+            # What st.plotly_chart sends, and what producing it costs
+            with metrics.timer('figure_serialize_seconds', page=self.page, figure=name):
+                size = len(fig.to_json())
+            metrics.observe('figure_bytes', size, page=self.page, figure=name)
+            built.append(fig)
+            return fig
+
+        fig = open_figure_cache().get(key, measured_build)
+        metrics.count('figure_cache_requests_total', page=self.page, result='miss' if built else 'hit')
+        return fig
+
+    def tabs(self, labels):
+        """st.tabs, each tab timed as a section of this page when metrics are on"""
+        tabs = st.tabs(labels)
+        if not metrics.enabled:
+            return tabs
+        return [_Section(tab, self.page, label) for tab, label in zip(tabs, labels)]
+
+
+class _Section:
+    """A container whose ``with`` block is timed as section_seconds{page, section}"""
+
+    def __init__(self, container, page, section):
+        self.container, self.page, self.section = container, page, section
+
+    def __enter__(self):
+        self.container.__enter__()
+        self.timer = metrics.timer('section_seconds', page=self.page, section=self.section)
+        self.timer.__enter__()
+        return self.container
+
+    def __exit__(self, *exc):
+        self.timer.__exit__(*exc)
+        return self.container.__exit__(*exc)
+
+
+# ==================== DEVELOPER OVERLAY ====================
+def publish_metrics():
+    """Write the metrics file / start the endpoint, as configured"""
+    if not metrics.enabled:
+        return
+    path = os.environ.get('FLEET_METRICS_FILE')
+    if path:
+        metrics.write_prometheus(path)
+    port = os.environ.get('FLEET_METRICS_PORT')
+    if port:
+        metrics_server(int(port))
+
+
+def record_session(ctx):
+    """Measure what this session holds itself: its state and any copies in its page data"""
+    if not metrics.enabled:
+        return
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    from fleet_memory import deep_bytes, frame_bytes
+    run = get_script_run_ctx()
+    if run is None:
+        return
+    with metrics.timer('session_memory_seconds'):
+        state = deep_bytes(st.session_state.to_dict())
+        shared, owned = (sum(x) for x in zip(frame_bytes(ctx.vehicles, ctx.fleet, 'vehicles'),
+                                             frame_bytes(ctx.drivers, ctx.fleet, 'drivers')))
+    open_session_ledger().record(run.session_id, ctx.page, state, owned)
+    metrics.observe('page_data_bytes', shared, page=ctx.page, memory='shared')
+    metrics.observe('page_data_bytes', owned, page=ctx.page, memory='owned')
+
+
+def dev_overlay(page):
+    """Sidebar panel with this run's timings and the process-wide counters"""
+    if not metrics.enabled:
+        return
+    counters, timers, gauges = metrics.snapshot()
+
+    def labels(key):
+        return ', '.join(f"{k}={v}" for k, v in key[1] if k != 'page')
+
+    with st.sidebar.expander("🛠️ Dev metrics", expanded=False):
+        rows = [(k[0], labels(k), last * 1000, total / calls * 1000, calls)
+                for k, (calls, total, _, last) in timers.items()
+                if dict(k[1]).get('page', page) == page]
+        rows.sort(key=lambda r: -r[2])
+        st.markdown("**Timers (ms)**")
+        st.dataframe({'timer': [r[0] for r in rows], 'labels': [r[1] for r in rows],
+                      'last': [round(r[2], 2) for r in rows], 'mean': [round(r[3], 2) for r in rows],
+                      'calls': [r[4] for r in rows]}, hide_index=True)
+
+        caches = {}
+        for (name, key), value in counters.items():
+            if name.endswith('requests_total'):
+                d = dict(key)
+                cache = {'cache_requests_total': d.get('cache'),
+                         'store_column_requests_total': f"columns: {d.get('table')}",
+                         'figure_cache_requests_total': 'figures'}.get(name, name)
+                hits, misses = caches.get(cache, (0, 0))
+                caches[cache] = (hits + value, misses) if d['result'] == 'hit' else (hits, misses + value)
+        st.markdown("**Caches**")
+        st.dataframe({'cache': list(caches), 'hits': [h for h, _ in caches.values()],
+                      'misses': [m for _, m in caches.values()]}, hide_index=True)
+
+        other = [(k[0], labels(k), v) for k, v in counters.items() if not k[0].endswith('requests_total')]
+        other += [(k[0], labels(k), v) for k, v in gauges.items() if dict(k[1]).get('page', page) == page]
+        if other:
+            st.markdown("**Counters**")
+            st.dataframe({'metric': [r[0] for r in other], 'labels': [r[1] for r in other],
+                          'value': [r[2] for r in other]}, hide_index=True)
+
+        from fleet_memory import memory_budget
+        report = open_session_ledger().report(memory_budget())
+        st.markdown("**Memory**")
+        rows = [('sessions', f"{report['sessions']:,}"),
+                ('per session (mean / max)',
+                 f"{report['session bytes mean'] / 1024:,.1f} / {report['session bytes max'] / 1024:,.1f} KiB")]
+        rows += [(f"process {k}", f"{report[k] / 2**20:,.1f} MiB") for k in ('rss', 'anon', 'file') if k in report]
+        if report['budget']:
+            rows.append(('budget', f"{report['budget'] / 2**20:,.0f} MiB"))
+        if 'headroom' in report:
+            rows.append(('more sessions (upper bound)', f"{report['headroom']:,}"))
+        st.dataframe({'': [r[0] for r in rows], 'value': [r[1] for r in rows]}, hide_index=True)
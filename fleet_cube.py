@@ -0,0 +1,128 @@
+"""Pre-aggregated fleet cube for drill-down and roll-up.
+
+``FleetCube`` keeps one cell per (state, district, model, status); state and
+district are the RTO parts of the ``Vehicle ID``. Every cell holds the
+vehicle count and, for each measure, the sum, the sum of squares and a
+fixed-bin histogram sketch for approximate quantiles. All of it is plain
+addition, so a cell at any level of the hierarchy is the sum of the cells
+under it: a drill-down sums a slice of the dense cell arrays (at most
+16,500 cells) instead of grouping the vehicle rows, and an update subtracts
+the changed rows' old contributions and adds the new ones.
+
+Sketch bins span each measure's range at build time plus a margin; values
+that later fall outside are counted in the end bins, so quantiles there
+saturate at the bin edge.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import fleet_metrics as metrics
+from fleet_data import DISTRICTS, MODELS, STATES, STATUSES
+
+DIMS = {'State': STATES, 'District': list(range(1, DISTRICTS + 1)), 'Model': MODELS, 'Status': STATUSES}
+MEASURES = ['FE (km/L)', 'Cost per KM (₹)', 'Daily CO2 (kg)', 'Idle Time (min)', 'Maintenance Cost (₹)']
+SKETCH_BINS = 64
+MARGIN = 0.5        # sketch range beyond the built data, as a share of its spread
+SCATTER_ROWS = 4096     # fewer changed rows than this scatter into the sketch instead of recounting
+
+
+class FleetCube:
+    """Counts, sums, squares and histogram sketches per (state, district, model, status)"""
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self.shape = tuple(len(v) for v in DIMS.values())
+        self.n_cells = int(np.prod(self.shape))
+        self._lock = threading.Lock()
+        with metrics.timer('cube_build_seconds'):
+            df = fleet.vehicles(list(DIMS) + MEASURES)
+            metrics.count('rows_scanned_total', len(df), op='cube_build')
+            self.edges = {}
+            for m in MEASURES:
+                lo, hi = float(df[m].min()), float(df[m].max())
+                pad = (hi - lo) * MARGIN or 1
+                self.edges[m] = np.linspace(lo - pad, hi + pad, SKETCH_BINS + 1)
+            self.count = np.zeros(self.n_cells)
+            self.sums = np.zeros((len(MEASURES), self.n_cells))
+            self.squares = np.zeros((len(MEASURES), self.n_cells))
+            self.sketch = np.zeros((len(MEASURES), self.n_cells, SKETCH_BINS), dtype=np.int32)
+            self._add(df, +1)
+        fleet.subscribe('vehicles', list(DIMS) + MEASURES, self.apply)
+
+    def _cells(self, df):
+        codes = [df['State'].cat.codes.to_numpy(), df['District'].to_numpy().astype(np.int64) - 1,
+                 df['Model'].cat.codes.to_numpy(), df['Status'].cat.codes.to_numpy()]
+        return np.ravel_multi_index(codes, self.shape)
+
+    def _add(self, df, sign):
+        cells = self._cells(df)
+        self.count += sign * np.bincount(cells, minlength=self.n_cells)
+        for i, m in enumerate(MEASURES):
+            v = df[m].to_numpy(dtype=np.float64)
+            self.sums[i] += sign * np.bincount(cells, weights=v, minlength=self.n_cells)
+            self.squares[i] += sign * np.bincount(cells, weights=v * v, minlength=self.n_cells)
+            bins = np.clip(np.searchsorted(self.edges[m], v, 'right') - 1, 0, SKETCH_BINS - 1)
+            flat = self.sketch[i].reshape(-1)
+            if len(df) > SCATTER_ROWS:
+                flat += (sign * np.bincount(cells * SKETCH_BINS + bins, minlength=flat.size)).astype(np.int32)
+            else:
+                np.add.at(flat, cells * SKETCH_BINS + bins, sign)
+
+    def apply(self, positions, before, after):
+        """Fleet listener: move changed rows' contributions between cells"""
+        metrics.count('rows_scanned_total', len(positions), op='cube_update')
+        with self._lock:
+            self._add(before, -1)
+            self._add(after, +1)
+
+    # ---------- reads ----------
+    def _cells_of(self, measure, filters):
+        """count, sum, squares and sketch of one measure as dim-shaped arrays, filters applied"""
+        i = MEASURES.index(measure)
+        arrays = [self.count.reshape(self.shape), self.sums[i].reshape(self.shape),
+                  self.squares[i].reshape(self.shape), self.sketch[i].reshape(self.shape + (SKETCH_BINS,))]
+        for axis, dim in enumerate(DIMS):
+            if dim in filters:
+                k = DIMS[dim].index(filters[dim])
+                arrays = [a.take([k], axis=axis) for a in arrays]
+        return arrays
+
+    def rollup(self, by, measure, filters=None, quantiles=(0.5, 0.9)):
+        """One row per label of `by` (a dim, or None for a single total) within filters
+
+        Columns: Vehicles, mean, std and the requested quantiles of measure,
+        read from the cells alone. Labels without vehicles are left out.
+        """
+        filters = filters or {}
+        keep = list(DIMS).index(by) if by else None
+        axes = tuple(a for a in range(len(DIMS)) if a != keep)
+        with self._lock:
+            count, sums, squares, sketch = self._cells_of(measure, filters)
+            n, s, q = (a.sum(axis=axes).reshape(-1) for a in (count, sums, squares))
+            h = sketch.sum(axis=axes).reshape(len(n), SKETCH_BINS)
+        labels = ['All'] if by is None else [filters[by]] if by in filters else DIMS[by]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = s / n
+            std = np.sqrt(np.maximum(q - n * mean ** 2, 0) / (n - 1))
+        df = pd.DataFrame({'Vehicles': n.astype(np.int64), 'mean': mean, 'std': std},
+                          index=pd.Index(labels, name=by or 'Fleet'))
+        for quantile in quantiles:
+            df[f"p{round(quantile * 100)}"] = self._quantiles(h, measure, quantile)
+        return df[df['Vehicles'] > 0]
+
+    def _quantiles(self, hist, measure, quantile):
+        """Quantile per row of histogram counts, interpolated within the bin"""
+        edges = self.edges[measure]
+        cumulative = np.cumsum(hist, axis=1)
+        total = cumulative[:, -1]
+        target = quantile * total
+        b = np.minimum((cumulative < target[:, None]).sum(axis=1), SKETCH_BINS - 1)
+        below = np.where(b > 0, cumulative[np.arange(len(b)), b - 1], 0)
+        inside = hist[np.arange(len(b)), b]
+        frac = np.divide(target - below, inside, out=np.zeros(len(b)), where=inside > 0)
+        return np.where(total > 0, edges[b] + frac * (edges[b + 1] - edges[b]), np.nan)
+
+    def memory_bytes(self):
+        return self.count.nbytes + self.sums.nbytes + self.squares.nbytes + self.sketch.nbytes
@@ -0,0 +1,129 @@
+"""Synthetic fleet data for the dashboard.
+
+Every column is drawn as a NumPy array in one pass from a seeded generator, so
+the same (size, seed) always yields the same fleet. String columns are built
+with Arrow kernels straight from label tables and low-cardinality fields are
+categorical codes from the start, which keeps a million-truck fleet well under
+a second and avoids per-row Python string objects.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+MODELS = ['Heavy Truck 45T', 'Heavy Truck 40T', 'Heavy Truck 35T', 'Medium Truck 25T',
+          'Medium Truck 20T', 'Medium Truck 16T', 'Light Truck 12T', 'Light Truck 10T',
+          'Multi-Axle 49T', 'Multi-Axle 55T', 'Tipper 31T']
+STATES = ['MH', 'DL', 'GJ', 'KA', 'TN', 'UP', 'RJ', 'HR', 'PB', 'WB']
+STATUSES = ['Active', 'Idle', 'Maintenance']
+SERIES = ['TRK']
+
+DISTRICTS = 50            # RTO district codes 01..50
+NUMBER_MIN, NUMBER_MAX = 1000, 9999
+DEFAULT_SEED = 42
+
+
+def default_driver_count(n_vehicles):
+    """Roster size that keeps the original 145-drivers-per-150-trucks ratio"""
+    return max(1, n_vehicles * 29 // 30)
+
+
+def training_in_progress(n_drivers):
+    """Drivers part-way through training: the original 19 of 145, scaled to the roster"""
+    return round(n_drivers * 19 / 145)
+
+
+def _block_letters(block):
+    """Spreadsheet-style letters for a roster block: A..Z, AA, AB, ..."""
+    letters = ''
+    block += 1
+    while block:
+        block, rem = divmod(block - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _labels(labels, idx):
+    """Arrow string array of labels[idx] without per-row Python objects"""
+    return pa.array(labels).take(pa.array(idx))
+
+
+def driver_names(n):
+    """Roster names Driver A1..A10, B1..B10, ... for the first n drivers"""
+    n_blocks = (n + 9) // 10
+    blocks = [f"Driver {_block_letters(b)}" for b in range(n_blocks)]
+    slots = [str(i) for i in range(1, 11)]
+    rows = np.arange(n)
+    return pc.binary_join_element_wise(_labels(blocks, rows // 10), _labels(slots, rows % 10), '')
+
+
+def vehicle_ids(state_idx, district, number, series_idx=0):
+    """Format registration-style IDs such as MH-12-TRK-4821 from packed fields"""
+    prefixes = [f"{st}-{d:02d}-{se}-" for st in STATES for d in range(1, DISTRICTS + 1) for se in SERIES]
+    slot = (np.asarray(state_idx, dtype=np.int64) * DISTRICTS + np.asarray(district) - 1) * len(SERIES)
+    numbers = [str(x) for x in range(NUMBER_MIN, NUMBER_MAX + 1)]
+    return pc.binary_join_element_wise(_labels(prefixes, slot + series_idx),
+                                       _labels(numbers, np.asarray(number) - NUMBER_MIN), '')
+
+
+def make_vehicles(n=150, seed=DEFAULT_SEED, n_drivers=None):
+    """Generate n vehicles; identical output for identical (n, seed, n_drivers)"""
+    rng = np.random.default_rng(seed)
+    n_drivers = default_driver_count(n) if n_drivers is None else n_drivers
+    n_numbers = NUMBER_MAX - NUMBER_MIN + 1
+    space = len(STATES) * DISTRICTS * n_numbers
+    if n > space:
+        raise ValueError(f"at most {space:,} unique vehicle IDs are available, asked for {n:,}")
+
+    # Sample (state, district, number) without replacement so IDs stay unique
+    code = rng.choice(space, size=n, replace=False)
+    state_idx = code // (DISTRICTS * n_numbers)
+    district = (code // n_numbers) % DISTRICTS + 1
+    number = code % n_numbers + NUMBER_MIN
+
+    # The first trucks get one roster driver each, the rest share the roster
+    roster = driver_names(n_drivers)
+    driver_idx = np.empty(n, dtype=np.int32)
+    first = min(n, n_drivers)
+    driver_idx[:first] = np.arange(first)
+    driver_idx[first:] = rng.integers(0, n_drivers, n - first)
+
+    odo = rng.integers(50000, 500001, n)
+    maint_cost = rng.integers(40000, 250001, n)
+
+    return pd.DataFrame({
+        'Vehicle ID': vehicle_ids(state_idx, district, number).to_pandas(),
+        'State': pd.Categorical.from_codes(state_idx, STATES),
+        'District': district,
+        'Series': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), SERIES),
+        'Number': number,
+        'Model': pd.Categorical.from_codes(rng.integers(0, len(MODELS), n), MODELS),
+        'Status': pd.Categorical.from_codes(rng.integers(0, len(STATUSES), n), STATUSES),
+        'Driver': pd.Categorical.from_codes(driver_idx, roster.to_pandas()),
+        'FE (km/L)': np.round(rng.uniform(3.2, 5.2, n), 2),
+        'Odometer (km)': odo,
+        'Daily Distance (km)': rng.integers(200, 601, n),
+        'Cost per KM (₹)': np.round(rng.uniform(25, 45, n), 2),
+        'Maintenance Cost (₹)': maint_cost,
+        'Maintenance CPKM (₹)': np.round(maint_cost / odo, 2),
+        'Daily CO2 (kg)': np.round(rng.uniform(15, 30, n), 1),
+        'Idle Time (min)': rng.integers(20, 181, n),
+        'Last Service (days)': rng.integers(5, 91, n),
+        'Next Service (days)': rng.integers(-10, 61, n),
+        'KM Since Service': rng.integers(1000, 15001, n),
+    })
+
+
+def make_drivers(n=145, seed=DEFAULT_SEED):
+    """Generate the n-driver roster; identical output for identical (n, seed)"""
+    # Offset the seed so driver draws never mirror the vehicle draws
+    rng = np.random.default_rng([seed, 1])
+    return pd.DataFrame({
+        'Name': driver_names(n).to_pandas(),
+        'Score': rng.integers(70, 101, n),
+        'Efficiency (km/L)': np.round(rng.uniform(3.5, 5.0, n), 2),
+        'Total Trips': rng.integers(50, 151, n),
+        'Violations': rng.integers(0, 6, n),
+        'Experience (years)': rng.integers(2, 16, n),
+        'Training Complete': rng.random(n) > 0.13,
+    })
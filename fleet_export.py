@@ -0,0 +1,205 @@
+"""Streaming exports of table views to CSV, Parquet and Excel.
+
+A page hands ``Exporter.submit`` the row positions of the view a user is
+looking at (filtered and in its sort order) and the columns shown. The
+export runs on a worker thread: it reads ``CHUNK_ROWS`` rows at a time from
+the fleet and appends them to the file, so memory stays at one chunk
+whatever the view's size, and the job counts rows done for the page's
+progress bar.
+
+Finished files are kept on disk under the fleet store, in a directory of
+this process's own that goes away when it exits, and reused. A job is
+keyed on the table, the rows in order, the columns, the format and the fleet
+version, so everyone exporting the same view of the same data shares one
+file, and the next live update makes a new one. The ``MAX_ARTIFACTS`` most
+recent are kept. Rows are read as the export reaches them, so an export
+that spans a live update can carry some rows from after it.
+
+Excel output is written by XlsxWriter in its constant-memory mode, one
+sheet per ``EXCEL_ROWS`` rows.
+"""
+import atexit
+import csv
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import CategoricalDtype
+
+import fleet_metrics as metrics
+
+CHUNK_ROWS = 50_000
+MAX_ARTIFACTS = 32
+EXCEL_ROWS = 1_048_575      # data rows per sheet below the header
+FORMATS = {     # label -> (extension, MIME type)
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+def _plain(chunk):
+    """chunk with categoricals decoded to their labels"""
+    for c in chunk.columns:
+        if isinstance(chunk[c].dtype, CategoricalDtype):
+            chunk[c] = chunk[c].astype(chunk[c].cat.categories.dtype)
+    return chunk
+
+
+def write_csv(path, chunks, columns):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerow(columns)
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=False)
+
+
+def write_parquet(path, chunks, columns):
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                         schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        # Nothing to write: still leave a valid file with no rows
+        pq.write_table(pa.table({c: pa.array([], pa.null()) for c in columns}), path)
+
+
+def write_excel(path, chunks, columns):
+    import xlsxwriter
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    bold = workbook.add_format({'bold': True})
+    sheet, row = None, EXCEL_ROWS
+    try:
+        for chunk in chunks:
+            for record in zip(*(chunk[c].tolist() for c in columns)):
+                if row == EXCEL_ROWS:
+                    sheet, row = workbook.add_worksheet(), 0
+                    sheet.write_row(0, 0, columns, bold)
+                row += 1
+                sheet.write_row(row, 0, record)
+        if sheet is None:
+            workbook.add_worksheet().write_row(0, 0, columns, bold)
+    finally:
+        workbook.close()
+
+
+WRITERS = {'CSV': write_csv, 'Parquet': write_parquet, 'Excel': write_excel}
+
+
+class ExportJob:
+    """One export: its file, its rows and how far the worker got"""
+
+    def __init__(self, key, path, name, fmt, total, version):
+        self.key, self.path, self.name, self.format = key, path, name, fmt
+        self.total, self.version = total, version
+        self.done = 0
+        self.state = 'queued'       # queued, running, done or failed
+        self.error = None
+        self.seconds = None
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def file_name(self):
+        return f"{self.name}.{FORMATS[self.format][0]}"
+
+    @property
+    def mime(self):
+        return FORMATS[self.format][1]
+
+    @property
+    def size(self):
+        return os.path.getsize(self.path) if self.state == 'done' else 0
+
+    def open(self):
+        return open(self.path, 'rb')
+
+
+class Exporter:
+    """Background exports of table views, with the finished files cached"""
+
+    def __init__(self, fleet, root, workers=1, keep=MAX_ARTIFACTS):
+        self.fleet = fleet
+        self.keep = keep
+        # Versions are per process, so each process keeps its files apart;
+        # other servers sharing the store keep theirs
+        os.makedirs(root, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix=f"exports-{os.getpid()}-", dir=root)
+        atexit.register(shutil.rmtree, self.directory, ignore_errors=True)
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix='fleet-export')
+        self._jobs = OrderedDict()      # key -> ExportJob, oldest first
+        self._lock = threading.Lock()
+
+    def submit(self, table, positions, columns, fmt, name):
+        """The job exporting rows positions of table (in that order) as fmt,
+        started now unless one already has or is making that file"""
+        positions = np.ascontiguousarray(positions, dtype=np.int64)
+        version = self.fleet.version
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(repr((table, tuple(columns), fmt, version)).encode())
+        digest.update(positions.tobytes())
+        key = digest.hexdigest()
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.state != 'failed':
+                self._jobs.move_to_end(key)
+                metrics.count('export_requests_total', format=fmt, result='hit')
+                return job
+            path = os.path.join(self.directory, f"{key}.{FORMATS[fmt][0]}")
+            job = self._jobs[key] = ExportJob(key, path, name, fmt, len(positions), version)
+            self._evict()
+        metrics.count('export_requests_total', format=fmt, result='miss')
+        self._pool.submit(self._run, job, table, positions, list(columns))
+        return job
+
+    def job(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _evict(self):
+        finished = [k for k, j in self._jobs.items() if j.state in ('done', 'failed')]
+        for key in finished[:max(len(self._jobs) - self.keep, 0)]:
+            job = self._jobs.pop(key)
+            if os.path.exists(job.path):
+                os.remove(job.path)
+
+    def _chunks(self, job, table, positions, columns):
+        for start in range(0, len(positions), CHUNK_ROWS):
+            chunk = _plain(self.fleet.rows(table, positions[start:start + CHUNK_ROWS], columns))
+            yield chunk
+            job.done += len(chunk)
+            metrics.count('rows_exported_total', len(chunk), format=job.format)
+
+    def _run(self, job, table, positions, columns):
+        job.state = 'running'
+        part = job.path + '.part'
+        t = time.perf_counter()
+        try:
+            with metrics.timer('export_seconds', format=job.format):
+                WRITERS[job.format](part, self._chunks(job, table, positions, columns), columns)
+            os.replace(part, job.path)
+            # Pages read the timing as soon as the job is done, so set it first
+            job.seconds = time.perf_counter() - t
+            job.state = 'done'
+        except Exception as e:
+            if os.path.exists(part):
+                os.remove(part)
+            job.seconds = time.perf_counter() - t
+            job.error = f"{type(e).__name__}: {e}"
+            job.state = 'failed'
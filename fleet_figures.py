@@ -0,0 +1,85 @@
+"""Figure building for large fleets.
+
+``FigureCache`` memoizes built figures by (page, chart, params, data
+version) with LRU eviction, so a rerun that changes nothing the chart depends
+on skips both the data work and Plotly Express. Histograms are binned here
+with NumPy and sent as bars, so the browser gets bin counts instead of every
+row, and big scatter/line traces switch to WebGL.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+WEBGL_POINTS = 1000     # same cut-over Plotly Express uses for render_mode='auto'
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """The cached figure for key, calling build() on a miss"""
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                return fig
+        fig = build()
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return fig
+
+    def __len__(self):
+        return len(self._figures)
+
+
+def histogram(values, nbins=25, color='#667eea', title=None):
+    """Histogram binned server-side: nbins bars regardless of row count"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    counts, edges = np.histogram(values, bins=nbins) if len(values) else (np.zeros(nbins), np.arange(nbins + 1))
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+        marker_color=color,
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate='%{customdata[0]:.2f} – %{customdata[1]:.2f}<br>count=%{y}<extra></extra>',
+    ))
+    fig.update_layout(bargap=0, xaxis_title=title, yaxis_title='count')
+    return fig
+
+
+def scatter_trace(x, y, **kwargs):
+    """go.Scatter, or go.Scattergl once the trace is big enough to matter"""
+    trace = go.Scattergl if len(x) > WEBGL_POINTS else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+def range_band(series, color='#667eea', title=None, y_title=None):
+    """Mean line inside a min–max band, from a downsampled window frame
+
+    Frames without min and max (a pyramid that doesn't keep them) get the
+    mean line alone.
+    """
+    x = series.index
+    traces = []
+    if 'min' in series and 'max' in series:
+        traces = [
+            scatter_trace(x, series['max'], mode='lines', line=dict(width=0), showlegend=False,
+                          hoverinfo='skip'),
+            scatter_trace(x, series['min'], mode='lines', line=dict(width=0), fill='tonexty',
+                          fillcolor='rgba(102, 126, 234, 0.15)', name='min–max'),
+        ]
+    traces.append(scatter_trace(x, series['mean'], mode='lines+markers' if len(x) <= 31 else 'lines',
+                                line=dict(color=color), name='mean'))
+    fig = go.Figure(traces)
+    fig.update_layout(title=title, yaxis_title=y_title, hovermode='x unified')
+    return fig
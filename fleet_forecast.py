@@ -0,0 +1,194 @@
+"""Batched forecasts and failure risk for the whole fleet.
+
+Every vehicle's weekly fuel efficiency history is one row of an
+(n_vehicles, weeks) matrix from the telemetry rollups. Both models fit all
+rows at once: ``linear_trend`` is weighted least squares written as row
+sums, and ``holt`` (exponential smoothing with a trend) loops over the dozen
+weeks, not over the vehicles. Weeks without trips are masked out. Big
+fleets can be split into row shards fitted in a process pool.
+
+The failure risk score is a logistic mix of km since service, days overdue,
+maintenance cost per km and the fitted FE decline. It is a hand-weighted
+score, not a trained model; the page sums it into an expected number of
+failures over the next 30 days.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+import fleet_metrics as metrics
+from fleet_maintenance import SERVICE_KM
+
+HORIZON = 4                 # weeks forecast
+HISTORY = 12                # complete weeks fitted
+MIN_WEEKS = 3               # fewer observed weeks and a vehicle gets no trend
+SHARD_ROWS = 250_000        # rows per process-pool shard
+# logit of the 30-day failure probability: intercept, then per feature
+RISK_WEIGHTS = {'intercept': -4.0, 'km_ratio': 1.5, 'overdue_months': 3.0,
+                'fe_decline_pct': 0.5, 'cpkm_z': 0.5}
+
+
+def linear_trend(y, mask):
+    """Per-row least-squares line: (level at the last column, slope per column, residual std)"""
+    w = mask.astype(np.float64)
+    y = np.where(mask, y, 0).astype(np.float64)
+    x = np.arange(y.shape[1], dtype=np.float64)
+    sw, sx, sxx = w.sum(1), w @ x, w @ (x * x)
+    sy, sxy = (w * y).sum(1), (w * y) @ x
+    denom = sw * sxx - sx * sx
+    slope = np.divide(sw * sxy - sx * sy, denom, out=np.zeros_like(sw), where=denom > 0)
+    intercept = np.divide(sy - slope * sx, sw, out=np.zeros_like(sw), where=sw > 0)
+    resid = w * (y - intercept[:, None] - slope[:, None] * x) ** 2
+    std = np.sqrt(np.divide(resid.sum(1), sw - 2, out=np.zeros_like(sw), where=sw > 2))
+    return intercept + slope * x[-1], slope, std
+
+
+def holt(y, mask, alpha=0.5, beta=0.2):
+    """Per-row Holt smoothing: (level, trend per column, one-step error std)
+
+    A masked column carries the forecast forward. Rows start from their
+    first observed value with no trend.
+    """
+    n, t = y.shape
+    y = y.astype(np.float64)
+    first = mask.argmax(1)
+    level = y[np.arange(n), first] * mask.any(1)
+    trend = np.zeros(n)
+    sq, seen = np.zeros(n), np.zeros(n)
+    for j in range(t):
+        obs = mask[:, j]
+        pred = level + trend
+        error = np.where(obs & (j > first), y[:, j] - pred, 0)
+        sq += error ** 2
+        seen += obs & (j > first)
+        new_level = alpha * y[:, j] + (1 - alpha) * pred
+        trend = np.where(obs, beta * (new_level - level) + (1 - beta) * trend, trend)
+        level = np.where(obs, new_level, pred)
+    return level, trend, np.sqrt(np.divide(sq, seen, out=np.zeros(n), where=seen > 0))
+
+
+METHODS = {'holt': holt, 'trend': linear_trend}
+
+
+def _fit_shard(args):
+    method, y, mask = args
+    return METHODS[method](y, mask)
+
+
+def fit(y, mask, method='holt', pool=None):
+    """Fit every row; with a process pool, big matrices are fitted in shards"""
+    if y.shape[1] == 0:
+        # No weeks of telemetry yet
+        return np.zeros(len(y)), np.zeros(len(y)), np.zeros(len(y))
+    if pool is None or len(y) <= SHARD_ROWS:
+        return METHODS[method](y, mask)
+    shards = [(method, y[i:i + SHARD_ROWS], mask[i:i + SHARD_ROWS]) for i in range(0, len(y), SHARD_ROWS)]
+    parts = list(pool.map(_fit_shard, shards))
+    return tuple(np.concatenate(p) for p in zip(*parts))
+
+
+def project(level, slope, horizon=HORIZON):
+    """(n, horizon) forecasts from a fit"""
+    return level[:, None] + slope[:, None] * np.arange(1, horizon + 1)
+
+
+def failure_risk(vehicles, fe_level, fe_slope):
+    """30-day failure probability per vehicle, and the features behind it"""
+    cpkm = vehicles['Maintenance CPKM (₹)'].to_numpy(dtype=np.float64)
+    features = pd.DataFrame({
+        'km_ratio': vehicles['KM Since Service'].to_numpy() / SERVICE_KM,
+        'overdue_months': np.maximum(-vehicles['Next Service (days)'].to_numpy(), 0) / 30,
+        'fe_decline_pct': np.maximum(-np.divide(fe_slope, fe_level, out=np.zeros_like(fe_slope),
+                                                where=fe_level > 0), 0) * 100,
+        'cpkm_z': (cpkm - cpkm.mean()) / (cpkm.std() or 1),
+    })
+    logit = RISK_WEIGHTS['intercept'] + sum(features[k].to_numpy() * w
+                                            for k, w in RISK_WEIGHTS.items() if k != 'intercept')
+    return 1 / (1 + np.exp(-logit)), features
+
+
+class FleetForecast:
+    """FE forecasts and failure risk, refitted when a new week completes
+
+    The per-vehicle fit only changes when the weeks it covers do, so it is
+    cached on the rollups' window key and the matrices are only read on a
+    miss; risk is recomputed when the fleet table changes. With workers > 1
+    the shards go to one process pool kept for the forecast's lifetime.
+    """
+
+    RISK_COLUMNS = ['KM Since Service', 'Next Service (days)', 'Maintenance CPKM (₹)']
+
+    def __init__(self, fleet, rollups, method='holt', workers=1):
+        self.fleet, self.rollups = fleet, rollups
+        self.method, self.workers = method, workers
+        self._fit_key = self._risk_key = None
+        self._lock = threading.Lock()
+        self.pool = None
+        if workers > 1:
+            # Spawned, not forked: fits are started from Streamlit's script threads
+            self.pool = ProcessPoolExecutor(workers, mp_context=get_context('spawn'))
+            atexit.register(self.pool.shutdown, wait=False, cancel_futures=True)
+
+    def _refit(self):
+        key = self.rollups.window_key('week', 'vehicle', HISTORY)
+        if key == self._fit_key:
+            return
+        labels, sums = self.rollups.matrix('week', 'vehicle', ['distance', 'fuel_used'], HISTORY)
+        with metrics.timer('forecast_fit_seconds', method=self.method):
+            fuel = sums['fuel_used']
+            mask = fuel > 0
+            fe = np.divide(sums['distance'], fuel, out=np.zeros_like(fuel), where=mask)
+            level, slope, std = fit(fe, mask, self.method, self.pool)
+            few = mask.sum(1) < MIN_WEEKS
+            # Too little history for a trend: hold the mean
+            level = np.where(few, np.divide(fe.sum(1), mask.sum(1), out=np.zeros(len(fe)),
+                                            where=mask.any(1)), level)
+            slope = np.where(few, 0, slope)
+        self.labels, self.level, self.slope, self.std = labels, level, slope, std
+        self.observed = mask.sum(1)
+        self._fit_key, self._risk_key = key, None
+
+    def current(self):
+        """Refit if needed; returns self"""
+        with self._lock:
+            self._refit()
+            if self._risk_key != self.fleet.version:
+                with metrics.timer('forecast_risk_seconds'):
+                    self.risk, self.features = failure_risk(
+                        self.fleet.vehicles(self.RISK_COLUMNS), self.level, self.slope)
+                self._risk_key = self.fleet.version
+        return self
+
+    def expected_failures(self):
+        return float(self.risk.sum())
+
+    def top_risk(self, k=50):
+        """Positions of the k riskiest vehicles, riskiest first"""
+        k = min(k, len(self.risk))
+        top = np.argpartition(-self.risk, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+        return top[np.argsort(-self.risk[top])]
+
+    def fleet_fe(self, history=8):
+        """Fleet FE: recent complete weeks and the forecast with an approximate 95% band"""
+        actual = self.rollups.series('week', periods=HISTORY, complete=True)['efficiency'].dropna()
+        if len(actual) < MIN_WEEKS:
+            return actual.tail(history), None
+        y = actual.to_numpy()[None, :]
+        level, slope, std = METHODS[self.method](y, np.ones_like(y, dtype=bool))
+        steps = np.arange(1, HORIZON + 1)
+        mean = project(level, slope)[0]
+        spread = 1.96 * std[0] * np.sqrt(steps)
+        forecast = pd.DataFrame({'mean': mean, 'low': mean - spread, 'high': mean + spread},
+                                index=[f"+{h}w" for h in steps])
+        return actual.tail(history), forecast
+
+
+def default_workers():
+    """FLEET_FORECAST_WORKERS, where 0 means one per CPU"""
+    workers = int(os.environ.get('FLEET_FORECAST_WORKERS', 1))
+    return workers if workers > 0 else os.cpu_count() or 1
@@ -0,0 +1,190 @@
+"""Live leaderboards: one table's rows ranked on one column.
+
+``Leaderboard`` keeps every row in rank order as a blocked sorted list:
+(key, position) pairs in sorted NumPy blocks of about ``BLOCK`` rows, the
+largest key of each block in a Python list for bisection, and a Fenwick tree
+over the block sizes. The key is the column value, negated when higher
+ranks first, and position breaks ties, so the order is total and matches a
+stable sort.
+
+A changed row is removed and re-inserted: bisect to its block, search within
+the block and shift at most one block, then update the Fenwick tree, which
+is O(log n) plus a small memmove. A rank or a rank range is a Fenwick
+descent. Top-k and bottom-k read the first or last blocks. A batch changing
+more than ``BULK_SHARE`` of the rows re-sorts instead, as one vectorized
+pass is then cheaper than the row-by-row path.
+"""
+import bisect
+import threading
+
+import numpy as np
+
+import fleet_metrics as metrics
+
+BLOCK = 1024
+BULK_SHARE = 1 / 256
+
+
+class _Fenwick:
+    """Prefix sums of block sizes with point updates and rank search"""
+
+    def __init__(self, sizes):
+        self.n = len(sizes)
+        self.tree = [0] * (self.n + 1)
+        for i, size in enumerate(sizes, 1):
+            self.tree[i] += size
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+
+    def add(self, i, delta):
+        i += 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """Total size of blocks before block i"""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, rank):
+        """(block, offset) holding the 0-based rank"""
+        i, step = 0, 1 << self.n.bit_length()
+        while step:
+            if i + step <= self.n and self.tree[i + step] <= rank:
+                i += step
+                rank -= self.tree[i]
+            step >>= 1
+        return i, rank
+
+
+def _put(block, i, value):
+    """block with value inserted at i (np.insert without its argument handling)"""
+    out = np.empty(len(block) + 1, dtype=block.dtype)
+    out[:i], out[i], out[i + 1:] = block[:i], value, block[i:]
+    return out
+
+
+def _drop(block, i):
+    out = np.empty(len(block) - 1, dtype=block.dtype)
+    out[:i], out[i:] = block[:i], block[i + 1:]
+    return out
+
+
+class Leaderboard:
+    """Rows of a fleet table in rank order on column, kept current under updates"""
+
+    def __init__(self, fleet, table, column, descending=True, block=BLOCK):
+        self.fleet, self.table, self.column = fleet, table, column
+        self.descending, self.block = descending, block
+        self.sign = -1.0 if descending else 1.0
+        self._lock = threading.Lock()
+        with metrics.timer('leaderboard_build_seconds', column=column):
+            self.keys = self.sign * fleet.series(table, column).to_numpy().astype(np.float64)
+            metrics.count('rows_scanned_total', len(self.keys), op='leaderboard_build')
+            self._sort()
+        fleet.subscribe(table, [column], self.apply)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _sort(self):
+        """(Re)build the blocks from the current keys"""
+        order = np.lexsort((np.arange(len(self.keys)), self.keys))
+        keys = self.keys[order]
+        bounds = range(0, max(len(order), 1), self.block)
+        self._keys = [keys[i:i + self.block] for i in bounds]
+        self._pos = [order[i:i + self.block] for i in bounds]
+        self._reindex()
+
+    def _reindex(self):
+        self._maxes = [(float(k[-1]), int(p[-1])) if len(k) else (np.inf, 0) for k, p in zip(self._keys, self._pos)]
+        self._tree = _Fenwick([len(k) for k in self._keys])
+
+    # ---------- updates ----------
+    def _find(self, key, position):
+        """(block, index) where (key, position) is or would go"""
+        b = min(bisect.bisect_left(self._maxes, (key, position)), len(self._keys) - 1)
+        keys, positions = self._keys[b], self._pos[b]
+        lo, hi = np.searchsorted(keys, key, 'left'), np.searchsorted(keys, key, 'right')
+        return b, int(lo + np.searchsorted(positions[lo:hi], position))
+
+    def _remove(self, key, position):
+        b, i = self._find(key, position)
+        self._keys[b] = _drop(self._keys[b], i)
+        self._pos[b] = _drop(self._pos[b], i)
+        if len(self._keys[b]) == 0 and len(self._keys) > 1:
+            del self._keys[b], self._pos[b]
+            self._reindex()
+            return
+        if len(self._keys[b]):
+            self._maxes[b] = (float(self._keys[b][-1]), int(self._pos[b][-1]))
+        self._tree.add(b, -1)
+
+    def _insert(self, key, position):
+        b, i = self._find(key, position)
+        self._keys[b] = _put(self._keys[b], i, key)
+        self._pos[b] = _put(self._pos[b], i, position)
+        if len(self._keys[b]) > 2 * self.block:
+            half = len(self._keys[b]) // 2
+            self._keys[b:b + 1] = [self._keys[b][:half], self._keys[b][half:]]
+            self._pos[b:b + 1] = [self._pos[b][:half], self._pos[b][half:]]
+            self._reindex()
+            return
+        self._maxes[b] = (float(self._keys[b][-1]), int(self._pos[b][-1]))
+        self._tree.add(b, 1)
+
+    def apply(self, positions, before, after):
+        """Fleet listener: move the changed rows to their new ranks"""
+        new = self.sign * after[self.column].to_numpy().astype(np.float64)
+        metrics.count('rows_scanned_total', len(positions), op='leaderboard_update')
+        with self._lock:
+            if len(positions) > len(self.keys) * BULK_SHARE:
+                self.keys[positions] = new
+                self._sort()
+                return
+            for position, key in zip(positions.tolist(), new.tolist()):
+                old = self.keys[position]
+                if old == key:
+                    continue
+                self._remove(old, position)
+                self._insert(key, position)
+                self.keys[position] = key
+
+    # ---------- reads ----------
+    def slice(self, start, stop):
+        """Positions ranked start..stop-1 (0 is the best)"""
+        with self._lock:
+            stop = min(stop, len(self.keys))
+            if start >= stop:
+                return np.empty(0, dtype=np.int64)
+            b, i = self._tree.find(start)
+            parts, need = [], stop - start
+            while need > 0:
+                part = self._pos[b][i:i + need]
+                parts.append(part)
+                need -= len(part)
+                b, i = b + 1, 0
+            return np.concatenate(parts)
+
+    def top(self, k):
+        """Positions of the k best rows, best first"""
+        return self.slice(0, k)
+
+    def bottom(self, k):
+        """Positions of the k worst rows, worst first"""
+        n = len(self.keys)
+        return self.slice(max(n - k, 0), n)[::-1]
+
+    def rank(self, position):
+        """1-based rank of a row (1 is the best)"""
+        with self._lock:
+            b, i = self._find(self.keys[position], position)
+            return self._tree.prefix(b) + i + 1
+
+    def value(self, position):
+        return self.sign * self.keys[position]
@@ -0,0 +1,143 @@
+"""Live vehicle updates for the wall display.
+
+A ``LiveFeed`` thread pulls batches of vehicle changes from a local source
+and writes them through ``Fleet.update``, so the materialized KPI views,
+search and sort indexes pick them up incrementally. Pages never wait on it:
+the Overview's KPI cards, status counts and alerts are ``st.fragment``s that
+re-run on a timer and read whatever the fleet holds at that moment.
+
+Sources yield ``(positions, changes)`` pairs as ``Fleet.update`` takes them:
+
+- ``simulate()``: seeded status flips, idle time and CO2 drift;
+- ``tail_jsonl(path)``: follows a file of lines such as
+  ``{"vehicle": 12, "Status": "Idle", "Idle Time (min)": 95}``.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+import fleet_metrics as metrics
+from fleet_data import DEFAULT_SEED, STATUSES
+
+LIVE_COLUMNS = ['Status', 'Idle Time (min)', 'Daily CO2 (kg)']
+
+
+def simulate(fleet, seed=DEFAULT_SEED, interval=1.0, share=0.02):
+    """Every interval seconds, change about `share` of the fleet (at least one truck)"""
+    rng = np.random.default_rng([seed, 3])
+    n = fleet.n_vehicles
+    while True:
+        time.sleep(interval)
+        k = max(1, int(n * share))
+        positions = np.unique(rng.integers(0, n, k))
+        idle = fleet.series('vehicles', 'Idle Time (min)').to_numpy()[positions].astype(np.int64)
+        co2 = fleet.series('vehicles', 'Daily CO2 (kg)').to_numpy()[positions].astype(np.float64)
+        yield positions, {
+            'Status': np.array(STATUSES)[rng.choice(len(STATUSES), len(positions), p=[0.6, 0.3, 0.1])],
+            'Idle Time (min)': np.clip(idle + rng.integers(-30, 31, len(positions)), 0, 600),
+            'Daily CO2 (kg)': np.round(np.clip(co2 * rng.normal(1, 0.05, len(positions)), 5, 60), 1),
+        }
+
+
+def tail_jsonl(path, poll=1.0, n_vehicles=None):
+    """Follow a JSON-lines file, yielding one update per column set and poll
+
+    Lines already in the file when it is opened are applied first. A
+    vehicle listed twice in one poll keeps its last values. Text after the
+    last newline waits for the rest of its line. Lines that aren't a JSON
+    object with a valid ``vehicle`` position are skipped and counted in
+    ``live_rejected_total``.
+    """
+    pending = ''
+    with open(path) as f:
+        while True:
+            text = pending + f.read()
+            cut = text.rfind('\n') + 1
+            pending = text[cut:]
+            if not cut:
+                time.sleep(poll)
+                continue
+            groups = {}
+            for line in text[:cut].splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                    position = int(row.pop('vehicle'))
+                except (ValueError, TypeError, KeyError, AttributeError):
+                    metrics.count('live_rejected_total', reason='line')
+                    continue
+                if position < 0 or (n_vehicles is not None and position >= n_vehicles):
+                    metrics.count('live_rejected_total', reason='vehicle')
+                    continue
+                groups.setdefault(tuple(sorted(row)), {})[position] = row
+            for columns, rows in groups.items():
+                positions = np.fromiter(rows, dtype=np.int64, count=len(rows))
+                yield positions, {c: [rows[p][c] for p in rows] for c in columns}
+
+
+def open_source(spec, fleet, seed=DEFAULT_SEED, interval=1.0, share=0.02):
+    """Updates for a FLEET_LIVE setting: 'simulate' (with its interval and
+    share) or a JSON-lines path"""
+    if spec == 'simulate':
+        return simulate(fleet, seed, interval, share)
+    if not os.path.exists(spec):
+        raise FileNotFoundError(spec)
+    return tail_jsonl(spec, n_vehicles=fleet.n_vehicles)
+
+
+class LiveFeed:
+    """Background thread applying updates from a source to a Fleet"""
+
+    def __init__(self, fleet, source):
+        self.fleet, self.source = fleet, source
+        self.updates = self.rejected = 0
+        self.error = None
+        self.rejection = None       # why the last rejected update was refused
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='fleet-live', daemon=True)
+
+    def _run(self):
+        try:
+            for positions, changes in self.source:
+                if self._stop.is_set():
+                    break
+                with metrics.timer('live_update_seconds'):
+                    errors = [self._apply(positions, changes)]
+                    if errors[0] is not None and len(positions) > 1:
+                        # Fleet.update wrote nothing: apply the rows one by one, dropping the bad ones
+                        errors = [self._apply(positions[i:i + 1], {c: [v[i]] for c, v in changes.items()})
+                                  for i in range(len(positions))]
+                for error in errors:
+                    if error is not None:
+                        self.rejected += 1
+                        self.rejection = error
+                        metrics.count('live_rejected_total', reason='update')
+        except Exception as e:      # the dashboard keeps the last good state
+            self.error = e
+
+    def _apply(self, positions, changes):
+        """Write one update; the error if Fleet.update refused it (an unknown column or label)"""
+        try:
+            self.fleet.update('vehicles', positions, changes)
+        except (KeyError, ValueError) as e:
+            return e
+        self.updates += 1
+        metrics.count('live_rows_updated_total', len(positions))
+        return None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
@@ -0,0 +1,155 @@
+"""Maintenance scheduling index.
+
+``DueIndex`` is a calendar queue over ``Next Service (days)``: every vehicle
+sits in the bucket of the day its service is due, and within a day the
+vehicle with the most ``KM Since Service`` comes first. The buckets are one
+permutation of the rows plus the offset where each day starts, so "due in
+the next N days", "overdue" and "next K services" are two offset lookups and
+a slice, already in schedule order, and the per-day workshop load is the
+difference of neighbouring offsets.
+
+Updates (a service logged, a due date moved) don't touch the permutation:
+the row is marked stale there and kept in a small side set that queries
+merge in. Once that set passes 1/16 of the fleet the buckets are rebuilt.
+A second sorted copy keyed on ``KM Since Service`` answers "over N km since
+service" the same way.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+import fleet_metrics as metrics
+
+DUE = 'Next Service (days)'
+KM = 'KM Since Service'
+SERVICE_INTERVAL_DAYS = 60
+SERVICE_KM = 12000          # km between services
+
+
+class DueIndex:
+    """Vehicles bucketed by service due day, ordered by km since service within a day"""
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self._lock = threading.RLock()
+        self._build()
+        fleet.subscribe('vehicles', [DUE, KM], self.apply)
+
+    def _build(self):
+        with metrics.timer('due_index_build_seconds'):
+            self.due = self.fleet.series('vehicles', DUE).to_numpy().astype(np.int64)
+            self.km = self.fleet.series('vehicles', KM).to_numpy().astype(np.int64)
+            metrics.count('rows_scanned_total', len(self.due), op='due_index_build')
+            self.first_day = int(self.due.min()) if len(self.due) else 0
+            days = np.arange(self.first_day, int(self.due.max(initial=self.first_day)) + 2)
+            self.order = np.lexsort((-self.km, self.due))
+            self.starts = np.searchsorted(self.due[self.order], days)
+            self.counts = np.diff(self.starts)
+            self.km_order = np.argsort(self.km, kind='stable')
+            self.km_sorted = self.km[self.km_order]
+            self.stale = np.zeros(len(self.due), dtype=bool)
+            self.moved = set()
+
+    def apply(self, positions, before, after):
+        """Fleet listener: move changed rows to the side set and fix the day counts"""
+        with self._lock:
+            old = self.due[positions]
+            self.due[positions] = after[DUE].to_numpy()
+            self.km[positions] = after[KM].to_numpy()
+            self._grow(int(self.due[positions].min()), int(self.due[positions].max()))
+            np.subtract.at(self.counts, old - self.first_day, 1)
+            np.add.at(self.counts, self.due[positions] - self.first_day, 1)
+            self.stale[positions] = True
+            self.moved.update(positions.tolist())
+            if len(self.moved) > len(self.due) // 16:
+                self._build()
+
+    def _grow(self, lo, hi):
+        """Widen the day range of counts/starts to cover [lo, hi]"""
+        last = self.first_day + len(self.counts) - 1
+        if lo >= self.first_day and hi <= last:
+            return
+        before, after = max(self.first_day - lo, 0), max(hi - last, 0)
+        self.counts = np.pad(self.counts, (before, after))
+        self.starts = np.pad(self.starts, (before, after), mode='edge')
+        self.first_day -= before
+
+    def _bucket_range(self, first, last):
+        """Clip [first, last] (None = open) to the days the buckets cover, as offsets"""
+        lo = 0 if first is None else min(max(first - self.first_day, 0), len(self.counts))
+        hi = len(self.counts) if last is None else min(last - self.first_day + 1, len(self.counts))
+        return lo, max(hi, lo)
+
+    def _merge(self, base, extra, keys):
+        """Fresh rows of base plus the moved rows in extra, ordered by keys(positions)"""
+        base = base[~self.stale[base]]
+        if not len(extra):
+            return base
+        rows = np.concatenate([base, extra])
+        return rows[np.lexsort(keys(rows))]
+
+    # ---------- queries ----------
+    def due_between(self, first=None, last=None):
+        """Positions due in [first, last] days from today (None = open), in schedule order"""
+        with self._lock:
+            lo, hi = self._bucket_range(first, last)
+            base = self.order[self.starts[lo]:self.starts[hi]]
+            extra = np.fromiter(self.moved, dtype=np.int64, count=len(self.moved))
+            d = self.due[extra]
+            if first is not None:
+                extra, d = extra[d >= first], d[d >= first]
+            if last is not None:
+                extra = extra[d <= last]
+            metrics.count('rows_scanned_total', len(base) + len(self.moved), op='due_query')
+            return self._merge(base, extra, lambda rows: (rows, -self.km[rows], self.due[rows]))
+
+    def overdue(self):
+        """Positions past their service day, most overdue first"""
+        return self.due_between(None, -1)
+
+    def next(self, k, from_day=0):
+        """The next k services from from_day on"""
+        with self._lock:
+            lo, _ = self._bucket_range(from_day, None)
+            cumulative = np.cumsum(self.counts[lo:])
+            span = int(np.searchsorted(cumulative, k))     # buckets needed for k rows
+            return self.due_between(from_day, self.first_day + lo + span)[:k]
+
+    def count(self, first=None, last=None):
+        """Vehicles due in [first, last] days, from the day counts"""
+        with self._lock:
+            lo, hi = self._bucket_range(first, last)
+            return int(self.counts[lo:hi].sum())
+
+    def workload(self, first=0, last=30):
+        """Services due per day in [first, last], indexed by date"""
+        with self._lock:
+            lo, hi = self._bucket_range(first, last)
+            counts = np.zeros(last - first + 1, dtype=np.int64)
+            offset = self.first_day + lo - first
+            counts[offset:offset + hi - lo] = self.counts[lo:hi]
+        today = np.datetime64('today', 'D')
+        return pd.Series(counts, index=pd.DatetimeIndex(today + np.arange(first, last + 1), name='date'),
+                         name='services')
+
+    def over_km(self, limit):
+        """Positions with at least `limit` km since service, most km first"""
+        with self._lock:
+            start = np.searchsorted(self.km_sorted, limit)
+            base = self.km_order[start:][::-1]
+            extra = np.fromiter(self.moved, dtype=np.int64, count=len(self.moved))
+            extra = extra[self.km[extra] >= limit]
+            # km_order is not refreshed by updates: stale covers rows whose km moved
+            return self._merge(base, extra, lambda rows: (-rows, -self.km[rows]))
+
+
+def log_service(fleet, positions, interval_days=SERVICE_INTERVAL_DAYS):
+    """Record a completed service: reset the km counter and schedule the next one"""
+    positions = np.unique(np.asarray(positions, dtype=np.int64))
+    n = len(positions)
+    fleet.update('vehicles', positions, {
+        DUE: np.full(n, interval_days),
+        KM: np.zeros(n, dtype=np.int64),
+        'Last Service (days)': np.zeros(n, dtype=np.int64),
+    })
@@ -0,0 +1,125 @@
+"""Per-session memory accounting.
+
+The fleet, its indexes and the figure cache are held once per process with
+``st.cache_resource``, and a page gets its columns as views onto the
+fleet's arrays. What one more browser session costs is therefore its session
+state plus whatever its page run copies. ``frame_bytes`` splits a page frame
+into bytes shared with the fleet and bytes the frame owns, ``SessionLedger``
+keeps the latest figures per session, and ``SessionLedger.report`` turns
+them into how many more sessions fit in the memory budget.
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+SESSION_TTL = 15 * 60       # seconds; a session not seen for this long is no longer counted
+CGROUP_LIMIT = '/sys/fs/cgroup/memory.max'
+
+
+def _buffers(series):
+    """(address, bytes) of each buffer behind a Series' values"""
+    array = series.array
+    if isinstance(array, pd.Categorical):
+        array = array.codes
+    if hasattr(array, '__arrow_array__'):
+        chunked = array.__arrow_array__()
+        return [(b.address, b.size) for chunk in chunked.chunks for b in chunk.buffers() if b is not None]
+    values = np.asarray(array)
+    return [(values.__array_interface__['data'][0], values.nbytes)]
+
+
+def frame_bytes(df, fleet, table):
+    """(shared, owned) bytes of df: a buffer is shared if it lies inside one of the fleet's"""
+    shared = owned = 0
+    for column in df.columns:
+        theirs = _buffers(fleet.series(table, column))
+        for address, size in _buffers(df[column]):
+            if any(a <= address < a + n for a, n in theirs):
+                shared += size
+            else:
+                owned += size
+    return shared, owned
+
+
+def deep_bytes(value, seen=None):
+    """Rough size of a session state value and what it holds"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_bytes(k, seen) + deep_bytes(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_bytes(v, seen) for v in value)
+    return size
+
+
+def process_memory(pid=None):
+    """Resident bytes of a process (this one by default): rss, anon (private)
+    and file (mapped); empty off Linux"""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return {}
+    names = {'VmRSS': 'rss', 'RssAnon': 'anon', 'RssFile': 'file'}
+    return {names[k]: int(fields[k].split()[0]) * 1024 for k in names if k in fields}
+
+
+def memory_budget():
+    """FLEET_MEMORY_BUDGET_MB, else the container's cgroup limit, else None"""
+    mb = os.environ.get('FLEET_MEMORY_BUDGET_MB')
+    if mb:
+        return int(mb) * 2**20
+    try:
+        with open(CGROUP_LIMIT) as f:
+            limit = f.read().strip()
+    except OSError:
+        return None
+    return None if limit == 'max' else int(limit)
+
+
+class SessionLedger:
+    """Latest memory figures of every session in this process"""
+
+    def __init__(self):
+        self._sessions = {}     # session id -> (last seen, page, state bytes, page bytes owned)
+        self._lock = threading.Lock()
+
+    def record(self, session, page, state_bytes, page_bytes):
+        with self._lock:
+            self._sessions[session] = (time.time(), page, state_bytes, page_bytes)
+
+    def sessions(self):
+        """DataFrame of active sessions, dropping those idle past SESSION_TTL"""
+        cutoff = time.time() - SESSION_TTL
+        with self._lock:
+            for session in [s for s, row in self._sessions.items() if row[0] < cutoff]:
+                del self._sessions[session]
+            rows = list(self._sessions.values())
+        return pd.DataFrame(rows, columns=['seen', 'page', 'state bytes', 'page bytes'])
+
+    def report(self, budget=None):
+        """Sessions, their own bytes, process memory and the sessions left in budget
+
+        ``headroom`` divides the budget left over by the largest session seen;
+        it leaves out what Streamlit itself keeps per connection, so treat it
+        as an upper bound (benchmarks/bench_sessions.py measures the whole).
+        """
+        sessions = self.sessions()
+        own = sessions['state bytes'] + sessions['page bytes']
+        memory = process_memory()
+        report = {'sessions': len(sessions), 'session bytes mean': float(own.mean()) if len(own) else 0.0,
+                  'session bytes max': int(own.max()) if len(own) else 0, **memory, 'budget': budget}
+        if budget and memory.get('rss') and len(own):
+            report['headroom'] = max(budget - memory['rss'], 0) // max(report['session bytes max'], 1)
+        return report
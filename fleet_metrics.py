@@ -0,0 +1,191 @@
+"""Timers and counters for the dashboard's hot paths.
+
+Off unless ``FLEET_METRICS=1``. While off, ``timer()`` hands back one shared
+no-op context manager and ``count()`` / ``observe()`` return on their first
+line, so instrumented code pays a function call and nothing more.
+
+While on, every timer keeps count/sum/max/last seconds and every counter a
+running total, keyed by name and labels. ``prometheus_text()`` renders them
+in the Prometheus text exposition format, a timer as a summary of count and
+sum plus a ``..._max_seconds`` gauge; ``FLEET_METRICS_FILE`` has the
+dashboard write that text after every run (for node_exporter's textfile
+collector) and ``FLEET_METRICS_PORT`` serves it at ``/metrics``.
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+PREFIX = 'fleet_'
+
+enabled = os.environ.get('FLEET_METRICS', '') not in ('', '0')
+_NULL = nullcontext()
+_lock = threading.Lock()
+_counters = {}      # (name, labels) -> total
+_timers = {}        # (name, labels) -> [count, sum, max, last]
+_gauges = {}        # (name, labels) -> value
+_local = threading.local()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class _Timer:
+    __slots__ = ('key', 'start')
+
+    def __init__(self, key):
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.key, time.perf_counter() - self.start)
+        return False
+
+
+def _record(key, seconds):
+    with _lock:
+        stats = _timers.get(key)
+        if stats is None:
+            _timers[key] = [1, seconds, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3] = seconds
+
+
+def timer(name, **labels):
+    """Context manager timing its block under name{labels}"""
+    if not enabled:
+        return _NULL
+    return _Timer(_key(name, labels))
+
+
+def count(name, value=1, **labels):
+    """Add value to the counter name{labels}"""
+    if not enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """Set the gauge name{labels} to its latest value"""
+    if not enabled:
+        return
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+# ---------- cached loaders ----------
+def cache_miss(name):
+    """Decorator for the body of a cached loader: runs only on a miss
+
+    Put it under ``@st.cache_resource`` and call the loader through
+    ``cached()`` so the call is counted as a hit when the body did not run.
+    """
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            _local.missed = True
+            with _Timer(_key('loader_build_seconds', {'loader': name})):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def cached(name, loader, *args):
+    """Call a cached loader, counting a hit or a miss"""
+    if not enabled:
+        return loader(*args)
+    _local.missed = False
+    result = loader(*args)
+    count('cache_requests_total', cache=name, result='miss' if _local.missed else 'hit')
+    return result
+
+
+# ---------- reading ----------
+def snapshot():
+    """Copies of (counters, timers, gauges)"""
+    with _lock:
+        return dict(_counters), {k: list(v) for k, v in _timers.items()}, dict(_gauges)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+        _gauges.clear()
+
+
+def _labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in items)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + '}'
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format"""
+    counters, timers, gauges = snapshot()
+    lines = []
+    for kind, metrics in (('counter', counters), ('gauge', gauges)):
+        for name in sorted({n for n, _ in metrics}):
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            for (n, labels), value in sorted(metrics.items()):
+                if n == name:
+                    lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+    for name in sorted({n for n, _ in timers}):
+        lines.append(f"# TYPE {PREFIX}{name} summary")
+        for (n, labels), (calls, total, _, _) in sorted(timers.items()):
+            if n == name:
+                lines.append(f"{PREFIX}{name}_count{_labels(labels)} {calls}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {total:.6f}")
+        # The slowest call is not a quantile of a summary: it gets its own gauge
+        peak_name = name[:-len('_seconds')] + '_max_seconds' if name.endswith('_seconds') else name + '_max'
+        lines.append(f"# TYPE {PREFIX}{peak_name} gauge")
+        for (n, labels), (_, _, peak, _) in sorted(timers.items()):
+            if n == name:
+                lines.append(f"{PREFIX}{peak_name}{_labels(labels)} {peak:.6f}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path):
+    """Write prometheus_text() to path atomically"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def serve(port, host='127.0.0.1'):
+    """Serve /metrics from a daemon thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='fleet-metrics', daemon=True).start()
+    return server
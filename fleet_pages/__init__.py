@@ -0,0 +1,49 @@
+"""Dashboard pages.
+
+Each page is its own module with a ``render(ctx)`` function. A module states
+what it needs up front: its imports are the libraries it uses, and
+``VEHICLES`` / ``DRIVERS`` list the columns it reads from each table. The
+registry below only holds labels and module names, so a page's libraries
+and columns are loaded the first time someone opens it.
+
+(The package is not called ``pages`` because Streamlit would treat that
+directory as its own multipage app.)
+"""
+import importlib
+
+
+class Page:
+    """A sidebar entry and the module that renders it"""
+
+    def __init__(self, label, module):
+        self.label = label
+        self.module = module
+
+    def load(self):
+        """Import the page module; Python caches it after the first visit"""
+        return importlib.import_module(f"{__name__}.{self.module}")
+
+
+PAGES = [
+    Page("🏠 Fleet Overview", "overview"),
+    Page("🚛 Vehicle Analysis", "vehicles"),
+    Page("🧊 Fleet Explorer", "explorer"),
+    Page("👤 Driver Performance", "drivers"),
+    Page("🌱 CO2 Analytics", "co2"),
+    Page("📚 Micro Training", "training"),
+    Page("💡 FE Opportunities", "fe_opportunities"),
+    Page("🔬 Advanced Analytics", "advanced"),
+    Page("🔧 Maintenance", "maintenance"),
+    Page("💰 Cost Analysis", "costs"),
+    Page("✅ Compliance", "compliance"),
+]
+PAGES_BY_LABEL = {p.label: p for p in PAGES}
+
+
+def page_data():
+    """Columns each page reads, by label; imports every page"""
+    data = {}
+    for p in PAGES:
+        module = p.load()
+        data[p.label] = {'vehicles': module.VEHICLES, 'drivers': module.DRIVERS}
+    return data
@@ -0,0 +1,59 @@
+"""Advanced Analytics page"""
+import streamlit as st
+import plotly.graph_objects as go
+
+import fleet_app
+from fleet_forecast import HORIZON
+
+VEHICLES = []
+DRIVERS = []
+TOP_RISK = 50
+
+
+def render(ctx):
+    st.title("Advanced Analytics & AI Insights")
+    forecast = fleet_app.forecast()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Predicted Failures", f"{forecast.expected_failures():,.0f}", "next 30 days",
+                  delta_color="off", help="Sum of every vehicle's 30-day failure risk")
+    with col2:
+        st.metric("Prevention Success", "94%")
+    with col3:
+        st.metric("Cost Saved", "₹8.4L", "YTD")
+    
+    st.subheader(f"Fuel Efficiency Forecast (Next {HORIZON} Weeks)")
+    actual, predicted = forecast.fleet_fe()
+    
+    def forecast_figure():
+        fig = go.Figure()
+        if predicted is not None:
+            x = [actual.index[-1]] + list(predicted.index)
+            fig.add_trace(go.Scatter(x=list(predicted.index) + list(predicted.index[::-1]),
+                                     y=list(predicted['high']) + list(predicted['low'][::-1]),
+                                     fill='toself', fillcolor='rgba(102, 126, 234, 0.15)',
+                                     line=dict(width=0), name='95% band', hoverinfo='skip'))
+            fig.add_trace(go.Scatter(x=x, y=[actual.iloc[-1]] + list(predicted['mean']), name='Predicted',
+                                     line=dict(dash='dash', color='#667eea')))
+        fig.add_trace(go.Scatter(x=list(actual.index), y=actual.round(3), name='Actual',
+                                 line=dict(color='#10b981')))
+        fig.update_layout(yaxis_title='Efficiency (km/L)')
+        return fig
+    st.plotly_chart(ctx.figure("fe_forecast", forecast_figure, tuple(actual.round(4).items())),
+                    use_container_width=True)
+    if predicted is None:
+        st.info("Not enough complete weeks of telemetry for a forecast yet.")
+    
+    st.subheader("⚠️ Failure Risk Ranking")
+    top = forecast.top_risk(TOP_RISK)
+    ranking = ctx.fleet.rows('vehicles', top, ['Vehicle ID', 'Model', 'KM Since Service', 'Next Service (days)'])
+    ranking['Risk (30d)'] = (forecast.risk[top] * 100).round(1)
+    ranking['FE Trend (%/wk)'] = (forecast.slope[top] / forecast.level[top].clip(min=1e-9) * 100).round(2)
+    ranking['Model'] = ranking['Model'].cat.remove_unused_categories()
+    st.dataframe(ranking, hide_index=True, use_container_width=True,
+                 column_config={'Risk (30d)': st.column_config.ProgressColumn(
+                     'Risk (30d)', format='%.1f%%', min_value=0, max_value=100)})
+    st.caption(f"Top {len(top)} of {ctx.n_vehicles:,} vehicles, refitted on {len(forecast.labels)} weeks "
+               "of telemetry. Risk mixes km since service, days overdue, maintenance cost per km and "
+               "the fitted FE trend.")
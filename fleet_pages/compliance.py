@@ -0,0 +1,29 @@
+"""Compliance page"""
+import random
+
+import streamlit as st
+import plotly.express as px
+
+VEHICLES = []
+DRIVERS = []
+
+
+def render(ctx):
+    st.title("Compliance & Regulatory Status")
+    n_vehicles = ctx.n_vehicles
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Compliance Score", "96%", "↑ 2%")
+    with col2:
+        bs6_compliant = round(n_vehicles * random.uniform(140 / 150, 148 / 150))
+        st.metric("BS-VI Compliant", f"{bs6_compliant:,}/{n_vehicles:,}")
+    with col3:
+        st.metric("Expiring Soon (30d)", "6 documents")
+    
+    st.subheader("Compliance Status by Category")
+    categories = ['Registration', 'Insurance', 'Permits', 'Fitness', 'Pollution', 'License']
+    compliance = [98, 96, 94, 95, 97, 99]
+    fig = px.bar(x=categories, y=compliance, color=compliance, color_continuous_scale='Greens')
+    fig.update_layout(yaxis_range=[0, 100])
+    st.plotly_chart(fig, use_container_width=True)
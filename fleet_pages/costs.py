@@ -0,0 +1,48 @@
+"""Cost Analysis page"""
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+import fleet_app
+
+VEHICLES = []
+DRIVERS = []
+
+
+def render(ctx):
+    st.title("Cost Analysis & Financial Insights")
+    kpis = fleet_app.kpis()
+    
+    total_maint_cost = kpis.total_maint_cost()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Operating Cost", "₹45.2L")
+    with col2:
+        st.metric("Avg Cost per KM", "₹32.4")
+    with col3:
+        st.metric("Fuel Cost (63%)", "₹28.5L")
+    with col4:
+        st.metric("Maintenance Cost", f"₹{total_maint_cost/100000:.2f}L")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Cost Breakdown")
+        fig = go.Figure(data=[go.Pie(
+            labels=['Fuel', 'Maintenance', 'Driver Salary', 'Insurance', 'Others'],
+            values=[63, 15, 12, 6, 4],
+            marker=dict(colors=['#667eea', '#f59e0b', '#10b981', '#3b82f6', '#ef4444'])
+        )])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Monthly Cost Trends")
+        months = fleet_app.telemetry().series('month', periods=6, complete=True)
+        if months.empty:
+            st.info("No telemetry yet.")
+        else:
+            fig = px.line(x=months.index, y=(months['fuel_cost'] / 1e5).round(1), markers=True,
+                          labels={'x': 'Month', 'y': 'Fuel cost (₹ lakh)'})
+            fig.update_traces(line_color='#667eea', fill='tozeroy')
+            st.plotly_chart(fig, use_container_width=True)
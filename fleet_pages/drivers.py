@@ -0,0 +1,123 @@
+"""Driver Performance page"""
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+import fleet_app
+from fleet_data import training_in_progress
+from fleet_schema import DRIVER_COLUMNS
+from fleet_figures import range_band
+from fleet_table import paged_table
+from fleet_timeseries import WINDOWS, window_days
+
+VEHICLES = []
+DRIVERS = DRIVER_COLUMNS
+
+
+def render(ctx):
+    st.title("Driver Performance")
+    df_drivers = ctx.drivers
+    n_drivers = ctx.n_drivers
+    kpis = fleet_app.kpis()
+    
+    tab1, tab2, tab3, tab4 = ctx.tabs([
+        "📊 Overview",
+        "🏆 Top Performers",
+        "📈 Trends",
+        "📚 Training Status"
+    ])
+    
+    with tab1:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Drivers", f"{n_drivers:,}")
+        with col2:
+            avg_eff = kpis.avg_efficiency()
+            st.metric("Avg Efficiency", f"{avg_eff:.2f} km/L")
+        with col3:
+            trained = kpis.trained()
+            st.metric("Training Complete", f"{trained:,}/{n_drivers:,}")
+        with col4:
+            avg_score = kpis.avg_score()
+            st.metric("Avg Score", f"{avg_score:.0f}/100")
+        
+        st.subheader("All Drivers")
+        paged_table(df_drivers, "all_drivers", sort_index=fleet_app.sort_index('drivers'),
+                    sort_columns=list(df_drivers.columns), sort_by='Score', ascending=False, export='drivers')
+        
+        # Driver drill-down: options are row positions, labelled through the name index
+        st.markdown("### 🔍 Select Driver for Details")
+        index = fleet_app.search()
+        search = st.text_input("🔍 Search drivers...", key="driver_search",
+                               help="Matches driver names. End with * for a prefix, e.g. Driver A1*")
+        matches = fleet_app.query().run('driver_search', search) if search else None
+        n_matches = n_drivers if matches is None else len(matches)
+        options = range(min(n_drivers, fleet_app.SELECT_LIMIT)) if matches is None else matches[:fleet_app.SELECT_LIMIT].tolist()
+        if n_matches > fleet_app.SELECT_LIMIT:
+            st.caption(f"Showing the first {fleet_app.SELECT_LIMIT:,} of {n_matches:,} drivers. Search to narrow the list.")
+        selected = st.selectbox("Driver Name", options, format_func=index.driver_label, key="drv_detail")
+        
+        if selected is not None:
+            d = df_drivers.iloc[selected]
+            selected_driver = d['Name']
+            
+            with st.expander(f"**{selected_driver}** - Detailed Analysis", expanded=True):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Score", d["Score"])
+                with col2:
+                    st.metric("Efficiency", f"{d['Efficiency (km/L)']:.2f} km/L")
+                with col3:
+                    st.metric("Total Trips", d["Total Trips"])
+                with col4:
+                    st.metric("Violations", d["Violations"])
+                
+                rank = fleet_app.query().rank('drivers', 'Efficiency (km/L)', selected)
+                st.caption(f"Efficiency rank **#{rank:,}** of {len(df_drivers):,}")
+                
+                # Assigned vehicles through the driver -> vehicles index
+                assigned = fleet_app.query().vehicles_of(selected)
+                st.markdown(f"**Assigned vehicles ({len(assigned):,})**")
+                st.dataframe(fleet_app.fleet().rows('vehicles', assigned[:fleet_app.SELECT_LIMIT],
+                                                    ['Vehicle ID', 'Model', 'Status', 'FE (km/L)']),
+                             hide_index=True, use_container_width=True)
+                
+                # Trip score history, downsampled to the zoom window
+                window = st.radio("History", list(WINDOWS), index=3, horizontal=True, key="drv_window")
+                history = fleet_app.drilldown().driver_score.window(d.name, *window_days(window))
+                fig = range_band(history, title="Performance History", y_title="Trip score")
+                st.plotly_chart(fig, use_container_width=True)
+    
+    with tab2:
+        st.subheader("Top 20 Drivers by Efficiency")
+        def top20_figure():
+            top20 = fleet_app.query().top('drivers', 'Efficiency (km/L)', 20, ['Name', 'Efficiency (km/L)', 'Score'])
+            fig = px.bar(top20, x='Efficiency (km/L)', y='Name', orientation='h',
+                        color='Score', color_continuous_scale='Viridis')
+            fig.update_layout(height=600)
+            return fig
+        st.plotly_chart(ctx.figure("top20", top20_figure), use_container_width=True)
+    
+    with tab3:
+        st.subheader("Performance Trends")
+        months = fleet_app.telemetry().series('month', periods=6)
+        if months.empty:
+            st.info("No telemetry yet.")
+        else:
+            fig = px.line(x=months.index, y=months['avg_score'].round(1), markers=True,
+                          labels={'x': 'Month', 'y': 'Avg trip score'})
+            fig.update_traces(line_color='#10b981')
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with tab4:
+        st.subheader("Training Status")
+        trained_count = kpis.trained()
+        in_progress = training_in_progress(n_drivers)
+        not_started = n_drivers - trained_count - in_progress
+        
+        fig = go.Figure(data=[go.Pie(
+            labels=['Completed', 'In Progress', 'Not Started'],
+            values=[trained_count, in_progress, not_started],
+            marker=dict(colors=['#10b981', '#f59e0b', '#ef4444'])
+        )])
+        st.plotly_chart(fig, use_container_width=True)
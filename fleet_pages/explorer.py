@@ -0,0 +1,66 @@
+"""Fleet Explorer page: drill down State → District → Model → Status"""
+import streamlit as st
+import plotly.graph_objects as go
+
+import fleet_app
+from fleet_cube import DIMS, MEASURES
+
+VEHICLES = []
+DRIVERS = []
+ALL = "All"
+
+
+def render(ctx):
+    st.title("Fleet Explorer")
+    cube = fleet_app.cube()
+    
+    measure = st.selectbox("Measure", MEASURES, key="cube_measure")
+    
+    # Each level offers only the labels that have vehicles under the levels above
+    filters = {}
+    levels = ['State', 'District', 'Model']
+    for col, dim in zip(st.columns(len(levels)), levels):
+        options = [ALL] + list(cube.rollup(dim, measure, filters).index)
+        with col:
+            choice = st.selectbox(dim, options, key=f"cube_{dim.lower()}",
+                                  format_func=lambda v, dim=dim: f"{v:02d}" if dim == 'District' and v != ALL else v)
+        if choice == ALL:
+            break
+        filters[dim] = choice
+    by = next(d for d in DIMS if d not in filters)
+    
+    total = cube.rollup(None, measure, filters)
+    path = " › ".join([ALL] + [f"{v:02d}" if d == 'District' else str(v) for d, v in filters.items()])
+    st.caption(path)
+    if total.empty:
+        st.info("No vehicles in this slice.")
+        return
+    # iloc[0] would upcast the count to float along with the measures
+    n_vehicles = int(total['Vehicles'].iloc[0])
+    row = total.iloc[0]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Vehicles", f"{n_vehicles:,}")
+    with col2:
+        st.metric("Mean", f"{row['mean']:,.2f}")
+    with col3:
+        st.metric("Median (approx.)", f"{row['p50']:,.2f}")
+    with col4:
+        st.metric("P90 (approx.)", f"{row['p90']:,.2f}")
+    
+    breakdown = cube.rollup(by, measure, filters)
+    st.subheader(f"{measure} by {by}")
+    
+    def breakdown_figure():
+        labels = [f"{v:02d}" if by == 'District' else str(v) for v in breakdown.index]
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=labels, y=breakdown['mean'], name='Mean', marker_color='#667eea',
+                             customdata=breakdown['Vehicles'],
+                             hovertemplate='%{x}: %{y:.2f} (%{customdata:,} vehicles)<extra></extra>'))
+        fig.add_trace(go.Scatter(x=labels, y=breakdown['p90'], name='P90', mode='markers',
+                                 marker=dict(color='#ef4444', symbol='line-ew-open', size=14)))
+        fig.update_layout(height=380, xaxis_type='category', yaxis_title=measure)
+        return fig
+    st.plotly_chart(ctx.figure("cube_breakdown", breakdown_figure, measure, tuple(filters.items())),
+                    use_container_width=True)
+    st.dataframe(breakdown.round(2), use_container_width=True)
@@ -0,0 +1,29 @@
+"""FE Opportunities page"""
+import streamlit as st
+import plotly.graph_objects as go
+
+VEHICLES = []
+DRIVERS = []
+
+
+def render(ctx):
+    st.title("Fuel Efficiency Opportunities")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Monthly Opportunity", "₹2.4L")
+    with col2:
+        st.metric("Captured (75%)", "₹1.8L", "↑ 12%")
+    with col3:
+        st.metric("Lost Opportunity", "₹0.6L")
+    
+    st.subheader("Opportunity Breakdown")
+    categories = ['Idle Reduction', 'Speed Optimization', 'Route Efficiency', 'Load Planning']
+    captured = [45000, 38000, 42000, 35000]
+    lost = [15000, 12000, 10000, 8000]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name='Captured', x=categories, y=captured, marker_color='#10b981'))
+    fig.add_trace(go.Bar(name='Lost', x=categories, y=lost, marker_color='#ef4444'))
+    fig.update_layout(barmode='stack', height=400)
+    st.plotly_chart(fig, use_container_width=True)
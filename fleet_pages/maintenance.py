@@ -0,0 +1,94 @@
+"""Maintenance page"""
+import streamlit as st
+import plotly.express as px
+
+import fleet_app
+from fleet_figures import histogram
+from fleet_maintenance import SERVICE_KM, log_service
+from fleet_table import paged_table
+
+VEHICLES = ['Vehicle ID', 'Model', 'Odometer (km)', 'Maintenance Cost (₹)', 'Maintenance CPKM (₹)',
+            'Next Service (days)', 'KM Since Service']
+DRIVERS = []
+
+
+def render(ctx):
+    st.title("Maintenance Management & CPKM")
+    logged = st.session_state.pop("maint_logged", None)
+    if logged:
+        st.toast(logged)
+    df_vehicles = ctx.vehicles
+    kpis = fleet_app.kpis()
+    due = fleet_app.due_index()
+    
+    total_maint_cost = kpis.total_maint_cost()
+    overall_cpkm = kpis.overall_cpkm()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Overall Maint CPKM", f"₹{overall_cpkm:.2f}")
+    with col2:
+        st.metric("Total Maint Cost", f"₹{total_maint_cost/100000:.2f}L")
+    with col3:
+        due_7 = due.count(0, 7)
+        st.metric("Due in 7 Days", due_7)
+    with col4:
+        due_15 = due.count(8, 15)
+        st.metric("Due in 15 Days", due_15)
+    
+    st.subheader("🗓️ Workshop Schedule")
+    horizon = st.slider("Horizon (days)", 7, 60, 30, key="maint_horizon")
+    
+    def workload_figure():
+        load = due.workload(0, horizon)
+        fig = px.bar(x=load.index, y=load.values, labels={'x': 'Date', 'y': 'Services due'})
+        fig.update_traces(marker_color='#f59e0b')
+        fig.update_layout(height=300)
+        return fig
+    st.plotly_chart(ctx.figure("workload", workload_figure, horizon), use_container_width=True)
+    
+    lists = {"Due soon": lambda: due.due_between(0, horizon), "Overdue": due.overdue,
+             f"Over {SERVICE_KM:,} km since service": lambda: due.over_km(SERVICE_KM)}
+    shown = st.radio("Show", list(lists), horizontal=True, key="maint_list")
+    rows = lists[shown]()
+    st.caption(f"{due.count(0, horizon):,} due in the next {horizon} days · {due.count(None, -1):,} overdue")
+    
+    # Log a completed service, then rerun so every figure and table reads it
+    vehicle_ids = df_vehicles['Vehicle ID']
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        serviced = st.selectbox("Vehicle serviced", rows[:fleet_app.SELECT_LIMIT].tolist(),
+                                format_func=lambda p: vehicle_ids.iloc[p], key="maint_serviced")
+    with col2:
+        st.write("")
+        if st.button("✅ Log service", disabled=serviced is None):
+            log_service(ctx.fleet, [serviced])
+            st.session_state["maint_logged"] = f"Service logged for {vehicle_ids.iloc[serviced]}"
+            st.rerun()
+    
+    # Rows arrive in schedule order, so the table needs no sort
+    paged_table(df_vehicles, "maint_due",
+                ['Vehicle ID', 'Model', 'Next Service (days)', 'KM Since Service'], rows=rows, export='vehicles')
+    
+    st.subheader("Maintenance CPKM Distribution")
+    fig = ctx.figure("cpkm_histogram",
+                     lambda: histogram(df_vehicles['Maintenance CPKM (₹)'], 25, '#f59e0b',
+                                       'Maintenance CPKM (₹)'))
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader("🗺️ Maintenance by State")
+    def state_table():
+        _, by_state = fleet_app.shards().aggregate({
+            'Vehicles': ('count', 'Maintenance Cost (₹)'), 'cost': ('sum', 'Maintenance Cost (₹)'),
+            'km': ('sum', 'Odometer (km)'), 'Avg FE (km/L)': ('mean', 'FE (km/L)')})
+        by_state['Maint Cost (₹ L)'] = (by_state['cost'] / 1e5).round(2)
+        by_state['Maint CPKM (₹)'] = (by_state['cost'] / by_state['km']).round(2)
+        by_state['Avg FE (km/L)'] = by_state['Avg FE (km/L)'].round(2)
+        return by_state.drop(columns=['cost', 'km']).sort_values('Maint CPKM (₹)', ascending=False)
+    # Aggregated once per data version, not on every rerun
+    st.dataframe(ctx.figure("maintenance_by_state", state_table), use_container_width=True)
+    
+    st.subheader("Vehicle-wise Maintenance Details")
+    paged_table(df_vehicles, "maint_cpkm",
+                ['Vehicle ID', 'Model', 'Odometer (km)', 'Maintenance Cost (₹)', 'Maintenance CPKM (₹)'],
+                ranking=fleet_app.leaderboard('vehicles', 'Maintenance CPKM (₹)'))
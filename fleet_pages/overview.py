@@ -0,0 +1,132 @@
+"""Fleet Overview page"""
+import numpy as np
+import streamlit as st
+import plotly.express as px
+
+import fleet_app
+from fleet_alerts import CRITICAL, INFO, SEVERITIES, WARNING
+
+VEHICLES = []
+DRIVERS = []
+
+REFRESH_CHOICES = [2, 5, 10, 30, 60]
+
+
+def render(ctx):
+    st.title("Fleet Overview")
+    tel = fleet_app.telemetry()
+    live, every = live_controls()
+
+    # Only these fragments re-run on the live timer; the trend chart below
+    # stays as it was until the next full run
+    st.fragment(run_every=every)(kpi_cards)(ctx)
+
+    # Performance Trends
+    st.subheader("📈 Fleet Performance Trends")
+    view = st.radio("Time Period", ["Daily", "Weekly", "Monthly"], horizontal=True)
+    
+    grain, periods, axis = {"Daily": ('day', 7, 'Day'), "Weekly": ('week', 4, 'Week'),
+                            "Monthly": ('month', 6, 'Month')}[view]
+    trend = tel.series(grain, periods=periods)
+    
+    def trend_figure():
+        fig = px.line(x=trend.index, y=trend['efficiency'].round(2),
+                     labels={'x': axis, 'y': 'Efficiency (km/L)'})
+        fig.update_traces(line_color='#667eea', fill='tozeroy', fillcolor='rgba(102, 126, 234, 0.1)')
+        fig.update_layout(height=350)
+        return fig
+    
+    if trend.empty:
+        st.info("No telemetry yet.")
+    else:
+        st.plotly_chart(ctx.figure("trend", trend_figure, view, tel.version), use_container_width=True)
+    
+    st.fragment(run_every=every)(priority_alerts)(ctx)
+
+
+def live_controls():
+    """Live toggle and refresh interval; returns (live, run_every seconds or None)
+
+    ``?live=1`` (and optionally ``&every=10``) in the URL starts the page in
+    live mode, for a wall display nobody clicks on.
+    """
+    if fleet_app.FLEET_LIVE == 'off':
+        return False, None
+    params = st.query_params
+    if 'live' not in st.session_state:
+        st.session_state.live = params.get('live') == '1'
+        every = int(params.get('every', fleet_app.FLEET_LIVE_INTERVAL))
+        st.session_state.live_every = min(REFRESH_CHOICES, key=lambda c: abs(c - every))
+    col1, col2, _ = st.columns([1, 1, 3])
+    with col1:
+        live = st.toggle("🔴 Live", key="live")
+    with col2:
+        every = st.selectbox("Refresh every (s)", REFRESH_CHOICES, key="live_every",
+                             disabled=not live, label_visibility="collapsed")
+    if not live:
+        return False, None
+    feed = fleet_app.live_feed()
+    if feed.error is not None:
+        st.warning(f"Live feed stopped: {feed.error}")
+    elif feed.rejected:
+        st.caption(f"{feed.rejected:,} live updates rejected, the last: {feed.rejection}")
+    return True, every
+
+
+def kpi_cards(ctx):
+    n_vehicles = ctx.n_vehicles
+    kpis = fleet_app.kpis()
+    tel = fleet_app.telemetry()
+
+    # KPIs: this week against last week, from the weekly rollups
+    weeks = tel.series('week', periods=2)
+    full_weeks = tel.series('week', periods=2, complete=True)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if weeks.empty:
+            # No telemetry yet (history still loading, or FLEET_TELEMETRY_DAYS=0)
+            st.metric("Fleet Average", "–")
+        else:
+            fe_now, fe_prev = weeks['efficiency'].iloc[-1], weeks['efficiency'].iloc[0]
+            st.metric("Fleet Average", f"{fe_now:.1f} km/L",
+                      f"{(fe_now / fe_prev - 1) * 100:+.1f}%" if fe_prev > 0 else None)
+    with col2:
+        if full_weeks.empty:
+            st.metric("Weekly Fuel Cost", "–")
+        else:
+            cost_now, cost_prev = full_weeks['fuel_cost'].iloc[-1], full_weeks['fuel_cost'].iloc[0]
+            cost_delta = f"{'-' if cost_now < cost_prev else '+'}₹{abs(cost_now - cost_prev) / 1e3:,.1f}K"
+            st.metric("Weekly Fuel Cost", f"₹{cost_now / 1e5:,.2f}L",
+                      cost_delta if cost_prev > 0 else None, delta_color="inverse")
+    with col3:
+        active = kpis.active()
+        st.metric("Active Vehicles", f"{active:,}/{n_vehicles:,}")
+    with col4:
+        total_co2 = kpis.total_co2()
+        # Day over day from the rollups: yesterday against the day before
+        days = tel.series('day', periods=2, complete=True)
+        co2_now, co2_prev = (days['co2'].iloc[-1], days['co2'].iloc[0]) if len(days) == 2 else (0, 0)
+        st.metric("Daily CO2", f"{total_co2:.0f} kg",
+                  f"{(co2_now / co2_prev - 1) * 100:+.1f}%" if co2_prev > 0 else None, delta_color="inverse")
+
+    counts = kpis.status_counts()
+    st.caption("  ·  ".join(f"**{status}** {count:,}" for status, count in counts.items()))
+
+
+def priority_alerts(ctx):
+    engine = fleet_app.alerts()
+    vehicle_ids = ctx.fleet.series('vehicles', 'Vehicle ID')
+    cards = {CRITICAL: st.error, WARNING: st.warning, INFO: st.info}
+
+    st.subheader("🚨 Priority Alerts")
+    # One card per kind of alert: the worst vehicle under each of the top three rules
+    top = engine.top_per_rule(3)
+    if not len(top):
+        st.success("**✅ No alerts**\nEvery vehicle is within its rules")
+    for col, position in zip(st.columns(3), top):
+        rule, detail = engine.alert(position)
+        with col:
+            cards[rule.severity](f"**{rule.title}**\n{vehicle_ids.iloc[position]} - {detail}")
+    # Vehicles by the severity of their top alert
+    levels = np.bincount(engine.score.astype(int), minlength=CRITICAL + 1)
+    st.caption("  ·  ".join(f"**{levels[level]:,}** {label}" for level, label in SEVERITIES.items()))
@@ -0,0 +1,45 @@
+"""Micro Training page"""
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+import fleet_app
+from fleet_data import training_in_progress
+
+VEHICLES = []
+DRIVERS = []
+
+
+def render(ctx):
+    st.title("Micro Training & Development")
+    n_drivers = ctx.n_drivers
+    kpis = fleet_app.kpis()
+    
+    col1, col2, col3 = st.columns(3)
+    trained_count = kpis.trained()
+    in_progress = training_in_progress(n_drivers)
+    with col1:
+        st.metric("Available Modules", "24")
+    with col2:
+        st.metric("Completion Rate", f"{trained_count/n_drivers*100:.0f}%")
+    with col3:
+        st.metric("Avg Module Rating", "4.6/5")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Training Status")
+        fig = go.Figure(data=[go.Pie(
+            labels=['Completed', 'In Progress', 'Not Started'],
+            values=[trained_count, in_progress, n_drivers - trained_count - in_progress],
+            marker=dict(colors=['#10b981', '#f59e0b', '#ef4444'])
+        )])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("Module Effectiveness")
+        modules = ['Eco Driving', 'Safety', 'Route Planning', 'Vehicle Care', 'Regulations']
+        ratings = [4.8, 4.6, 4.5, 4.7, 4.4]
+        fig = px.bar(x=modules, y=ratings, color=ratings, color_continuous_scale='Greens')
+        fig.update_layout(yaxis_range=[0, 5])
+        st.plotly_chart(fig, use_container_width=True)
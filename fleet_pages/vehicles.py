@@ -0,0 +1,123 @@
+"""Vehicle Analysis page"""
+import numpy as np
+import streamlit as st
+import plotly.express as px
+
+import fleet_app
+from fleet_alerts import WARNING
+from fleet_data import STATUSES
+from fleet_figures import histogram, range_band
+from fleet_schema import VEHICLE_COLUMNS
+from fleet_table import paged_table
+from fleet_timeseries import WINDOWS, window_days
+
+VEHICLES = VEHICLE_COLUMNS
+DRIVERS = []
+
+
+def render(ctx):
+    st.title("Vehicle Analysis")
+    df_vehicles = ctx.vehicles
+    n_vehicles = ctx.n_vehicles
+    vehicle_sort = fleet_app.sort_index('vehicles')
+    
+    # Sub-tabs
+    tab1, tab2, tab3, tab4, tab5 = ctx.tabs([
+        f"📋 All Vehicles ({n_vehicles:,})",
+        "⭐ Top Performers",
+        "⚠️ Needs Attention",
+        "🔧 Maintenance Due",
+        "📊 Efficiency Analysis"
+    ])
+    
+    with tab1:
+        st.subheader("All Vehicles")
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            search = st.text_input("🔍 Search vehicles...", key="vehicle_search",
+                                   help="Matches vehicle IDs and driver names. End with * for a prefix, e.g. MH-12-*")
+        with col2:
+            statuses = st.multiselect("Status", STATUSES, key="vehicle_status")
+        
+        # Search and filter results are sorted positions, cached per query text
+        index = fleet_app.search()
+        query = fleet_app.query()
+        matches = query.run('vehicle_search', search) if search else None
+        if statuses:
+            in_status = query.where('vehicles', [('Status', 'in', tuple(statuses))])
+            matches = in_status if matches is None else np.intersect1d(matches, in_status, assume_unique=True)
+        n_matches = n_vehicles if matches is None else len(matches)
+        
+        all_columns = ['Vehicle ID', 'Model', 'Status', 'Driver', 'FE (km/L)',
+                       'Odometer (km)', 'Daily Distance (km)']
+        paged_table(df_vehicles, "all_vehicles", all_columns, rows=matches,
+                    sort_index=vehicle_sort, sort_columns=all_columns, sort_by='Vehicle ID', export='vehicles')
+        
+        # Vehicle drill-down: options are row positions, labelled through the index
+        st.markdown("### 🔍 Select Vehicle for Details")
+        options = range(min(n_vehicles, fleet_app.SELECT_LIMIT)) if matches is None else matches[:fleet_app.SELECT_LIMIT].tolist()
+        if n_matches > fleet_app.SELECT_LIMIT:
+            st.caption(f"Showing the first {fleet_app.SELECT_LIMIT:,} of {n_matches:,} vehicles. Search to narrow the list.")
+        selected = st.selectbox("Vehicle ID", options, format_func=index.label, key="veh_detail")
+        
+        if selected is not None:
+            v = df_vehicles.iloc[selected]
+            selected_vehicle = v['Vehicle ID']
+            
+            with st.expander(f"**{selected_vehicle}** - Detailed Analysis", expanded=True):
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("FE", f"{v['FE (km/L)']:.2f} km/L")
+                with col2:
+                    st.metric("Odometer", f"{v['Odometer (km)']:,} km")
+                with col3:
+                    st.metric("Daily Avg", f"{v['Daily Distance (km)']} km")
+                with col4:
+                    st.metric("CO2/Day", f"{v['Daily CO2 (kg)']:.1f} kg")
+                
+                rank = query.rank('vehicles', 'FE (km/L)', selected)
+                st.caption(f"FE rank **#{rank:,}** of {n_vehicles:,}")
+                
+                driver = fleet_app.fleet().rows('drivers', query.driver_of([selected]),
+                                                ['Name', 'Score', 'Efficiency (km/L)', 'Training Complete']).iloc[0]
+                st.caption(f"Driver **{driver['Name']}** · score {driver['Score']} · "
+                           f"{driver['Efficiency (km/L)']:.2f} km/L · "
+                           f"training {'complete' if driver['Training Complete'] else 'pending'}")
+                
+                # Trip FE history, downsampled to the zoom window
+                window = st.radio("History", list(WINDOWS), index=1, horizontal=True, key="veh_window")
+                history = fleet_app.drilldown().vehicle_fe.window(selected, *window_days(window))
+                fig = range_band(history, title="Performance History", y_title="FE (km/L)")
+                st.plotly_chart(fig, use_container_width=True)
+    
+    with tab2:
+        st.subheader("Top 20 Performing Vehicles")
+        def top20_figure():
+            top20 = fleet_app.query().top('vehicles', 'FE (km/L)', 20, ['Vehicle ID', 'FE (km/L)'])
+            fig = px.bar(top20, x='FE (km/L)', y='Vehicle ID', orientation='h',
+                        color='FE (km/L)', color_continuous_scale='Greens')
+            fig.update_layout(height=600)
+            return fig
+        st.plotly_chart(ctx.figure("top20", top20_figure), use_container_width=True)
+    
+    with tab3:
+        st.subheader("Vehicles Requiring Attention")
+        engine = fleet_app.alerts()
+        attention = engine.rows(WARNING)
+        counts = engine.counts()
+        st.dataframe(counts[counts['Vehicles'] > 0], hide_index=True, use_container_width=True)
+        paged_table(df_vehicles, "attention", VEHICLE_COLUMNS, rows=attention,
+                    sort_index=vehicle_sort, sort_columns=VEHICLE_COLUMNS, sort_by='Vehicle ID', export='vehicles')
+        st.warning(f"⚠️ {len(attention):,} vehicles need attention")
+    
+    with tab4:
+        st.subheader("Maintenance Schedule (Next 30 Days)")
+        maint = fleet_app.due_index().due_between(0, 30)
+        paged_table(df_vehicles, "maint_schedule",
+                    ['Vehicle ID', 'Model', 'Next Service (days)', 'KM Since Service'], rows=maint, export='vehicles')
+    
+    with tab5:
+        st.subheader("Efficiency Distribution")
+        fig = ctx.figure("fe_histogram",
+                         lambda: histogram(df_vehicles['FE (km/L)'], 25, '#667eea', 'FE (km/L)'))
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,161 @@
+"""Fleet queries on Arrow's compute kernels.
+
+Pages ask for rankings and filtered rows by query name and parameters
+instead of masking and sorting frames themselves. A query reads only the
+columns it names, as Arrow arrays over the fleet's current memory (numeric
+columns share their buffers, categoricals become dictionary arrays over
+their codes). Filters evaluate their conditions with Arrow's vectorized
+kernels, which release the GIL, and return only row positions; rankings
+use Arrow's top-k selection.
+
+Every query goes through ``run``, which caches results per (query,
+parameters, fleet version), so sessions asking for the same top 20 or
+typing the same search share one run. Other lookups, such as the search
+indexes, are registered with ``prepare`` to get the same cache.
+
+Rankings that pages ask for on every visit can be registered with
+``rank_with`` to a live ``Leaderboard`` (fleet_leaderboard.py), which keeps
+its column in rank order under updates; ``top`` and ``rank`` then read it
+instead of selecting over the whole column after each fleet version.
+
+The vehicle/driver join is indexed. The vehicle ``Driver`` column is
+dictionary-encoded in driver-table order, so a vehicle's code is its
+driver's row. The reverse, each driver's vehicles, is a position list
+grouped by driver with offsets, rebuilt after reassignments.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas.api.types import CategoricalDtype
+
+import fleet_metrics as metrics
+
+CACHE_SIZE = 256        # cached results, across queries and parameters
+OPS = {'>': pc.greater, '>=': pc.greater_equal, '<': pc.less, '<=': pc.less_equal,
+       '==': pc.equal, '!=': pc.not_equal, 'in': lambda column, values: pc.is_in(column, value_set=values)}
+
+
+def _array(values):
+    """A pandas array as one Arrow array, zero-copy where the memory allows"""
+    if hasattr(values, '__arrow_array__'):
+        chunked = values.__arrow_array__()
+        return chunked.chunk(0) if chunked.num_chunks == 1 else chunked.combine_chunks()
+    return pa.array(np.asarray(values))
+
+
+def arrow_column(series):
+    if isinstance(series.dtype, CategoricalDtype):
+        return pa.DictionaryArray.from_arrays(pa.array(series.cat.codes.to_numpy()),
+                                              _array(series.cat.categories.array))
+    return _array(series.array)
+
+
+class FleetQuery:
+    """Cached rankings, filters and vehicle/driver joins over the fleet"""
+
+    def __init__(self, fleet, cache_size=CACHE_SIZE):
+        self.fleet = fleet
+        self.cache_size = cache_size
+        self._prepared = {'top': self._top, 'where': self._where}
+        self._results = OrderedDict()
+        self._leaderboards = {}
+        self._lock = threading.Lock()
+
+    # ---------- running ----------
+    def prepare(self, name, fn):
+        """Register fn(*params) as query name"""
+        self._prepared[name] = fn
+
+    def run(self, name, *params):
+        """Result of query name for params at the current fleet version
+
+        Results are shared between sessions, so callers must not modify them.
+        """
+        key = (name, params, self.fleet.version)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                metrics.count('query_cache_requests_total', query=name, result='hit')
+                return self._results[key]
+        metrics.count('query_cache_requests_total', query=name, result='miss')
+        with metrics.timer('query_seconds', query=name):
+            result = self._prepared[name](*params)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return result
+
+    def rank_with(self, table, column, leaderboard):
+        """Answer rankings on column from the Leaderboard that leaderboard() returns"""
+        self._leaderboards[table, column] = leaderboard
+
+    def leaderboard(self, table, column):
+        """The Leaderboard registered for column, or None"""
+        opener = self._leaderboards.get((table, column))
+        return opener() if opener else None
+
+    def arrow(self, table, columns):
+        """Arrow table of the current values of columns"""
+        return pa.table({c: arrow_column(self.fleet.series(table, c)) for c in columns})
+
+    # ---------- queries ----------
+    def top(self, table, column, k, columns, ascending=False):
+        """Rows with the k largest (smallest if ascending) values of column, in
+        rank order and indexed by position"""
+        return self.run('top', table, column, k, tuple(columns), ascending)
+
+    def where(self, table, conditions, any_of=False):
+        """Sorted positions of rows meeting every condition, or any with any_of
+
+        Conditions are (column, op, value) with op one of >, >=, <, <=, ==,
+        != and in (value a tuple).
+        """
+        return self.run('where', table, tuple(conditions), any_of)
+
+    def rank(self, table, column, position):
+        """1-based rank of a row on a column with a leaderboard (1 is the highest)"""
+        return self.leaderboard(table, column).rank(position)
+
+    def _top(self, table, column, k, columns, ascending):
+        board = self.leaderboard(table, column)
+        if board is not None:
+            best = ascending != board.descending
+            return self.fleet.rows(table, board.top(k) if best else board.bottom(k), list(columns))
+        data = self.arrow(table, [column])
+        order = pc.select_k_unstable(data, k, [(column, 'ascending' if ascending else 'descending')])
+        metrics.count('rows_scanned_total', len(data), op='query_top')
+        return self.fleet.rows(table, order.to_numpy(), list(columns))
+
+    def _where(self, table, conditions, any_of):
+        tests = []
+        for c, op, value in conditions:
+            series = self.fleet.series(table, c)
+            if isinstance(series.dtype, CategoricalDtype):
+                # Categoricals are compared on their codes; comparing labels
+                # would decode every row
+                column = pa.array(series.cat.codes.to_numpy())
+                value = series.cat.categories.get_indexer(list(value) if op == 'in' else [value])
+                value = value if op == 'in' else value[0]
+            else:
+                column = arrow_column(series)
+            # Compare in the column's own type, as numpy does with a Python scalar
+            value = pa.array(value, type=column.type) if op == 'in' else pa.scalar(value, type=column.type)
+            tests.append(OPS[op](column, value))
+        mask = functools.reduce(pc.or_ if any_of else pc.and_, tests)
+        metrics.count('rows_scanned_total', len(mask), op='query_where')
+        return np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+
+    # ---------- vehicle/driver join ----------
+    def driver_of(self, vehicles):
+        """Driver table positions of the drivers of some vehicles"""
+        return self.fleet.series('vehicles', 'Driver').cat.codes.to_numpy()[np.asarray(vehicles)]
+
+    def vehicles_of(self, driver):
+        """Sorted positions of the vehicles assigned to a driver"""
+        order, offsets = self.fleet.groups('vehicles', 'Driver')
+        return np.sort(order[offsets[driver]:offsets[driver + 1]])
@@ -0,0 +1,121 @@
+"""Compact dtype schema for the vehicle and driver tables.
+
+Low-cardinality text is categorical, the vehicle ID is kept as packed
+state/district/series/number fields, and every numeric column uses the
+narrowest dtype that holds its range with headroom for live updates. The
+printable 'Vehicle ID' is derived from the packed fields when a page asks
+for it and is never stored.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+from fleet_data import MODELS, SERIES, STATES, STATUSES, vehicle_ids
+
+VEHICLE_SCHEMA = {
+    'State': CategoricalDtype(STATES),
+    'District': 'int8',
+    'Series': CategoricalDtype(SERIES),
+    'Number': 'int16',
+    'Model': CategoricalDtype(MODELS),
+    'Status': CategoricalDtype(STATUSES),
+    'Driver': 'category',
+    'FE (km/L)': 'float32',
+    'Odometer (km)': 'int32',
+    'Daily Distance (km)': 'int16',
+    'Cost per KM (₹)': 'float32',
+    'Maintenance Cost (₹)': 'int32',
+    'Maintenance CPKM (₹)': 'float32',
+    'Daily CO2 (kg)': 'float32',
+    'Idle Time (min)': 'int16',
+    'Last Service (days)': 'int16',
+    'Next Service (days)': 'int16',
+    'KM Since Service': 'int32',
+}
+
+DRIVER_SCHEMA = {
+    'Name': 'str',
+    'Score': 'int8',
+    'Efficiency (km/L)': 'float32',
+    'Total Trips': 'int16',
+    'Violations': 'int8',
+    'Experience (years)': 'int8',
+    'Training Complete': 'bool',
+}
+
+# Columns computed on read from stored ones: name -> (inputs, builder)
+DERIVED_VEHICLE_COLUMNS = {
+    'Vehicle ID': (
+        ['State', 'District', 'Series', 'Number'],
+        lambda df: vehicle_ids(df['State'].cat.codes.to_numpy(), df['District'].to_numpy(),
+                               df['Number'].to_numpy(), df['Series'].cat.codes.to_numpy()),
+    ),
+}
+
+# The columns pages show, in the order the dashboard has always used
+VEHICLE_COLUMNS = ['Vehicle ID', 'Model', 'Status', 'Driver', 'FE (km/L)', 'Odometer (km)',
+                   'Daily Distance (km)', 'Cost per KM (₹)', 'Maintenance Cost (₹)',
+                   'Maintenance CPKM (₹)', 'Daily CO2 (kg)', 'Idle Time (min)',
+                   'Last Service (days)', 'Next Service (days)', 'KM Since Service']
+DRIVER_COLUMNS = list(DRIVER_SCHEMA)
+
+
+def apply_schema(df, schema):
+    """Cast df to schema, refusing any narrowing that would change a value"""
+    out = {}
+    for col, dtype in schema.items():
+        s = df[col]
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if isinstance(dtype, CategoricalDtype) and dtype.categories is None:
+            out[col] = s if isinstance(s.dtype, CategoricalDtype) else s.astype('category')
+            continue
+        if dtype.kind in 'iu' and len(s):
+            info = np.iinfo(dtype)
+            if s.min() < info.min or s.max() > info.max:
+                raise ValueError(f"{col!r} spans {s.min()}..{s.max()}, which does not fit {dtype}")
+        cast = s.astype(dtype)
+        if isinstance(dtype, CategoricalDtype) and cast.isna().sum() > s.isna().sum():
+            raise ValueError(f"{col!r} has values outside its categories")
+        out[col] = cast
+    return pd.DataFrame(out)
+
+
+def compact_vehicles(df):
+    return apply_schema(df, VEHICLE_SCHEMA)
+
+
+def compact_drivers(df):
+    return apply_schema(df, DRIVER_SCHEMA)
+
+
+def derive_vehicle_column(name, inputs):
+    """Build a derived column from a frame holding its input columns"""
+    columns, build = DERIVED_VEHICLE_COLUMNS[name]
+    return build(inputs[columns]).to_pandas().rename(name)
+
+
+# ==================== MEMORY REPORT ====================
+def memory_report(df):
+    """Bytes per column, largest first, including string and category payloads"""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'bytes': usage,
+        'bytes/row': (usage / max(len(df), 1)).round(2),
+    })
+    return report.sort_values('bytes', ascending=False)
+
+
+def page_memory_report(vehicle_report, driver_report, page_data):
+    """Bytes each page maps in, from per-column reports of both tables
+
+    ``page_data`` maps page label -> {'vehicles': [...], 'drivers': [...]},
+    as returned by ``fleet_pages.page_data()``.
+    """
+    rows = []
+    for page, tables in page_data.items():
+        v = vehicle_report.reindex(tables['vehicles'])['bytes'].sum()
+        d = driver_report.reindex(tables['drivers'])['bytes'].sum()
+        rows.append({'page': page, 'vehicle bytes': int(v), 'driver bytes': int(d),
+                     'total bytes': int(v + d)})
+    return pd.DataFrame(rows).set_index('page')
@@ -0,0 +1,153 @@
+"""As-you-type search over vehicle IDs and driver names.
+
+``NgramIndex`` keeps a trigram posting list for a column of short ASCII
+strings plus a sorted copy of the strings. A substring query takes the
+rarest trigram's postings as candidates and verifies them against the packed
+byte matrix. Queries under three characters scan the matrix instead. A
+prefix query ("MH-12-*") is two binary searches over the sorted copy.
+Neither copies the frame, and both return row positions.
+"""
+import numpy as np
+
+import fleet_metrics as metrics
+
+MIN_GRAM = 3
+FEW_DRIVERS = 64
+
+
+def _byte_matrix(strings):
+    """Upper-cased, NUL-padded fixed-width bytes: one row per string"""
+    fixed = np.char.upper(np.asarray(strings, dtype=object).astype(bytes))
+    width = max(fixed.dtype.itemsize, 1)
+    return fixed, fixed.view(np.uint8).reshape(len(fixed), width)
+
+
+class NgramIndex:
+    """Substring and prefix index over one column of strings"""
+
+    def __init__(self, strings):
+        self.fixed, self.bytes = _byte_matrix(strings)
+        n, width = self.bytes.shape
+        # Byte j of every string, contiguous, so a scan reads each column once
+        self.columns = [np.ascontiguousarray(self.bytes[:, j]) for j in range(width)]
+        self.order = np.argsort(self.fixed, kind='stable')
+        self.sorted = self.fixed[self.order]
+
+        # Trigram code of every (row, offset), NUL padding excluded
+        b = self.bytes.astype(np.int64)
+        grams = (b[:, :-2] << 16) | (b[:, 1:-1] << 8) | b[:, 2:] if width >= MIN_GRAM \
+            else np.empty((n, 0), dtype=np.int64)
+        valid = (self.bytes[:, 2:] != 0) if width >= MIN_GRAM else np.empty((n, 0), dtype=bool)
+        rows = np.broadcast_to(np.arange(n, dtype=np.int64)[:, None], grams.shape)
+        pairs = np.sort((grams[valid] << 32) | rows[valid])
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]     # a gram repeated in one string
+        codes = pairs >> 32
+        self.postings = (pairs & 0xFFFFFFFF).astype(np.int32)
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        self.grams = codes[starts]
+        self.offsets = np.append(starts, len(codes))
+
+    def __len__(self):
+        return len(self.fixed)
+
+    def _posting(self, gram):
+        i = np.searchsorted(self.grams, gram)
+        if i == len(self.grams) or self.grams[i] != gram:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def _contains(self, rows, needle):
+        """Which of rows (None for all) hold needle, comparing one byte column at a time"""
+        cols = self.columns if rows is None else [c[rows] for c in self.columns]
+        k = len(needle)
+        hit = np.zeros(len(cols[0]), dtype=bool)
+        for o in range(len(cols) - k + 1):
+            m = cols[o] == needle[0]
+            for j in range(1, k):
+                m &= cols[o + j] == needle[j]
+            hit |= m
+        return hit
+
+    def contains(self, text):
+        """Sorted positions of strings containing text, case-insensitively"""
+        needle = np.frombuffer(text.upper().encode('ascii', 'replace'), dtype=np.uint8)
+        if len(needle) == 0:
+            return np.arange(len(self))
+        if len(needle) < MIN_GRAM:
+            metrics.count('rows_scanned_total', len(self), op='search')
+            return np.flatnonzero(self._contains(None, needle))
+        n = needle.astype(np.int64)
+        grams = (n[:-2] << 16) | (n[1:-1] << 8) | n[2:]
+        # The rarest trigram bounds the candidates; verifying them is cheaper
+        # than intersecting with the common grams ('TRK' is in every ID)
+        rows = min((self._posting(g) for g in np.unique(grams)), key=len)
+        if len(needle) == MIN_GRAM:
+            return rows.astype(np.int64)
+        if len(rows) > len(self) // 8:
+            metrics.count('rows_scanned_total', len(self), op='search')
+            return np.flatnonzero(self._contains(None, needle))
+        metrics.count('rows_scanned_total', len(rows), op='search')
+        return rows[self._contains(rows, needle)].astype(np.int64)
+
+    def prefix(self, text):
+        """Sorted positions of strings starting with text, case-insensitively"""
+        key = text.upper().encode('ascii', 'replace')
+        lo = np.searchsorted(self.sorted, key, side='left')
+        hi = np.searchsorted(self.sorted, key + b'\xff', side='left')
+        return np.sort(self.order[lo:hi]).astype(np.int64)
+
+    def search(self, query):
+        """'MH-12-*' is a prefix search, anything else a substring search"""
+        query = query.strip()
+        if query.endswith('*'):
+            return self.prefix(query.rstrip('*'))
+        return self.contains(query)
+
+
+class FleetSearch:
+    """Search vehicles by ID or by the name of their driver"""
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self.ids = fleet.vehicles(['Vehicle ID'])['Vehicle ID']
+        self.id_index = NgramIndex(self.ids.to_numpy())
+        drivers = fleet.vehicles(['Driver'])['Driver']
+        self.driver_names = drivers.cat.categories
+        self.driver_index = NgramIndex(self.driver_names.to_numpy())
+        # Vehicles grouped by driver, kept by the fleet and rebuilt after reassignments
+        fleet.groups('vehicles', 'Driver')
+
+    def search(self, query):
+        """Sorted vehicle positions whose ID or driver name matches query"""
+        if not query.strip():
+            return np.arange(len(self.id_index))
+        by_id = self.id_index.search(query)
+        drivers = self.driver_index.search(query)
+        if len(drivers) == 0:
+            return by_id
+        if len(drivers) <= FEW_DRIVERS:
+            order, offsets = self.fleet.groups('vehicles', 'Driver')
+            by_driver = np.concatenate([order[offsets[d]:offsets[d + 1]] for d in drivers])
+            return np.union1d(by_id, by_driver)
+        # Broad queries ("driver") match most of the roster: one gather beats the slices
+        wanted = np.zeros(len(self.driver_index), dtype=bool)
+        wanted[drivers] = True
+        hit = wanted[self.fleet.vehicles(['Driver'])['Driver'].cat.codes.to_numpy()]
+        hit[by_id] = True
+        return np.flatnonzero(hit)
+
+    def label(self, position):
+        return self.ids.iat[position]
+
+    def drivers(self, query):
+        """Sorted driver table positions whose name matches query
+
+        The ``Driver`` categories are the driver roster in table order, so
+        positions in the name index are driver positions.
+        """
+        if not query.strip():
+            return np.arange(len(self.driver_index))
+        return self.driver_index.search(query)
+
+    def driver_label(self, position):
+        return self.driver_names[position]
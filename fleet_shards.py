@@ -0,0 +1,191 @@
+"""State-sharded aggregation over a process pool.
+
+``ShardedFleet`` reorders the vehicle table by ``State`` once and copies
+the numeric columns it aggregates, in that order, into shared memory. Each
+state's rows are then a contiguous range, split further so there are a few
+tasks per worker. A worker process maps the segments once at start-up (no
+data is pickled per task), reduces its ranges to partial sums, counts,
+extremes or histogram counts, and the parent merges the partials. Because
+every task covers a single state, the per-state breakdown comes out of the
+same merge at no extra cost.
+
+With one worker the same tasks run in-process over ordinary arrays. Fleet
+updates are written through to the shared copy, so the workers never go
+stale; writes and aggregations take the same lock, so an aggregate sees
+each update whole or not at all.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+import fleet_metrics as metrics
+
+COLUMNS = ['Daily CO2 (kg)', 'FE (km/L)', 'Maintenance Cost (₹)', 'Odometer (km)',
+           'Idle Time (min)', 'Daily Distance (km)']
+KINDS = ('sum', 'count', 'mean', 'min', 'max', 'hist')
+MIN_TASK_ROWS = 50_000
+TASKS_PER_WORKER = 4
+
+
+def _partial(arrays, start, stop, specs):
+    """Partial aggregates of rows [start, stop) for every spec"""
+    out = {}
+    for name, (kind, column, *args) in specs.items():
+        v = arrays[column][start:stop]
+        if kind == 'sum':
+            out[name] = float(v.sum(dtype=np.float64))
+        elif kind == 'count':
+            out[name] = stop - start
+        elif kind == 'mean':
+            out[name] = (float(v.sum(dtype=np.float64)), stop - start)
+        elif kind == 'min':
+            out[name] = float(v.min()) if len(v) else np.inf
+        elif kind == 'max':
+            out[name] = float(v.max()) if len(v) else -np.inf
+        else:
+            out[name] = np.histogram(v, bins=args[0])[0]
+    return out
+
+
+def _merge(kind, a, b):
+    if kind == 'mean':
+        return a[0] + b[0], a[1] + b[1]
+    if kind == 'min':
+        return min(a, b)
+    if kind == 'max':
+        return max(a, b)
+    return a + b
+
+
+def _finish(kind, value):
+    if kind == 'mean':
+        return value[0] / value[1] if value[1] else np.nan
+    return value
+
+
+# ---------- worker processes ----------
+_worker_arrays = {}
+_worker_segments = []
+
+
+def _attach(layout):
+    """Pool initializer: map every shared column once"""
+    for column, (name, dtype, n) in layout.items():
+        # Pool workers share the parent's resource tracker, which unlinks
+        # the segments only if the parent never does
+        shm = SharedMemory(name=name)
+        _worker_segments.append(shm)
+        _worker_arrays[column] = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+
+
+def _run(task):
+    start, stop, specs = task
+    return _partial(_worker_arrays, start, stop, specs)
+
+
+class ShardedFleet:
+    """Vehicle columns grouped by state, aggregated in shards"""
+
+    def __init__(self, fleet, columns=COLUMNS, workers=1):
+        self.fleet, self.columns, self.workers = fleet, list(columns), workers
+        self._lock = threading.Lock()
+        state = fleet.series('vehicles', 'State')
+        codes = state.cat.codes.to_numpy()
+        self.states = list(state.cat.categories)
+        self.order = np.argsort(codes, kind='stable')
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+        bounds = np.searchsorted(codes[self.order], np.arange(len(self.states) + 1))
+        self.tasks = self._tasks(bounds)
+        self.segments, self.arrays = [], {}
+        with metrics.timer('shards_build_seconds'):
+            for column in self.columns:
+                values = fleet.series('vehicles', column).to_numpy()[self.order]
+                self.arrays[column] = self._share(values) if workers > 1 else values
+        self.pool = None
+        if workers > 1:
+            layout = {c: (s.name, self.arrays[c].dtype.str, len(self.order))
+                      for c, s in zip(self.columns, self.segments)}
+            self.pool = ProcessPoolExecutor(workers, mp_context=get_context('spawn'),
+                                            initializer=_attach, initargs=(layout,))
+        atexit.register(self.close)
+        fleet.subscribe('vehicles', self.columns, self.apply)
+
+    def _tasks(self, bounds):
+        """(state index, start, stop) ranges, a few per worker, none crossing a state"""
+        size = max(MIN_TASK_ROWS, -(-len(self.order) // (self.workers * TASKS_PER_WORKER)))
+        return [(s, lo, min(lo + size, bounds[s + 1]))
+                for s in range(len(self.states)) for lo in range(bounds[s], bounds[s + 1], size)]
+
+    def _share(self, values):
+        shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+        self.segments.append(shm)
+        shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+        shared[:] = values
+        return shared
+
+    def apply(self, positions, before, after):
+        """Fleet listener: write changed values through to the sharded copy"""
+        rows = self.rank[positions]
+        with self._lock:
+            for column, values in self.arrays.items():
+                if column in after:
+                    values[rows] = after[column].to_numpy()
+
+    def aggregate(self, specs):
+        """Fleet totals and per-state values for specs {name: (kind, column[, bins])}
+
+        Kinds are sum, count, mean, min, max and hist (with bin edges). Returns
+        (totals dict, DataFrame indexed by state); histograms are arrays of
+        counts, one per state in an object column.
+        """
+        for kind, column, *_ in specs.values():
+            if kind not in KINDS or column not in self.arrays:
+                raise ValueError(f"can't aggregate {kind!r} of {column!r}")
+        jobs = [(lo, hi, specs) for _, lo, hi in self.tasks]
+        with metrics.timer('sharded_aggregate_seconds', workers=self.workers):
+            # Held while the shards are read, in-process or by the workers, so
+            # an update is never seen half-written
+            with self._lock:
+                if self.pool is None:
+                    parts = [_partial(self.arrays, *job) for job in jobs]
+                else:
+                    parts = list(self.pool.map(_run, jobs))
+        metrics.count('rows_scanned_total', len(self.order), op='sharded_aggregate')
+
+        by_state = {}
+        for (s, _, _), part in zip(self.tasks, parts):
+            merged = by_state.get(s)
+            by_state[s] = part if merged is None else {
+                name: _merge(specs[name][0], merged[name], value) for name, value in part.items()}
+        totals = {}
+        for merged in by_state.values():
+            for name, value in merged.items():
+                totals[name] = value if name not in totals else _merge(specs[name][0], totals[name], value)
+        table = pd.DataFrame([{name: _finish(specs[name][0], v) for name, v in by_state[s].items()}
+                              for s in sorted(by_state)],
+                             index=pd.Index([self.states[s] for s in sorted(by_state)], name='State'))
+        return {name: _finish(specs[name][0], v) for name, v in totals.items()}, table
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+        if self.segments:
+            self.arrays = {}        # release the views before closing the segments
+        for shm in self.segments:
+            shm.close()
+            shm.unlink()
+        self.segments = []
+
+
+def default_workers():
+    """FLEET_AGG_WORKERS, where 0 means one per CPU"""
+    workers = int(os.environ.get('FLEET_AGG_WORKERS', 1))
+    return workers if workers > 0 else os.cpu_count() or 1
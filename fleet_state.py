@@ -0,0 +1,120 @@
+"""Versioned, writable fleet over the read-only store.
+
+The store hands out read-only views onto memory-mapped files. Fleet sits in
+front of it: a column is copied into process memory the first time a row in
+it changes, every change bumps ``version``, and listeners (KPI views, indexes)
+get the changed rows before and after so they can update incrementally
+instead of rescanning the table.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+
+class Fleet:
+    """Vehicle and driver tables with change notification"""
+
+    def __init__(self, store):
+        self.store = store
+        self.version = 0
+        self._owned = {'vehicles': {}, 'drivers': {}}
+        self._groups = {}       # (table, column) -> (order, offsets), dropped when the column changes
+        self._listeners = []
+        self._lock = threading.RLock()
+
+    @property
+    def n_vehicles(self):
+        return self.store.n_vehicles
+
+    @property
+    def n_drivers(self):
+        return self.store.n_drivers
+
+    # ---------- reading ----------
+    def series(self, table, column):
+        owned = self._owned[table].get(column)
+        if owned is None:
+            return self.store.series(table, column)
+        values, dtype = owned
+        if isinstance(dtype, CategoricalDtype):
+            values = pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+        return pd.Series(values, name=column, copy=False)
+
+    def load(self, table, columns=None):
+        columns = self.store.columns(table) if columns is None else list(columns)
+        return pd.DataFrame({c: self.series(table, c) for c in columns}, copy=False)
+
+    def vehicles(self, columns=None):
+        return self.load('vehicles', columns)
+
+    def drivers(self, columns=None):
+        return self.load('drivers', columns)
+
+    def groups(self, table, column):
+        """Row positions grouped by a categorical column's code: the rows with
+        code c are order[offsets[c]:offsets[c + 1]], in position order"""
+        with self._lock:
+            grouped = self._groups.get((table, column))
+            if grouped is None:
+                s = self.series(table, column)
+                codes = s.cat.codes.to_numpy()
+                order = np.argsort(codes, kind='stable')
+                counts = np.bincount(codes, minlength=len(s.cat.categories))
+                grouped = self._groups[table, column] = order, np.concatenate([[0], np.cumsum(counts)])
+            return grouped
+
+    def rows(self, table, positions, columns):
+        """Snapshot of some rows, indexed by position"""
+        positions = np.asarray(positions)
+        return pd.DataFrame({c: self.series(table, c).take(positions).set_axis(positions)
+                             for c in columns})
+
+    # ---------- writing ----------
+    def subscribe(self, table, columns, callback):
+        """Call callback(positions, before, after) when any of columns change"""
+        with self._lock:
+            self._listeners.append((table, list(columns), callback))
+
+    def _writable(self, table, column):
+        """The owned array behind a column, copied out of the store on first write"""
+        owned = self._owned[table].get(column)
+        if owned is None:
+            s = self.store.series(table, column)
+            if isinstance(s.dtype, CategoricalDtype):
+                owned = (s.cat.codes.to_numpy().copy(), s.dtype)
+            else:
+                owned = (s.to_numpy().copy(), s.dtype)
+            self._owned[table][column] = owned
+        return owned
+
+    def update(self, table, positions, changes):
+        """Write new values for some rows and notify listeners
+
+        ``changes`` maps column name to one value per position. Categorical
+        columns take labels; unknown labels raise ValueError. Every column is
+        checked before any is written, so a bad change leaves the table as it was.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if len(np.unique(positions)) != len(positions):
+            raise ValueError("positions must be unique")
+        with self._lock:
+            encoded = []
+            for column, values in changes.items():
+                array, dtype = self._writable(table, column)
+                if isinstance(dtype, CategoricalDtype):
+                    values = dtype.categories.get_indexer(pd.Index(np.atleast_1d(values)))
+                    if (values < 0).any():
+                        raise ValueError(f"unknown {column!r} value in {changes[column]!r}")
+                encoded.append((array, np.broadcast_to(np.asarray(values, dtype=array.dtype), positions.shape)))
+            listeners = [(cols, cb) for t, cols, cb in self._listeners
+                         if t == table and set(cols) & set(changes)]
+            before = [self.rows(table, positions, cols) for cols, _ in listeners]
+            for array, values in encoded:
+                array[positions] = values
+            for column in changes:
+                self._groups.pop((table, column), None)
+            self.version += 1
+            for (cols, callback), old in zip(listeners, before):
+                callback(positions, old, self.rows(table, positions, cols))
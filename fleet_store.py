@@ -0,0 +1,137 @@
+"""Columnar on-disk fleet store.
+
+Each table is one uncompressed Arrow IPC file written as a single record
+batch, so every column is a contiguous buffer on disk. Opening a table
+memory-maps the file and reads nothing; a page that asks for two columns only
+faults in the pages behind those two buffers. Numeric columns come back as
+read-only NumPy views straight onto the map, which makes restarts close to
+free and lets the fleet be larger than RAM.
+"""
+import os
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+import fleet_metrics as metrics
+from fleet_data import make_drivers, make_vehicles
+from fleet_schema import DERIVED_VEHICLE_COLUMNS, compact_drivers, compact_vehicles, derive_vehicle_column
+
+TABLES = ('vehicles', 'drivers')
+FORMAT = 2          # bump whenever the on-disk schema changes
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fleet_store')
+
+
+class FleetStore:
+    """Memory-mapped vehicle and driver tables for one (size, seed) fleet"""
+
+    def __init__(self, root, n_vehicles, n_drivers, seed):
+        self.path = os.path.join(root, f"v{n_vehicles}-d{n_drivers}-s{seed}-f{FORMAT}")
+        self.n_vehicles, self.n_drivers, self.seed = n_vehicles, n_drivers, seed
+        self._tables = {}
+        self._series = {}
+        self._lock = threading.Lock()
+
+    # ---------- building ----------
+    def exists(self):
+        return all(os.path.exists(self._file(t)) for t in TABLES)
+
+    def build(self):
+        """Generate the fleet and write it; the directory appears atomically"""
+        root = os.path.dirname(self.path)
+        os.makedirs(root, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=root, prefix='.build-')
+        try:
+            os.chmod(tmp, 0o755)
+            with metrics.timer('generate_seconds', table='vehicles'):
+                vehicles = compact_vehicles(make_vehicles(self.n_vehicles, self.seed, self.n_drivers))
+            with metrics.timer('generate_seconds', table='drivers'):
+                drivers = compact_drivers(make_drivers(self.n_drivers, self.seed))
+            frames = {'vehicles': vehicles, 'drivers': drivers}
+            for name, df in frames.items():
+                write_table(os.path.join(tmp, f"{name}.arrow"), df)
+            try:
+                os.rename(tmp, self.path)
+            except OSError:
+                # Another process finished the same build first
+                if not self.exists():
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def ensure(self):
+        if not self.exists():
+            self.build()
+        return self
+
+    # ---------- reading ----------
+    def _file(self, table):
+        return os.path.join(self.path, f"{table}.arrow")
+
+    def table(self, table):
+        """The memory-mapped Arrow table; opening it reads no column data"""
+        with self._lock:
+            if table not in self._tables:
+                source = pa.memory_map(self._file(table), 'r')
+                self._tables[table] = pa.ipc.open_file(source).read_all()
+            return self._tables[table]
+
+    def columns(self, table):
+        """Stored columns plus the ones derived on read"""
+        derived = list(DERIVED_VEHICLE_COLUMNS) if table == 'vehicles' else []
+        return derived + self.table(table).column_names
+
+    def series(self, table, column):
+        """One column as a pandas Series, zero-copy where Arrow allows it"""
+        key = (table, column)
+        with self._lock:
+            cached = self._series.get(key)
+        if cached is not None:
+            metrics.count('store_column_requests_total', table=table, result='hit')
+            return cached
+        metrics.count('store_column_requests_total', table=table, result='miss')
+        with metrics.timer('store_column_load_seconds', table=table):
+            if table == 'vehicles' and column in DERIVED_VEHICLE_COLUMNS:
+                inputs = self.load(table, DERIVED_VEHICLE_COLUMNS[column][0])
+                s = derive_vehicle_column(column, inputs)
+            else:
+                s = to_series(self.table(table).column(column), column)
+        with self._lock:
+            return self._series.setdefault(key, s)
+
+    def load(self, table, columns=None):
+        """DataFrame of just the requested columns (all of them when None)"""
+        columns = self.columns(table) if columns is None else list(columns)
+        data = {c: self.series(table, c) for c in columns}
+        return pd.DataFrame(data, copy=False)
+
+    def vehicles(self, columns=None):
+        return self.load('vehicles', columns)
+
+    def drivers(self, columns=None):
+        return self.load('drivers', columns)
+
+
+def write_table(path, df):
+    """Write df as one uncompressed record batch so columns stay contiguous"""
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+def to_series(column, name):
+    """Convert an Arrow column, viewing numeric buffers instead of copying"""
+    if (column.num_chunks == 1 and column.null_count == 0
+            and (pa.types.is_integer(column.type) or pa.types.is_floating(column.type))):
+        values = column.chunk(0).to_numpy(zero_copy_only=True)
+        return pd.Series(values, name=name, copy=False)
+    return column.to_pandas().rename(name)
+
+
+def open_store(n_vehicles, n_drivers, seed, root=None):
+    """Open the store for this fleet, building it on first use"""
+    root = root or os.environ.get('FLEET_STORE_DIR', DEFAULT_ROOT)
+    return FleetStore(root, n_vehicles, n_drivers, seed).ensure()
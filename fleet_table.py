@@ -0,0 +1,148 @@
+"""Server-side paginated tables.
+
+``st.dataframe`` ships every row it is given to the browser, so large tables
+are sorted and filtered here and only the visible page is sent. Sort orders
+come from ``SortIndex``, which argsorts a column once per data version and
+reuses the permutation for every page, direction and filter. A table can
+also offer its whole view, filtered and in order, as an export that a
+background worker streams to a file (fleet_export.py).
+"""
+import threading
+
+import numpy as np
+import streamlit as st
+
+import fleet_metrics as metrics
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+class SortIndex:
+    """Cached argsort of each column of one fleet table"""
+
+    def __init__(self, fleet, table):
+        self.fleet, self.table = fleet, table
+        self._orders = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, column):
+        version = self.fleet.version
+        with self._lock:
+            entry = self._orders.get(column)
+        if entry is None or entry[0] != version:
+            s = self.fleet.series(self.table, column)
+            metrics.count('rows_scanned_total', len(s), op='sort_build')
+            values = s.cat.codes.to_numpy() if s.dtype == 'category' else s.to_numpy()
+            order = np.argsort(values, kind='stable')
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            entry = (version, order, rank)
+            with self._lock:
+                self._orders[column] = entry
+        return entry
+
+    def order(self, column, ascending=True, rows=None):
+        """Positions in sort order, restricted to rows (a position array) when given"""
+        _, order, rank = self._entry(column)
+        if rows is not None:
+            rows = np.asarray(rows)
+            if len(rows) < len(order) // 16:
+                # Few rows: sort their ranks rather than walk the whole permutation
+                metrics.count('rows_scanned_total', len(rows), op='sort')
+                order = rows[np.argsort(rank[rows], kind='stable')]
+            else:
+                metrics.count('rows_scanned_total', len(order), op='sort')
+                keep = np.zeros(len(order), dtype=bool)
+                keep[rows] = True
+                order = order[keep[order]]
+        return order if ascending else order[::-1]
+
+
+def paged_table(df, key, columns=None, rows=None, sort_index=None, sort_columns=None,
+                sort_by=None, ascending=True, page_size=50, height=400, ranking=None, export=None):
+    """Render one page of df[rows], sorted server-side; returns the page's positions
+
+    ``rows`` is an array of positions into df (None for every row). The sort
+    column and direction start at sort_by/ascending and can be changed by the
+    user when sort_columns are given. A ``ranking`` (a Leaderboard) orders the
+    whole table by rank instead, reading just the page's slice. ``export``
+    names the fleet table df comes from to offer the view as a download.
+    """
+    columns = list(df.columns) if columns is None else columns
+    total = len(df) if rows is None else len(rows)
+
+    controls = st.columns([3, 2, 2, 2])
+    if sort_index is not None and sort_columns:
+        with controls[0]:
+            sort_by = st.selectbox("Sort by", sort_columns, index=sort_columns.index(sort_by),
+                                   key=f"{key}_sort")
+        with controls[1]:
+            ascending = st.radio("Order", ["Ascending", "Descending"],
+                                 index=0 if ascending else 1, horizontal=True,
+                                 key=f"{key}_order") == "Ascending"
+    with controls[2]:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(page_size),
+                                 key=f"{key}_size")
+    pages = max(1, -(-total // page_size))
+    with controls[3]:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1,
+                               step=1, key=f"{key}_page")
+    page = min(page, pages)
+
+    def ordered(start, stop):
+        """Positions of the view's rows start..stop-1"""
+        if ranking is not None and rows is None:
+            return ranking.slice(start, stop)
+        if sort_index is not None and sort_by is not None:
+            return sort_index.order(sort_by, ascending, rows)[start:stop]
+        if rows is not None:
+            return np.asarray(rows)[start:stop]
+        return np.arange(start, stop)
+
+    start, stop = (page - 1) * page_size, min(page * page_size, total)
+    positions = ordered(start, stop)
+
+    view = df.iloc[positions][columns]
+    for col in view.columns:
+        if view[col].dtype == 'category':
+            # Arrow ships the whole dictionary: keep only this page's labels
+            view[col] = view[col].cat.remove_unused_categories()
+    metrics.count('rows_sent_total', len(view), table=key)
+    st.dataframe(view, use_container_width=True, height=height)
+    st.caption(f"Rows {start + 1 if total else 0:,}–{stop:,} of {total:,}")
+    if export is not None:
+        export_menu(key, export, columns, lambda: ordered(0, total))
+    return positions
+
+
+def export_menu(key, table, columns, positions):
+    """Export controls for a table view; positions() gives all its rows in order"""
+    import fleet_app
+    from fleet_export import FORMATS
+    exporter = fleet_app.exporter()
+    with st.expander("⬇️ Export"):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            fmt = st.radio("Format", list(FORMATS), horizontal=True, key=f"{key}_export_format")
+        with col2:
+            if st.button("Export", key=f"{key}_export"):
+                st.session_state[f"{key}_export_job"] = exporter.submit(table, positions(), columns, fmt, key).key
+        job = exporter.job(st.session_state.get(f"{key}_export_job"))
+        if job is not None:
+            # Poll while the worker writes; the whole page reruns once when it's done
+            running = job.state in ('queued', 'running')
+            st.fragment(run_every=1 if running else None)(export_status)(key, job, running)
+
+
+def export_status(key, job, running):
+    if job.state in ('queued', 'running'):
+        st.progress(job.progress, text=f"Exporting {job.done:,} of {job.total:,} rows…")
+    elif running:
+        st.rerun()
+    elif job.state == 'failed':
+        st.error(f"Export failed: {job.error}")
+    else:
+        size = f"{job.size / 2**20:,.1f} MiB" if job.size >= 2**20 else f"{job.size / 2**10:,.0f} KiB"
+        st.download_button(f"Download {job.file_name} ({size}, {job.seconds:.1f}s)",
+                           job.open, file_name=job.file_name, mime=job.mime,
+                           key=f"{key}_download", on_click="ignore")
@@ -0,0 +1,480 @@
+"""Streaming trip and fuel telemetry with incremental time-bucketed rollups.
+
+Events are NumPy records (``EVENT_DTYPE``) arriving in batches from a
+source: the seeded ``replay()`` generator, a CSV file (``read_csv``) or a
+TCP socket sending CSV lines (``read_socket``). ``Rollups.ingest`` folds a
+batch into per-day, per-week and per-month sums for the whole fleet, and
+into per-entity sums at the grains listed in ``RETENTION``, with one
+scatter-add per rollup, so ingesting never revisits old events and the
+trend charts read a handful of buckets instead of scanning history.
+
+Per-entity buckets are dense float32 arrays allocated when a bucket first
+receives an event and dropped once they fall out of ``RETENTION``. Each
+costs 28 bytes per entity (28 MB per million), so retention is short:
+every grain per vehicle and per driver is kept, the forecasts' 13 weeks per
+vehicle the longest, about 1 GB in all at 1M vehicles and their drivers.
+``ENTITY_BYTES_LIMIT`` caps the total. The fleet-wide series keep longer
+windows at every grain. Ratios (km/L, average trip score) and derived
+totals (CO2, fuel cost) are computed from the sums on read.
+"""
+import datetime
+import io
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+import fleet_metrics as metrics
+from fleet_data import DEFAULT_SEED
+
+EVENT_DTYPE = np.dtype([
+    ('ts', 'i8'),           # epoch seconds, UTC
+    ('kind', 'i1'),         # TRIP or FUEL
+    ('vehicle', 'i4'),      # row position in the vehicle table
+    ('driver', 'i4'),       # row position in the driver roster
+    ('distance', 'f4'),     # km (trips)
+    ('fuel', 'f4'),         # litres burnt (trips) or filled (fuel)
+    ('idle', 'f4'),         # minutes (trips)
+    ('score', 'f4'),        # 0-100 driving score (trips)
+    ('cost', 'f4'),         # ₹ paid (fuel)
+])
+FIELDS = list(EVENT_DTYPE.names)
+TRIP, FUEL = 0, 1
+
+MEASURES = ['trips', 'distance', 'fuel_used', 'idle', 'score_sum', 'fills', 'fuel_cost']
+DERIVED = ['efficiency', 'avg_score', 'idle_per_trip', 'co2']       # computed from MEASURES on read
+GRAINS = ('day', 'week', 'month')
+KINDS = ('vehicle', 'driver')
+RETENTION = {       # per-entity buckets kept, by (grain, kind); 36 per vehicle-and-driver pair
+    ('day', 'vehicle'): 7, ('week', 'vehicle'): 13, ('month', 'vehicle'): 3,
+    ('day', 'driver'): 7, ('week', 'driver'): 4, ('month', 'driver'): 2,
+}
+FLEET_RETENTION = {'day': 400, 'week': 104, 'month': 60}    # buckets kept fleet-wide
+ENTITY_BYTES_LIMIT = 1 << 30    # per-entity buckets at full retention
+
+DAY = 86_400
+CO2_PER_LITRE = 2.68        # kg CO2 per litre of diesel
+DIESEL_PRICE = 92.0         # ₹ per litre
+HISTORY_DAYS = 180
+HISTORY_EVENTS = 2_000_000  # cap on synthetic history, so big fleets start quickly
+HISTORY_WAIT = 2.0          # seconds open_pipeline waits for the history before returning
+BATCH_SIZE = 50_000
+
+
+# ==================== BUCKETS ====================
+def buckets(ts, grain):
+    """Bucket number of each epoch-second timestamp at grain"""
+    ts = np.asarray(ts, dtype=np.int64)
+    day = ts // DAY
+    if grain == 'day':
+        return day
+    if grain == 'week':
+        return (day + 3) // 7       # 1970-01-01 was a Thursday: weeks start on Monday
+    return ts.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+
+
+def bucket_start(bucket, grain):
+    """First day of a bucket as numpy datetime64[D]"""
+    if grain == 'day':
+        return np.datetime64(int(bucket), 'D')
+    if grain == 'week':
+        return np.datetime64(int(bucket) * 7 - 3, 'D')
+    return np.datetime64(int(bucket), 'M').astype('datetime64[D]')
+
+
+def bucket_label(bucket, grain):
+    day = bucket_start(bucket, grain).astype(datetime.date)
+    if grain == 'day':
+        return day.strftime('%a %d %b')
+    if grain == 'week':
+        return day.strftime('Wk %d %b')
+    return day.strftime('%b %Y')
+
+
+def event_values(events):
+    """(n, len(MEASURES)) contributions of each event"""
+    trip = (events['kind'] == TRIP).astype(np.float32)
+    fill = 1 - trip
+    return np.column_stack([
+        trip,
+        events['distance'] * trip,
+        events['fuel'] * trip,
+        events['idle'] * trip,
+        events['score'] * trip,
+        fill,
+        events['cost'] * fill,
+    ])
+
+
+# ==================== ROLLUPS ====================
+class Rollup:
+    """Sums of MEASURES per bucket for n entities at one grain"""
+
+    def __init__(self, n_entities, retention, dtype=np.float32):
+        self.n, self.retention, self.dtype = n_entities, retention, dtype
+        self.buckets = {}       # bucket -> (n, len(MEASURES)) sums
+        self.stamps = {}        # bucket -> writes count when it last changed
+        self.writes = 0
+        self.newest = None
+
+    def add(self, bucket_ids, entity, values):
+        """Fold a batch in; returns how many events were older than the window"""
+        newest = int(bucket_ids.max())
+        if self.newest is None or newest > self.newest:
+            self.newest = newest
+            for b in [b for b in self.buckets if b <= newest - self.retention]:
+                del self.buckets[b], self.stamps[b]
+        self.writes += 1
+        dropped = 0
+        first, last = int(bucket_ids.min()), newest
+        # A time-ordered batch usually spans one or two buckets
+        for b in range(first, last + 1) if last - first < 8 else np.unique(bucket_ids).tolist():
+            if first == last:
+                rows, vals = entity, values
+            else:
+                mask = bucket_ids == b
+                if not mask.any():
+                    continue
+                rows, vals = entity[mask], values[mask]
+            if b <= self.newest - self.retention:
+                dropped += len(rows)
+                continue
+            sums = self.buckets.get(b)
+            if sums is None:
+                sums = self.buckets[b] = np.zeros((self.n, len(MEASURES)), dtype=self.dtype)
+            self.stamps[b] = self.writes
+            if self.n == 1:
+                sums[0] += vals.sum(axis=0, dtype=np.float64)
+            else:
+                # Scatter into the flat view: numpy's 1-D add.at is several times faster
+                flat = rows.astype(np.intp)[:, None] * len(MEASURES) + np.arange(len(MEASURES))
+                np.add.at(sums.reshape(-1), flat.ravel(), vals.ravel())
+        return dropped
+
+    def series(self, entity, first, last):
+        """(last - first + 1, len(MEASURES)) sums for one entity, zeros where empty"""
+        out = np.zeros((last - first + 1, len(MEASURES)), dtype=np.float64)
+        for b in range(first, last + 1):
+            sums = self.buckets.get(b)
+            if sums is not None:
+                out[b - first] = sums[entity]
+        return out
+
+
+class Rollups:
+    """Daily, weekly and monthly rollups per vehicle, per driver and fleet-wide"""
+
+    def __init__(self, n_vehicles, n_drivers, retention=RETENTION, fleet_retention=FLEET_RETENTION):
+        sizes = {'vehicle': n_vehicles, 'driver': n_drivers}
+        self.rollups = {(g, k): Rollup(sizes[k], r) for (g, k), r in retention.items()}
+        entity_bytes = sum(r.n * len(MEASURES) * 4 * r.retention for r in self.rollups.values())
+        if entity_bytes > ENTITY_BYTES_LIMIT:
+            raise ValueError(f"per-entity rollups would need {entity_bytes / 2**20:,.0f} MiB, "
+                             f"over ENTITY_BYTES_LIMIT; keep fewer grains or buckets")
+        self.rollups.update({(g, 'fleet'): Rollup(1, fleet_retention[g], np.float64) for g in GRAINS})
+        self.version = 0
+        self.events = self.dropped = 0
+        self.earliest = self.latest = None      # oldest / newest event timestamps seen
+        self.feed = None        # TelemetryFeed filling these rollups, if any
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def ingest(self, events):
+        """Fold one batch of EVENT_DTYPE records into every rollup"""
+        if len(events) == 0:
+            return
+        with metrics.timer('telemetry_ingest_seconds'):
+            values = event_values(events)
+            fleet = np.zeros(len(events), dtype=np.intp)
+            with self._lock:
+                for grain in GRAINS:
+                    b = buckets(events['ts'], grain)
+                    for kind in KINDS:
+                        if (grain, kind) in self.rollups:
+                            self.dropped += self.rollups[grain, kind].add(b, events[kind], values)
+                    self.rollups[grain, 'fleet'].add(b, fleet, values)
+                self.events += len(events)
+                earliest, latest = int(events['ts'].min()), int(events['ts'].max())
+                self.earliest = earliest if self.earliest is None else min(self.earliest, earliest)
+                self.latest = latest if self.latest is None else max(self.latest, latest)
+                self.version += 1
+            for callback in self._listeners:
+                callback(events)
+        metrics.count('telemetry_events_total', len(events))
+
+    def _rollup(self, grain, kind):
+        if (grain, kind) not in self.rollups:
+            raise KeyError(f"no {grain} rollup per {kind}; per-entity grains are set in RETENTION")
+        return self.rollups[grain, kind]
+
+    def subscribe(self, callback):
+        """Call callback(events) after every ingested batch"""
+        self._listeners.append(callback)
+
+    def _span(self, grain, complete):
+        """First and last bucket with data; only whole buckets when complete"""
+        first, last = int(buckets(self.earliest, grain)), int(buckets(self.latest, grain))
+        if complete:
+            if bucket_start(first, grain) < np.datetime64(self.earliest // DAY, 'D'):
+                first += 1
+            if bucket_start(last + 1, grain) > np.datetime64(self.latest // DAY + 1, 'D'):
+                last -= 1
+        return first, last
+
+    def _window(self, grain, rollup, periods, complete):
+        """First and last of the newest `periods` buckets the rollup still holds"""
+        oldest, last = self._span(grain, complete)
+        if last < oldest:
+            oldest, last = self._span(grain, False)
+        return max(last - periods + 1, last - rollup.retention + 1, oldest), last
+
+    def series(self, grain, kind='fleet', entity=0, periods=7, complete=False):
+        """The last `periods` buckets for one entity as a labelled frame
+
+        Columns are the raw sums plus efficiency (km/L), avg_score, co2 (kg)
+        and idle_per_trip; ratios are NaN for buckets without trips.
+        ``complete`` leaves out buckets only partly covered by the data, such
+        as the one still being filled, unless there is no whole bucket yet.
+        """
+        rollup = self._rollup(grain, kind)
+        with self._lock:
+            if self.latest is None:
+                return pd.DataFrame(columns=MEASURES + DERIVED, dtype=np.float64)
+            first, last = self._window(grain, rollup, periods, complete)
+            sums = rollup.series(entity, first, max(last, first - 1))
+        df = pd.DataFrame(sums, columns=MEASURES,
+                          index=[bucket_label(b, grain) for b in range(first, last + 1)])
+        trips = df['trips'].where(df['trips'] > 0)
+        df['efficiency'] = df['distance'] / df['fuel_used'].where(df['fuel_used'] > 0)
+        df['avg_score'] = df['score_sum'] / trips
+        df['idle_per_trip'] = df['idle'] / trips
+        df['co2'] = df['fuel_used'] * CO2_PER_LITRE
+        return df
+
+    def window_key(self, grain, kind, periods, complete=True):
+        """What ``matrix`` would return changes only when this does: the window's
+        labels and its buckets' last writes"""
+        rollup = self._rollup(grain, kind)
+        with self._lock:
+            if self.latest is None:
+                return ()
+            first, last = self._window(grain, rollup, periods, complete)
+            return (first, last) + tuple(rollup.stamps.get(b, 0) for b in range(first, last + 1))
+
+    def matrix(self, grain, kind, measures, periods, complete=True):
+        """Every entity's sums of some measures over the last `periods` buckets
+
+        Returns (labels, {measure: (n_entities, buckets) float32 array}), one
+        column per bucket, oldest first. Same window rules as ``series``.
+        """
+        rollup = self._rollup(grain, kind)
+        with self._lock:
+            if self.latest is None:
+                return [], {m: np.zeros((rollup.n, 0), dtype=np.float32) for m in measures}
+            first, last = self._window(grain, rollup, periods, complete)
+            out = {m: np.zeros((rollup.n, max(last - first + 1, 0)), dtype=np.float32) for m in measures}
+            for b in range(first, last + 1):
+                sums = rollup.buckets.get(b)
+                if sums is not None:
+                    for m in measures:
+                        out[m][:, b - first] = sums[:, MEASURES.index(m)]
+        return [bucket_label(b, grain) for b in range(first, last + 1)], out
+
+    def memory_bytes(self):
+        with self._lock:
+            return sum(a.nbytes for r in self.rollups.values() for a in r.buckets.values())
+
+
+# ==================== SOURCES ====================
+def history_days(n_vehicles, trips_per_day=2.0):
+    """Days of synthetic history that fit the HISTORY_EVENTS budget"""
+    per_day = n_vehicles * (trips_per_day + 1 / 3)
+    return int(np.clip(HISTORY_EVENTS // max(per_day, 1), 1, HISTORY_DAYS))
+
+
+def replay(fleet, start_day, days, seed=DEFAULT_SEED, trips_per_day=2.0, batch_size=BATCH_SIZE):
+    """Seeded synthetic trips and refuels for every vehicle, day by day
+
+    Trips follow each vehicle's daily distance, idle time and fuel
+    efficiency and the driver's score; a vehicle refuels about every third
+    day. Efficiency drifts slowly per vehicle, reaching the table's value
+    today, and has a weekly cycle. Each day is generated in vehicle chunks
+    of about batch_size events (time-ordered within a batch), so memory
+    stays flat at any fleet size. ``start_day`` is a numpy datetime64[D].
+    """
+    v = fleet.vehicles(['Driver', 'FE (km/L)', 'Daily Distance (km)', 'Idle Time (min)'])
+    driver = v['Driver'].cat.codes.to_numpy().astype(np.int32)
+    fe = v['FE (km/L)'].to_numpy(dtype=np.float64)
+    distance = v['Daily Distance (km)'].to_numpy(dtype=np.float64)
+    idle = v['Idle Time (min)'].to_numpy(dtype=np.float64)
+    score = fleet.drivers(['Score'])['Score'].to_numpy(dtype=np.float64)
+    n = len(fe)
+    day0 = int(np.datetime64(start_day, 'D').astype(np.int64))
+    today = int(np.datetime64('today', 'D').astype(np.int64))
+    rng = np.random.default_rng([seed, 2, day0])
+    drift = rng.normal(0, 0.0008, n)         # relative FE change per day
+    chunk = max(1, int(batch_size / (trips_per_day + 1 / 3)))
+
+    for d in range(days):
+        day = day0 + d
+        weekly = 1 + 0.03 * np.sin(2 * np.pi * (day % 7) / 7)
+        for lo in range(0, n, chunk):
+            vehicles = np.arange(lo, min(lo + chunk, n), dtype=np.int32)
+            tv = np.repeat(vehicles, rng.poisson(trips_per_day, len(vehicles)))
+            m = len(tv)
+            fe_day = fe[tv] * (1 + drift[tv] * (day - today)) * weekly
+            trip_km = distance[tv] / trips_per_day * rng.gamma(8, 1 / 8, m)
+            trips = np.zeros(m, dtype=EVENT_DTYPE)
+            trips['ts'] = day * DAY + rng.integers(0, DAY, m)
+            trips['kind'] = TRIP
+            trips['vehicle'] = tv
+            trips['driver'] = driver[tv]
+            trips['distance'] = trip_km
+            trips['fuel'] = trip_km / np.maximum(fe_day * rng.normal(1, 0.05, m), 0.5)
+            trips['idle'] = idle[tv] / trips_per_day * rng.uniform(0.5, 1.5, m)
+            trips['score'] = np.clip(score[driver[tv]] + rng.normal(0, 4, m), 0, 100)
+
+            fv = vehicles[rng.random(len(vehicles)) < 1 / 3]
+            litres = 3 * distance[fv] / fe[fv] * rng.uniform(0.8, 1.2, len(fv))
+            fills = np.zeros(len(fv), dtype=EVENT_DTYPE)
+            fills['ts'] = day * DAY + rng.integers(0, DAY, len(fv))
+            fills['kind'] = FUEL
+            fills['vehicle'] = fv
+            fills['driver'] = driver[fv]
+            fills['fuel'] = litres
+            fills['cost'] = litres * DIESEL_PRICE * rng.normal(1, 0.02, len(fv))
+
+            events = np.concatenate([trips, fills])
+            yield events[np.argsort(events['ts'], kind='stable')]
+
+
+def paced(batches, rate):
+    """Yield batches no faster than rate events per second"""
+    start, sent = time.perf_counter(), 0
+    for batch in batches:
+        wait = start + sent / rate - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        yield batch
+        sent += len(batch)
+
+
+def to_events(table):
+    """EVENT_DTYPE records from an Arrow table with the FIELDS columns"""
+    events = np.empty(table.num_rows, dtype=EVENT_DTYPE)
+    for name in FIELDS:
+        events[name] = table.column(name).to_numpy()
+    return events
+
+
+CSV_TYPES = {name: pa.from_numpy_dtype(EVENT_DTYPE[name]) for name in FIELDS}
+
+
+def write_csv(batches, path):
+    """Write event batches as CSV with a FIELDS header"""
+    with open(path, 'wb') as f:
+        f.write((','.join(FIELDS) + '\n').encode())
+        for batch in batches:
+            table = pa.table({name: batch[name] for name in FIELDS})
+            pacsv.write_csv(table, f, pacsv.WriteOptions(include_header=False))
+
+
+def read_csv(path, batch_size=BATCH_SIZE):
+    """Stream event batches from a CSV file written by write_csv (header required)"""
+    reader = pacsv.open_csv(path, read_options=pacsv.ReadOptions(block_size=batch_size * 64),
+                            convert_options=pacsv.ConvertOptions(column_types=CSV_TYPES))
+    for record_batch in reader:
+        yield to_events(pa.Table.from_batches([record_batch]))
+
+
+def read_socket(host, port, chunk_size=1 << 20):
+    """Stream event batches from newline-delimited CSV (no header) over TCP"""
+    options = dict(read_options=pacsv.ReadOptions(column_names=FIELDS),
+                   convert_options=pacsv.ConvertOptions(column_types=CSV_TYPES))
+    with socket.create_connection((host, port)) as conn:
+        pending = b''
+        while True:
+            chunk = conn.recv(chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+            cut = pending.rfind(b'\n') + 1
+            if cut:
+                yield to_events(pacsv.read_csv(io.BytesIO(pending[:cut]), **options))
+                pending = pending[cut:]
+        if pending.strip():
+            yield to_events(pacsv.read_csv(io.BytesIO(pending), **options))
+
+
+def open_source(spec, fleet, start_day, seed=DEFAULT_SEED, rate=1000):
+    """Event batches for a FLEET_TELEMETRY setting
+
+    'replay' continues the synthetic stream from start_day at `rate` events
+    per second, 'tcp://host:port' reads a socket, anything else is a CSV path.
+    """
+    if spec == 'replay':
+        return paced(replay(fleet, start_day, 10 ** 6, seed, batch_size=max(1, rate // 10)), rate)
+    if spec.startswith('tcp://'):
+        host, port = spec[len('tcp://'):].rsplit(':', 1)
+        return read_socket(host, int(port))
+    return read_csv(spec)
+
+
+def open_pipeline(fleet, days, source='', seed=DEFAULT_SEED, rate=1000, wait=HISTORY_WAIT,
+                  subscribers=()):
+    """Rollups fed by `days` of replayed history and then by source, in the background
+
+    ``subscribers`` get every batch, history included. Waits up to `wait`
+    seconds for the history, so small fleets start with every chart filled
+    and big ones start anyway while it loads.
+    """
+    rollups = Rollups(fleet.n_vehicles, fleet.n_drivers)
+    for callback in subscribers:
+        rollups.subscribe(callback)
+    today = np.datetime64('today', 'D')
+    loaded = threading.Event()
+
+    def batches():
+        yield from replay(fleet, today - days, days, seed)
+        loaded.set()
+        if source:
+            yield from open_source(source, fleet, today, seed, rate)
+
+    rollups.feed = TelemetryFeed(rollups, batches()).start()
+    loaded.wait(wait)
+    return rollups
+
+
+class TelemetryFeed:
+    """Background thread pushing batches from a source into Rollups"""
+
+    def __init__(self, rollups, source):
+        self.rollups, self.source = rollups, source
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='fleet-telemetry', daemon=True)
+
+    def _run(self):
+        try:
+            for batch in self.source:
+                if self._stop.is_set():
+                    break
+                self.rollups.ingest(batch)
+        except Exception as e:      # keep serving the rollups we have
+            self.error = e
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
@@ -0,0 +1,227 @@
+"""Downsampled per-entity time series for drill-down charts.
+
+A ``Pyramid`` keeps one metric for every vehicle (or driver) at several
+resolutions at once: level 0 holds min/max/sum/count of the raw samples per
+day, and each level above covers FACTOR times as many days. Samples are
+scattered into every level as they arrive, so nothing is recomputed on read.
+A query for a zoom window picks the finest level that fits the window in at
+most ``points`` buckets and slices one row of it, so a chart costs the same
+for a truck with a week of trips as for one with five years.
+
+Levels are dense (entity, bucket) float32 arrays. Bucket 0 of every level
+starts on ``origin``, a multiple of the coarsest bucket width, so buckets
+line up across levels. Each level keeps its newest ``RETENTION`` buckets,
+plus a quarter of slack so the window moves every few buckets rather than
+every one. A level is allocated at that size on its first sample and then
+shifted in place, so it never grows. Older samples are dropped from it and
+windows reaching further back read a coarser level.
+
+A pyramid's arrays are at most ``BYTES_LIMIT``, checked at construction.
+``fit_retention`` scales RETENTION down for fleets too big for it, and
+pyramids that only plot a mean can leave out min and max.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+FACTOR = 4
+LEVELS = 5              # 1, 4, 16, 64 and 256-day buckets
+POINTS = 120            # buckets a chart gets at most
+RETENTION = (32, 128, 128, 32, 32)  # buckets kept per level: 32 days, 1.4 years, 5.6 years, ...
+STATS = ('min', 'max', 'sum', 'count')
+FILL = {'min': np.inf, 'max': -np.inf, 'sum': 0, 'count': 0}
+BYTES_LIMIT = 1 << 29   # per pyramid
+SHIFT_ROWS = 65_536     # entities moved at a time when a level shifts
+WINDOWS = {"1W": 7, "1M": 30, "3M": 91, "6M": 182, "1Y": 365, "All": None}
+
+
+def _capacity(retention):
+    return retention + retention // 4
+
+
+def pyramid_bytes(n_entities, retention=RETENTION, stats=STATS):
+    """Bytes of a pyramid's arrays once every level is in use"""
+    return n_entities * sum(_capacity(r) for r in retention) * 4 * len(stats)
+
+
+def fit_retention(n_entities, stats=STATS, bytes_limit=BYTES_LIMIT, retention=RETENTION):
+    """RETENTION scaled down evenly so a pyramid of n entities fits bytes_limit"""
+    full = pyramid_bytes(n_entities, retention, stats)
+    if full <= bytes_limit:
+        return tuple(retention)
+    return tuple(max(int(r * bytes_limit / full), 1) for r in retention)
+
+
+class Pyramid:
+    """Multi-resolution min/max/mean of one metric for n entities"""
+
+    def __init__(self, n_entities, levels=LEVELS, factor=FACTOR, retention=RETENTION, stats=STATS,
+                 bytes_limit=BYTES_LIMIT):
+        if not {'sum', 'count'} <= set(stats) <= set(STATS):
+            raise ValueError(f"stats must include sum and count, from {STATS}")
+        retention = tuple(retention)[:levels]
+        need = pyramid_bytes(n_entities, retention, stats)
+        if need > bytes_limit:
+            raise ValueError(f"pyramid would need {need / 2**20:,.0f} MiB, over its "
+                             f"{bytes_limit / 2**20:,.0f} MiB limit; use fit_retention()")
+        self.n, self.retention, self.stats = n_entities, retention, tuple(stats)
+        self.widths = [factor ** level for level in range(levels)]
+        self.origin = None              # epoch day of bucket 0
+        self.first = self.last = None   # epoch days with samples
+        self.levels = [None] * levels   # each: dict of stat -> (n, capacity)
+        self.starts = [0] * levels      # bucket held in column 0 of each level
+        self._lock = threading.Lock()
+
+    def _allocate(self, capacity):
+        return {stat: np.full((self.n, capacity), FILL[stat], dtype=np.float32) for stat in self.stats}
+
+    def _shift(self, arrays, by):
+        """Move a level's columns `by` buckets left (right when negative), in place"""
+        capacity = arrays['count'].shape[1]
+        if abs(by) >= capacity:
+            for stat, values in arrays.items():
+                values.fill(FILL[stat])
+            return
+        if by > 0:
+            dst, src, cleared = slice(0, capacity - by), slice(by, capacity), slice(capacity - by, capacity)
+        else:
+            dst, src, cleared = slice(-by, capacity), slice(0, capacity + by), slice(0, -by)
+        for stat, values in arrays.items():
+            # A block of rows at a time, so the overlapping copy's temporary stays small
+            for i in range(0, self.n, SHIFT_ROWS):
+                block = values[i:i + SHIFT_ROWS]
+                block[:, dst] = block[:, src]
+            values[:, cleared] = FILL[stat]
+
+    def _ensure(self, first_day, last_day):
+        """Move every level to cover [first_day, last_day], within its retention"""
+        coarsest = self.widths[-1]
+        origin = first_day - first_day % coarsest
+        if self.origin is not None and origin > self.origin:
+            origin = self.origin
+        newest_day = last_day if self.last is None else max(last_day, self.last)
+        for level, (width, retention) in enumerate(zip(self.widths, self.retention)):
+            if self.origin is not None:
+                self.starts[level] += (self.origin - origin) // width
+            newest = (newest_day - origin) // width
+            oldest = newest - retention + 1
+            lo = max((first_day - origin) // width, oldest)
+            arrays = self.levels[level]
+            if arrays is None:
+                self.levels[level] = self._allocate(_capacity(retention))
+                self.starts[level] = lo
+                continue
+            start, capacity = self.starts[level], arrays['count'].shape[1]
+            if lo >= start and newest < start + capacity:
+                continue
+            lo = max(min(lo, start), oldest)
+            self._shift(arrays, lo - start)
+            self.starts[level] = lo
+        self.origin = origin
+
+    def add(self, entity, day, value):
+        """Fold samples (entity position, epoch day, value) into every level"""
+        if len(day) == 0:
+            return
+        entity = np.asarray(entity, dtype=np.intp)
+        day = np.asarray(day, dtype=np.int64)
+        value = np.asarray(value, dtype=np.float32)
+        first, last = int(day.min()), int(day.max())
+        with self._lock:
+            self._ensure(first, last)
+            self.first = first if self.first is None else min(self.first, first)
+            self.last = last if self.last is None else max(self.last, last)
+            offset = day - self.origin
+            for width, start, arrays in zip(self.widths, self.starts, self.levels):
+                capacity = arrays['count'].shape[1]
+                column = offset // width - start
+                kept = column >= 0
+                if not kept.all():
+                    # Older than this level keeps
+                    rows, column, values = entity[kept], column[kept], value[kept]
+                else:
+                    rows, values = entity, value
+                flat = rows * capacity + column
+                if 'min' in arrays:
+                    np.minimum.at(arrays['min'].reshape(-1), flat, values)
+                if 'max' in arrays:
+                    np.maximum.at(arrays['max'].reshape(-1), flat, values)
+                np.add.at(arrays['sum'].reshape(-1), flat, values)
+                np.add.at(arrays['count'].reshape(-1), flat, 1)
+
+    def kept_from(self, level):
+        """First epoch day a level still holds"""
+        return self.origin + self.starts[level] * self.widths[level]
+
+    def level_for(self, days, points=POINTS):
+        """Finest level that shows `days` in at most `points` buckets"""
+        for level, width in enumerate(self.widths):
+            if -(-days // width) <= points:
+                return level
+        return len(self.widths) - 1
+
+    def window(self, entity, start_day=None, end_day=None, points=POINTS):
+        """min/max/mean per bucket over [start_day, end_day] (epoch days), empty buckets dropped
+
+        Defaults to everything recorded. The frame is indexed by bucket start
+        date and has at most about `points` rows whatever the window; min and
+        max are there when the pyramid keeps them.
+        """
+        columns = [s for s in ('min', 'max') if s in self.stats] + ['mean', 'count']
+        with self._lock:
+            if self.origin is None:
+                return pd.DataFrame(columns=columns)
+            start = self.first if start_day is None else max(start_day, self.first)
+            end = self.last if end_day is None else min(end_day, self.last)
+            level = self.level_for(max(end - start + 1, 1), points)
+            # A window older than a level keeps reads the next coarser one
+            while level < len(self.widths) - 1 and start < self.kept_from(level):
+                level += 1
+            start = max(start, self.kept_from(level))
+            width, arrays = self.widths[level], self.levels[level]
+            lo, hi = (start - self.origin) // width, (end - self.origin) // width + 1
+            hi = max(hi, lo)
+            rows = {key: values[entity, lo - self.starts[level]:hi - self.starts[level]].astype(np.float64)
+                    for key, values in arrays.items()}
+        days = self.origin + np.arange(lo, hi) * width
+        rows['mean'] = rows['sum'] / np.maximum(rows['count'], 1)
+        df = pd.DataFrame({c: rows[c] for c in columns},
+                          index=pd.DatetimeIndex(days.astype('datetime64[D]'), name='date'))
+        df.attrs['bucket_days'] = width
+        return df[df['count'] > 0]
+
+    def memory_bytes(self):
+        return sum(a.nbytes for arrays in self.levels if arrays for a in arrays.values())
+
+
+class DrillDownSeries:
+    """Per-trip fuel efficiency by vehicle and trip score by driver, as pyramids
+
+    Each pyramid's retention is fitted to its entity count, so both stay
+    within BYTES_LIMIT at any fleet size. Subscribe it to the telemetry
+    rollups so every ingested batch lands in both pyramids.
+    """
+
+    def __init__(self, n_vehicles, n_drivers):
+        self.vehicle_fe = Pyramid(n_vehicles, retention=fit_retention(n_vehicles))
+        # The driver chart plots the mean score only
+        stats = ('sum', 'count')
+        self.driver_score = Pyramid(n_drivers, retention=fit_retention(n_drivers, stats), stats=stats)
+
+    def add(self, events):
+        from fleet_telemetry import DAY, TRIP
+        trips = events[(events['kind'] == TRIP) & (events['fuel'] > 0)]
+        day = trips['ts'] // DAY
+        self.vehicle_fe.add(trips['vehicle'], day, trips['distance'] / trips['fuel'])
+        self.driver_score.add(trips['driver'], day, trips['score'])
+
+    def memory_bytes(self):
+        return self.vehicle_fe.memory_bytes() + self.driver_score.memory_bytes()
+
+
+def window_days(label, today=None):
+    """(start_day, end_day) epoch days for a WINDOWS label, ending today"""
+    today = int(np.datetime64('today', 'D').astype(np.int64)) if today is None else today
+    days = WINDOWS[label]
+    return (None if days is None else today - days + 1), today
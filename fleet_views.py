@@ -0,0 +1,121 @@
+"""Materialized KPI views over the fleet.
+
+Each view keeps running sums per group (status, model, state) for a fixed set
+of measures. The views are built once with ``np.bincount`` and then kept
+current from the fleet's change notifications: a changed row's old
+contribution is subtracted and its new one added, so an update costs the
+number of changed rows, and a page reads any KPI in O(1).
+"""
+import numpy as np
+import pandas as pd
+
+import fleet_metrics as metrics
+
+
+class MaterializedView:
+    """Per-group sums of row measures, maintained under row updates
+
+    ``dims`` are categorical columns to group by; ``measures`` map a measure
+    name to a function of a frame returning one number per row.
+    """
+
+    def __init__(self, df, dims, measures, inputs):
+        self.dims = list(dims)
+        self.measures = dict(measures)
+        self.columns = list(inputs)
+        self.labels = {d: df[d].cat.categories for d in self.dims}
+        values = self._values(df)
+        self.totals = values.sum(axis=0)
+        self.groups = {}
+        for d in self.dims:
+            codes = df[d].cat.codes.to_numpy()
+            self.groups[d] = np.column_stack([
+                np.bincount(codes, weights=values[:, j], minlength=len(self.labels[d]))
+                for j in range(values.shape[1])
+            ])
+
+    def _values(self, df):
+        return np.column_stack([np.asarray(f(df), dtype=np.float64) for f in self.measures.values()])
+
+    def _add(self, df, sign):
+        values = self._values(df) * sign
+        self.totals += values.sum(axis=0)
+        for d in self.dims:
+            np.add.at(self.groups[d], df[d].cat.codes.to_numpy(), values)
+
+    def apply(self, positions, before, after):
+        """Fleet listener: swap the old contribution of changed rows for the new one"""
+        metrics.count('rows_scanned_total', len(positions), op='view_update')
+        self._add(before, -1)
+        self._add(after, +1)
+
+    # ---------- O(1) reads ----------
+    def total(self, measure):
+        return self.totals[list(self.measures).index(measure)]
+
+    def value(self, dim, label, measure):
+        row = self.labels[dim].get_loc(label)
+        return self.groups[dim][row, list(self.measures).index(measure)]
+
+    def breakdown(self, dim):
+        """Small frame of every measure per category of dim"""
+        return pd.DataFrame(self.groups[dim], index=self.labels[dim], columns=list(self.measures))
+
+
+# ==================== FLEET KPIs ====================
+VEHICLE_MEASURES = {
+    'count': lambda df: np.ones(len(df)),
+    'Daily CO2 (kg)': lambda df: df['Daily CO2 (kg)'],
+    'FE (km/L)': lambda df: df['FE (km/L)'],
+    'Maintenance Cost (₹)': lambda df: df['Maintenance Cost (₹)'],
+    'Odometer (km)': lambda df: df['Odometer (km)'],
+}
+VEHICLE_DIMS = ['Status', 'Model', 'State']
+VEHICLE_INPUTS = VEHICLE_DIMS + ['Daily CO2 (kg)', 'FE (km/L)', 'Maintenance Cost (₹)',
+                                 'Odometer (km)']
+
+DRIVER_MEASURES = {
+    'count': lambda df: np.ones(len(df)),
+    'Efficiency (km/L)': lambda df: df['Efficiency (km/L)'],
+    'Score': lambda df: df['Score'],
+    'trained': lambda df: df['Training Complete'],
+}
+DRIVER_INPUTS = ['Efficiency (km/L)', 'Score', 'Training Complete']
+
+
+class FleetViews:
+    """The dashboard's KPIs, subscribed to a Fleet so they never go stale"""
+
+    def __init__(self, fleet):
+        self.vehicles = MaterializedView(fleet.vehicles(VEHICLE_INPUTS), VEHICLE_DIMS,
+                                         VEHICLE_MEASURES, VEHICLE_INPUTS)
+        self.drivers = MaterializedView(fleet.drivers(DRIVER_INPUTS), [],
+                                        DRIVER_MEASURES, DRIVER_INPUTS)
+        fleet.subscribe('vehicles', self.vehicles.columns, self.vehicles.apply)
+        fleet.subscribe('drivers', self.drivers.columns, self.drivers.apply)
+
+    # Named KPIs as the pages use them
+    def active(self):
+        return int(self.vehicles.value('Status', 'Active', 'count'))
+
+    def status_counts(self):
+        """Vehicles per Status, in STATUSES order"""
+        return self.vehicles.breakdown('Status')['count'].astype(int)
+
+    def total_co2(self):
+        return self.vehicles.total('Daily CO2 (kg)')
+
+    def total_maint_cost(self):
+        return self.vehicles.total('Maintenance Cost (₹)')
+
+    def overall_cpkm(self):
+        return self.total_maint_cost() / self.vehicles.total('Odometer (km)')
+
+    def avg_efficiency(self):
+        return self.drivers.total('Efficiency (km/L)') / self.drivers.total('count')
+
+    def avg_score(self):
+        return self.drivers.total('Score') / self.drivers.total('count')
+
+    def trained(self):
+        return int(self.drivers.total('trained'))
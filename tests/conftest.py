@@ -0,0 +1,18 @@
+import pytest
+
+from fleet_data import default_driver_count
+from fleet_state import Fleet
+from fleet_store import open_store
+
+
+@pytest.fixture(scope='session')
+def store_root(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('store'))
+
+
+@pytest.fixture
+def make_fleet(store_root):
+    """A fresh writable Fleet over the seeded store of n vehicles"""
+    def make(n=150, seed=42):
+        return Fleet(open_store(n, default_driver_count(n), seed, store_root))
+    return make
@@ -0,0 +1,42 @@
+import numpy as np
+
+from fleet_alerts import AlertEngine
+from fleet_data import STATUSES
+
+COLUMNS = {
+    'Next Service (days)': lambda rng, k: rng.integers(-15, 70, k),
+    'KM Since Service': lambda rng, k: rng.integers(0, 16000, k),
+    'Idle Time (min)': lambda rng, k: rng.integers(0, 200, k),
+    'FE (km/L)': lambda rng, k: np.round(rng.uniform(3.0, 5.5, k), 2),
+    'Daily CO2 (kg)': lambda rng, k: np.round(rng.uniform(10, 40, k), 1),
+    'Status': lambda rng, k: rng.choice(STATUSES, k),
+}
+
+
+def recompute(engine):
+    """Rule, score and per-rule counts from the whole table, with the engine's compiled rules"""
+    df = engine.fleet.vehicles(engine.columns)
+    states = [g.states(df[g.column]) for g in engine.groups]
+    rule, score = engine._rank(df, states)
+    counts = np.zeros(len(engine.rules), dtype=np.int64)
+    for group, state in zip(engine.groups, states):
+        counts[group.ids] = group.fires[state].sum(axis=0)
+    return rule, score, counts
+
+
+def test_random_updates_match_a_recompute(make_fleet):
+    fleet = make_fleet(2000)
+    engine = AlertEngine(fleet)
+    rng = np.random.default_rng(2)
+    for _ in range(100):
+        positions = rng.choice(fleet.n_vehicles, int(rng.integers(1, 40)), replace=False)
+        columns = rng.choice(list(COLUMNS), int(rng.integers(1, len(COLUMNS) + 1)), replace=False)
+        fleet.update('vehicles', positions, {c: COLUMNS[c](rng, len(positions)) for c in columns})
+        rule, score, counts = recompute(engine)
+        assert np.array_equal(engine.rule, rule)
+        assert np.array_equal(engine.score, score)
+        by_name = dict(zip(engine.counts()['Rule'], engine.counts()['Vehicles']))
+        assert [by_name[r.name] for r in engine.rules] == counts.tolist()
+        assert np.array_equal(engine.rows(), np.flatnonzero(score >= 1))
+        best = -np.sort(-score)[:5]
+        assert np.array_equal(score[engine.top(5)], best[best >= 1])
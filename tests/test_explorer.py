@@ -0,0 +1,14 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fleet_dashboard.py')
+
+
+def test_vehicle_count_is_an_integer():
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.run()
+    at.sidebar.radio[0].set_value("🧊 Fleet Explorer").run()
+    assert not at.exception
+    vehicles = next(m for m in at.metric if m.label == "Vehicles")
+    assert vehicles.value == "150"
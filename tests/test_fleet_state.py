@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def fleet(make_fleet):
+    return make_fleet()
+
+
+def test_update_with_an_unknown_label_writes_nothing(fleet):
+    positions = np.array([0, 1, 2])
+    before = fleet.rows('vehicles', positions, ['FE (km/L)', 'Status'])
+    version = fleet.version
+    calls = []
+    fleet.subscribe('vehicles', ['FE (km/L)'], lambda *args: calls.append(args))
+    with pytest.raises(ValueError):
+        fleet.update('vehicles', positions, {'FE (km/L)': [9.9, 9.9, 9.9], 'Status': ['Active', 'Scrapped', 'Active']})
+    assert fleet.rows('vehicles', positions, ['FE (km/L)', 'Status']).equals(before)
+    assert fleet.version == version
+    assert calls == []
+
+
+def test_update_writes_every_column_and_notifies_once(fleet):
+    positions = np.array([3, 4])
+    calls = []
+    fleet.subscribe('vehicles', ['FE (km/L)', 'Status'], lambda *args: calls.append(args))
+    fleet.update('vehicles', positions, {'FE (km/L)': [5.5, 6.5], 'Status': ['Active', 'Active']})
+    after = fleet.rows('vehicles', positions, ['FE (km/L)', 'Status'])
+    assert after['FE (km/L)'].tolist() == [5.5, 6.5]
+    assert after['Status'].tolist() == ['Active', 'Active']
+    assert len(calls) == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from fleet_leaderboard import Leaderboard
+
+COLUMN = 'FE (km/L)'
+
+
+def expected_order(fleet, descending):
+    keys = fleet.series('vehicles', COLUMN).to_numpy().astype(np.float64)
+    return np.lexsort((np.arange(len(keys)), -keys if descending else keys))
+
+
+@pytest.mark.parametrize('descending', [True, False])
+def test_random_updates_match_a_full_sort(make_fleet, descending):
+    fleet = make_fleet(5000)
+    # Small blocks, so the updates split blocks and empty them
+    board = Leaderboard(fleet, 'vehicles', COLUMN, descending=descending, block=8)
+    rng = np.random.default_rng(0)
+    n = fleet.n_vehicles
+    for step in range(200):
+        # Mostly row-by-row batches, now and then one big enough to re-sort
+        size = 200 if step % 50 == 49 else int(rng.integers(1, 16))
+        positions = rng.choice(n, size, replace=False)
+        # Few distinct values, so ties are common
+        values = np.round(rng.uniform(3.0, 3.5, size), 1).astype(np.float32)
+        fleet.update('vehicles', positions, {COLUMN: values})
+
+        expected = expected_order(fleet, descending)
+        assert np.array_equal(board.slice(0, n), expected)
+        assert np.array_equal(board.top(10), expected[:10])
+        assert np.array_equal(board.bottom(10), expected[::-1][:10])
+        start = int(rng.integers(0, n - 50))
+        assert np.array_equal(board.slice(start, start + 50), expected[start:start + 50])
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[expected] = np.arange(1, n + 1)
+        for position in rng.choice(n, 5, replace=False):
+            assert board.rank(position) == ranks[position]
+    assert board._tree.prefix(len(board._keys)) == n
+    assert all(len(k) for k in board._keys)
+
+
+def test_slices_past_the_end(make_fleet):
+    fleet = make_fleet()
+    board = Leaderboard(fleet, 'vehicles', COLUMN)
+    n = fleet.n_vehicles
+    assert len(board.slice(n - 3, n + 10)) == 3
+    assert len(board.slice(n, n + 10)) == 0
+    assert len(board.top(n + 10)) == n
@@ -0,0 +1,48 @@
+import numpy as np
+
+from fleet_maintenance import DUE, KM, DueIndex, log_service
+
+
+def schedule(fleet):
+    due = fleet.series('vehicles', DUE).to_numpy().astype(np.int64)
+    km = fleet.series('vehicles', KM).to_numpy().astype(np.int64)
+    return due, km
+
+
+def expected_due(due, km, first, last):
+    rows = np.flatnonzero((due >= first) & (due <= last))
+    return rows[np.lexsort((rows, -km[rows], due[rows]))]
+
+
+def check(index, fleet, rng):
+    due, km = schedule(fleet)
+    for first, last in [(0, 7), (-1000, -1), (8, 15), (-5, 200), tuple(sorted(rng.integers(-40, 130, 2)))]:
+        assert np.array_equal(index.due_between(first, last), expected_due(due, km, first, last))
+        assert index.count(first, last) == ((due >= first) & (due <= last)).sum()
+    assert np.array_equal(index.overdue(), expected_due(due, km, -10 ** 6, -1))
+    load = index.workload(-3, 40)
+    assert load.tolist() == [(due == d).sum() for d in range(-3, 41)]
+    assert np.array_equal(index.next(10), expected_due(due, km, 0, 10 ** 6)[:10])
+    limit = int(rng.integers(0, 16000))
+    rows = np.flatnonzero(km >= limit)
+    assert np.array_equal(index.over_km(limit), rows[np.lexsort((-rows, -km[rows]))])
+
+
+def test_random_updates_match_a_recompute(make_fleet):
+    fleet = make_fleet(2000)
+    index = DueIndex(fleet)
+    rng = np.random.default_rng(1)
+    n = fleet.n_vehicles
+    for step in range(150):
+        positions = rng.choice(n, int(rng.integers(1, 12)), replace=False)
+        if step % 7 == 0:
+            log_service(fleet, positions)
+        else:
+            # Due days past both ends of the built range, so the buckets grow
+            fleet.update('vehicles', positions, {
+                DUE: rng.integers(-40, 130, len(positions)),
+                KM: rng.integers(0, 16000, len(positions)),
+            })
+        check(index, fleet, rng)
+    # Enough moves went through the side set to force rebuilds along the way
+    assert len(index.moved) <= n // 16
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from fleet_search import FleetSearch, NgramIndex
+
+
+def brute(strings, text, prefix=False):
+    text = text.upper()
+    hit = [s.upper().startswith(text) if prefix else text in s.upper() for s in strings]
+    return np.flatnonzero(hit)
+
+
+def queries(strings, rng):
+    """Slices of the strings (every length, so short scans and trigram lookups both run) plus misses"""
+    for _ in range(200):
+        s = strings[rng.integers(len(strings))]
+        i = int(rng.integers(len(s)))
+        q = s[i:i + int(rng.integers(1, 9))]
+        yield q.lower() if rng.random() < 0.5 else q
+    yield from ['', 'ZZZZ', 'QX', '-', 'trk-', 'a b']
+
+
+@pytest.fixture
+def fleet(make_fleet):
+    return make_fleet(2000)
+
+
+@pytest.mark.parametrize('column', ['Vehicle ID', 'Driver'])
+def test_matches_a_scan(fleet, column):
+    strings = fleet.vehicles([column])[column].astype(str).tolist()
+    if column == 'Driver':
+        strings = sorted(set(strings))
+    index = NgramIndex(np.array(strings, dtype=object))
+    rng = np.random.default_rng(3)
+    for q in queries(strings, rng):
+        assert np.array_equal(index.contains(q), brute(strings, q)), q
+        assert np.array_equal(index.prefix(q), brute(strings, q, prefix=True)), q
+        assert np.array_equal(index.search(q + '*'), brute(strings, q.strip(), prefix=True)), q
+
+
+def test_fleet_search_joins_ids_and_drivers(fleet):
+    search = FleetSearch(fleet)
+    df = fleet.vehicles(['Vehicle ID', 'Driver'])
+    ids, drivers = df['Vehicle ID'].tolist(), df['Driver'].astype(str).tolist()
+    names = search.driver_names.tolist()
+    rng = np.random.default_rng(4)
+    for q in list(queries(names, rng))[:60] + ['a', 'an']:
+        if not q.strip():
+            continue
+        expected = np.union1d(brute(ids, q.strip()), brute(drivers, q.strip()))
+        assert np.array_equal(search.search(q), expected), q
+        assert np.array_equal(search.drivers(q), brute(names, q.strip())), q
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import fleet_shards
+from fleet_shards import ShardedFleet
+
+BINS = np.linspace(0, 200, 11)
+SPECS = {
+    'co2': ('sum', 'Daily CO2 (kg)'),
+    'n': ('count', 'Daily CO2 (kg)'),
+    'fe': ('mean', 'FE (km/L)'),
+    'cost_min': ('min', 'Maintenance Cost (₹)'),
+    'odo_max': ('max', 'Odometer (km)'),
+    'idle': ('hist', 'Idle Time (min)', BINS),
+}
+
+
+def expected(fleet):
+    df = fleet.vehicles(['State'] + fleet_shards.COLUMNS)
+    by = df.groupby('State', observed=True)
+    table = pd.DataFrame({
+        'co2': by['Daily CO2 (kg)'].sum(),
+        'n': by.size(),
+        'fe': by['FE (km/L)'].mean(),
+        'cost_min': by['Maintenance Cost (₹)'].min().astype(float),
+        'odo_max': by['Odometer (km)'].max().astype(float),
+        'idle': by['Idle Time (min)'].apply(lambda v: np.histogram(v, bins=BINS)[0]),
+    })
+    totals = {'co2': df['Daily CO2 (kg)'].sum(), 'n': len(df), 'fe': df['FE (km/L)'].mean(),
+              'cost_min': df['Maintenance Cost (₹)'].min(), 'odo_max': df['Odometer (km)'].max(),
+              'idle': np.histogram(df['Idle Time (min)'], bins=BINS)[0]}
+    return totals, table
+
+
+def check(sharded, fleet):
+    totals, table = sharded.aggregate(SPECS)
+    want_totals, want = expected(fleet)
+    assert list(table.index) == list(want.index)
+    for name in SPECS:
+        if name == 'idle':
+            assert np.array_equal(totals[name], want_totals[name])
+            assert all(np.array_equal(a, b) for a, b in zip(table[name], want[name]))
+        else:
+            assert totals[name] == pytest.approx(want_totals[name])
+            assert np.allclose(table[name].to_numpy(float), want[name].to_numpy(float))
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_random_updates_match_a_groupby(make_fleet, monkeypatch, workers):
+    # Small tasks, so states span several and their partials are merged
+    monkeypatch.setattr(fleet_shards, 'MIN_TASK_ROWS', 64)
+    monkeypatch.setattr(fleet_shards, 'TASKS_PER_WORKER', 16)
+    fleet = make_fleet(2000)
+    sharded = ShardedFleet(fleet, workers=workers)
+    try:
+        assert len(sharded.tasks) > len(sharded.states)
+        rng = np.random.default_rng(5)
+        check(sharded, fleet)
+        for _ in range(20 if workers > 1 else 60):
+            positions = rng.choice(fleet.n_vehicles, int(rng.integers(1, 50)), replace=False)
+            columns = rng.choice(fleet_shards.COLUMNS, int(rng.integers(1, 4)), replace=False)
+            # Values drawn from elsewhere in the column keep its dtype and range
+            fleet.update('vehicles', positions, {
+                c: fleet.series('vehicles', c).to_numpy()[rng.integers(0, fleet.n_vehicles, len(positions))]
+                for c in columns})
+            check(sharded, fleet)
+    finally:
+        sharded.close()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import fleet_timeseries
+from fleet_timeseries import Pyramid, fit_retention, pyramid_bytes
+
+N = 5
+RETENTION = (8, 8, 8, 4, 4)     # small, so levels shift and old windows fall back to coarser ones
+
+
+def samples(rng):
+    """Batches moving forward over ~4 years, some reaching back before what finer levels keep"""
+    for day in range(20_000, 21_500, 9):
+        k = int(rng.integers(1, 30))
+        back = rng.random(k) < 0.1
+        days = np.where(back, day - rng.integers(0, 400, k), day + rng.integers(0, 9, k))
+        yield rng.integers(0, N, k), days, rng.uniform(0, 100, k).astype(np.float32)
+
+
+def check(pyramid, entity, day, value, start, end, who):
+    w = pyramid.window(who, start, end)
+    if not len(w):
+        return None
+    width = w.attrs['bucket_days']
+    level = pyramid.widths.index(width)
+    lo = max(pyramid.first if start is None else start, pyramid.kept_from(level))
+    hi = pyramid.last if end is None else end
+    mine = entity == who
+    offset = (day[mine] - pyramid.origin) // width
+    buckets = np.unique(offset[(offset >= (lo - pyramid.origin) // width) & (offset <= (hi - pyramid.origin) // width)])
+    got = (w.index.values.astype('datetime64[D]').astype(np.int64) - pyramid.origin) // width
+    assert got.tolist() == buckets.tolist()
+    for b, (_, row) in zip(buckets, w.iterrows()):
+        v = value[mine][offset == b]
+        assert row['count'] == len(v)
+        assert row['mean'] == pytest.approx(v.mean(dtype=np.float64), rel=1e-4)
+        if 'min' in pyramid.stats:
+            assert (row['min'], row['max']) == (v.min(), v.max())
+        else:
+            assert 'min' not in w and 'max' not in w
+    return level
+
+
+@pytest.mark.parametrize('stats', [fleet_timeseries.STATS, ('sum', 'count')])
+def test_windows_match_the_samples(monkeypatch, stats):
+    monkeypatch.setattr(fleet_timeseries, 'SHIFT_ROWS', 2)     # shift in several blocks
+    pyramid = Pyramid(N, retention=RETENTION, stats=stats)
+    rng = np.random.default_rng(6)
+    entity, day, value = (np.empty(0, dtype=t) for t in (np.int64, np.int64, np.float32))
+    fell_back = False
+    for e, d, v in samples(rng):
+        pyramid.add(e, d, v)
+        # Samples older than a level keeps are dropped from it, so the reference keeps all of them
+        entity, day, value = np.r_[entity, e], np.r_[day, d], np.r_[value, v]
+        last = int(day.max())
+        for start, end in [(last - 6, last), (last - 40, last), (last - 400, last - 300), (None, None)]:
+            for who in range(N):
+                level = check(pyramid, entity, day, value, start, end, who)
+                if level is not None and start is not None:
+                    fell_back |= level > pyramid.level_for(end - max(start, pyramid.first) + 1)
+    assert fell_back
+    capacity = [fleet_timeseries._capacity(r) for r in RETENTION]
+    assert [a['count'].shape for a in pyramid.levels] == [(N, c) for c in capacity]
+
+
+def test_retention_is_fitted_to_the_byte_limit():
+    limit = 1 << 20
+    for n in [10, 1_000, 100_000]:
+        for stats in [fleet_timeseries.STATS, ('sum', 'count')]:
+            retention = fit_retention(n, stats, limit)
+            assert pyramid_bytes(n, retention, stats) <= limit or retention == (1,) * len(retention)
+            Pyramid(n, retention=retention, stats=stats, bytes_limit=max(limit, pyramid_bytes(n, retention, stats)))
+    with pytest.raises(ValueError):
+        Pyramid(100_000, bytes_limit=limit)
+    with pytest.raises(ValueError):
+        Pyramid(N, stats=('min', 'max'))